@@ -0,0 +1,136 @@
+"""
+Benchmark de cold start: tempo de import e latência da primeira requisição em processos novos.
+
+Cada execução sobe um interpretador limpo que mede o import do PynamoDB, o import de
+``repository.base_repository``, o ``warm_up`` (no modo "warm_up") e a primeira e a segunda
+chamada ``get``. O resultado agrega a mediana e o máximo de cada medida, em ms.
+
+Uso:
+    python -m benchmarks.cold_start --runs 10 --output cold_start.json
+    python -m benchmarks.cold_start --endpoint http://localhost:8000 --modes cold
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Apenas a biblioteca padrão no topo: o processo filho mede os imports do próprio repositório.
+MODES = ("cold", "warm_up")
+METRICS = ("import_pynamodb", "import_repository", "warm_up", "first_request", "second_request")
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _child(mode: str, endpoint: Optional[str]) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    from pynamodb.attributes import UnicodeAttribute
+    from pynamodb.models import Model
+    timings["import_pynamodb"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    from repository.base_repository import DynamoRepository
+    timings["import_repository"] = time.perf_counter() - started
+
+    class ColdStartModel(Model):
+        class Meta:
+            table_name = "bench_cold_start"
+            region = "us-east-1"
+            host = endpoint
+
+        pk = UnicodeAttribute(hash_key=True)
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    if endpoint is None:
+        from moto import mock_aws
+        mock_aws().start()
+    if not ColdStartModel.exists():
+        ColdStartModel.create_table(read_capacity_units=100, write_capacity_units=100, wait=True)
+    # Descarta a conexão usada no preparo: a medida começa sem cliente botocore.
+    ColdStartModel._connection = None
+
+    timings["warm_up"] = 0.0
+    if mode == "warm_up":
+        started = time.perf_counter()
+        DynamoRepository.warm_up([ColdStartModel])
+        timings["warm_up"] = time.perf_counter() - started
+
+    for metric in ("first_request", "second_request"):
+        started = time.perf_counter()
+        DynamoRepository.get(ColdStartModel, "missing")
+        timings[metric] = time.perf_counter() - started
+    return timings
+
+
+def run(runs: int = 5, modes: Sequence[str] = MODES, endpoint: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Executa ``runs`` processos por modo e devolve o documento JSON.
+
+    :param runs: Processos novos por modo.
+    :param modes: "cold" (primeira chamada cria o cliente) e/ou "warm_up" (DynamoRepository.warm_up antes).
+    :param endpoint: Endpoint DynamoDB (ex.: DynamoDB Local); None usa o moto em processo.
+    :raises ValueError: Se algum modo for desconhecido.
+    :raises RuntimeError: Se um processo filho falhar.
+    :return: Dict com metadados e, por modo, mediana e máximo de cada medida (ms).
+    """
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        raise ValueError(f"Modos desconhecidos: {', '.join(sorted(unknown))}")
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    results: List[Dict[str, Any]] = []
+    for mode in modes:
+        samples: Dict[str, List[float]] = {metric: [] for metric in METRICS}
+        for _ in range(runs):
+            command = [sys.executable, "-m", "benchmarks.cold_start", "--child", mode]
+            if endpoint:
+                command += ["--endpoint", endpoint]
+            completed = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise RuntimeError(f"Processo de cold start falhou:\n{completed.stderr}")
+            timings = json.loads(completed.stdout.strip().splitlines()[-1])
+            for metric in METRICS:
+                samples[metric].append(timings[metric] * 1000)
+        result: Dict[str, Any] = {"mode": mode, "runs": runs}
+        for metric, values in samples.items():
+            result[f"{metric}_ms"] = {"median": statistics.median(values), "max": max(values)}
+        results.append(result)
+
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "backend": endpoint or "moto",
+        "python": sys.version.split()[0],
+    }
+    return {"meta": meta, "results": results}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de cold start do DynamoRepository.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--endpoint", help="Endpoint DynamoDB (ex.: DynamoDB Local); padrão: moto em processo.")
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: stdout).")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.endpoint)))
+        return 0
+
+    output = json.dumps(run(args.runs, args.modes, args.endpoint), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
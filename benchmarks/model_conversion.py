@@ -0,0 +1,135 @@
+"""
+Microbenchmarks da conversão de itens crus do DynamoDB em objetos Python.
+
+Compara, para um item estreito (6 atributos) e um largo (~60 atributos, com números, listas
+e mapas), o custo de ``Model.from_raw_data`` com o decodificador cru de ``repository.raw``
+(caminho ``as_dict=True``). Não acessa o DynamoDB.
+
+Uso:
+    python -m benchmarks.model_conversion --number 20000 --output conversao.json
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from pynamodb.attributes import (
+    BooleanAttribute,
+    ListAttribute,
+    MapAttribute,
+    NumberAttribute,
+    UnicodeAttribute,
+    UTCDateTimeAttribute,
+)
+from pynamodb.models import Model
+
+from repository.raw import item_decoder
+
+WIDE_STRINGS = 30
+WIDE_NUMBERS = 20
+
+
+class NarrowModel(Model):
+    class Meta:
+        table_name = "bench_narrow"
+        region = "us-east-1"
+
+    pk = UnicodeAttribute(hash_key=True)
+    sk = UnicodeAttribute(range_key=True)
+    name = UnicodeAttribute()
+    email = UnicodeAttribute()
+    status = UnicodeAttribute()
+    created_at = UTCDateTimeAttribute()
+
+
+def _wide_model() -> Type[Model]:
+    class Meta:
+        table_name = "bench_wide"
+        region = "us-east-1"
+
+    attributes: Dict[str, Any] = {
+        "Meta": Meta,
+        "__module__": __name__,
+        "pk": UnicodeAttribute(hash_key=True),
+        "sk": UnicodeAttribute(range_key=True),
+        "created_at": UTCDateTimeAttribute(),
+        "active": BooleanAttribute(),
+        "tags": ListAttribute(of=UnicodeAttribute),
+        "scores": ListAttribute(),
+        "address": MapAttribute(),
+        "preferences": MapAttribute(),
+    }
+    attributes.update({f"s{i:02d}": UnicodeAttribute(null=True) for i in range(WIDE_STRINGS)})
+    attributes.update({f"n{i:02d}": NumberAttribute(null=True) for i in range(WIDE_NUMBERS)})
+    return type("WideModel", (Model,), attributes)
+
+
+WideModel = _wide_model()
+
+
+def narrow_item() -> Dict[str, Any]:
+    return NarrowModel(
+        pk="P1", sk="S1", name="Fulano de Tal", email="fulano@example.com", status="active",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ).serialize()
+
+
+def wide_item() -> Dict[str, Any]:
+    values: Dict[str, Any] = {
+        "pk": "P1",
+        "sk": "S1",
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "active": True,
+        "tags": [f"tag{i}" for i in range(10)],
+        "scores": [i * 1.5 for i in range(10)],
+        "address": {"street": "Rua A", "number": 100, "city": "São Paulo", "zip": "01000-000"},
+        "preferences": {"lang": "pt-BR", "newsletter": True, "channels": ["email", "sms"]},
+    }
+    values.update({f"s{i:02d}": f"valor {i}" * 3 for i in range(WIDE_STRINGS)})
+    values.update({f"n{i:02d}": i * 1000 + 0.25 for i in range(WIDE_NUMBERS)})
+    return WideModel(**values).serialize()
+
+
+def _bench(label: str, fn, number: int, repeat: int) -> Dict[str, Any]:
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    return {"case": label, "number": number, "best_total_s": best, "us_per_item": best / number * 1e6}
+
+
+def run(number: int = 10000, repeat: int = 5) -> Dict[str, Any]:
+    """
+    Executa os microbenchmarks e devolve o documento JSON.
+
+    :param number: Conversões por repetição.
+    :param repeat: Repetições (vale a melhor).
+    :return: Dict com um resultado por caso.
+    """
+    results: List[Dict[str, Any]] = []
+    cases: Sequence = (("narrow", NarrowModel, narrow_item()), ("wide", WideModel, wide_item()))
+    for name, model, raw in cases:
+        decode = item_decoder(model)
+        results.append(_bench(f"{name}/from_raw_data", lambda: model.from_raw_data(raw), number, repeat))
+        results.append(_bench(f"{name}/raw_dict", lambda: decode(raw), number, repeat))
+        results.append(_bench(f"{name}/serialize", lambda: model.from_raw_data(raw).serialize(), number, repeat))
+    return {"meta": {"timestamp": datetime.now(timezone.utc).isoformat()}, "results": results}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks de conversão de itens.")
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: stdout).")
+    args = parser.parse_args(argv)
+
+    output = json.dumps(run(args.number, args.repeat), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
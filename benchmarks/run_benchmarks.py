@@ -0,0 +1,300 @@
+"""
+Benchmarks do DynamoRepository contra o moto (em processo) ou um endpoint local.
+
+Mede ops/s e latência p50/p99 de get, batch_get, query, query_index, scan, scan_paginated,
+upsert, update (GetItem + PutItem) e update_fields (UpdateItem), para cada combinação de
+quantidade de itens e tamanho de item, e grava o resultado em JSON para comparar commits.
+
+Uso:
+    python -m benchmarks.run_benchmarks --items 100 1000 --sizes 256 4096 --output atual.json
+    python -m benchmarks.run_benchmarks --endpoint http://localhost:8000 --output local.json
+    python -m benchmarks.run_benchmarks --compare base.json atual.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pynamodb
+from moto import mock_aws
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
+from pynamodb.models import Model
+
+from repository.base_repository import DynamoRepository
+from repository.metrics import Histogram
+
+OPERATIONS = ("get", "batch_get", "query", "query_index", "scan", "scan_paginated", "upsert", "update", "update_fields")
+# Itens por partição: define o tamanho do resultado de cada query.
+ITEMS_PER_PARTITION = 10
+TENANTS = 10
+
+
+class BenchTenantIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "bench_tenant_index"
+        projection = AllProjection()
+        read_capacity_units = 1000
+        write_capacity_units = 1000
+
+    tenant = UnicodeAttribute(hash_key=True)
+
+
+class BenchItemModel(Model):
+    class Meta:
+        table_name = "bench_items"
+        region = "us-east-1"
+
+    pk = UnicodeAttribute(hash_key=True)
+    sk = UnicodeAttribute(range_key=True)
+    tenant = UnicodeAttribute()
+    counter = NumberAttribute(default=0)
+    payload = UnicodeAttribute()
+
+    tenant_index = BenchTenantIndex()
+
+
+@dataclass
+class BenchmarkResult:
+    operation: str
+    items: int
+    item_size: int
+    iterations: int
+    ops_per_sec: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+
+
+def make_item(i: int, item_size: int) -> BenchItemModel:
+    return BenchItemModel(
+        pk=f"P{i // ITEMS_PER_PARTITION:06d}",
+        sk=f"S{i:08d}",
+        tenant=f"T{i % TENANTS}",
+        counter=i,
+        payload="x" * item_size
+    )
+
+
+def _keys(items: int) -> List[Tuple[str, str]]:
+    return [(f"P{i // ITEMS_PER_PARTITION:06d}", f"S{i:08d}") for i in range(items)]
+
+
+def _operations(items: int, item_size: int, rng: random.Random) -> Dict[str, Callable[[], Any]]:
+    keys = _keys(items)
+    partitions = max(1, items // ITEMS_PER_PARTITION)
+
+    def upsert() -> None:
+        pk, sk = rng.choice(keys)
+        item = BenchItemModel(pk, sk, tenant="T0", counter=rng.randint(0, 10 ** 6), payload="y" * item_size)
+        DynamoRepository.upsert(item, hash_key_name="pk", range_key_name="sk")
+
+    def update() -> None:
+        # Instância parcial: o update lê o item (GetItem) e grava o item completo (PutItem).
+        pk, sk = rng.choice(keys)
+        DynamoRepository.update(BenchItemModel(pk, sk, counter=rng.randint(0, 10 ** 6)))
+
+    def update_fields() -> None:
+        pk, sk = rng.choice(keys)
+        DynamoRepository.update_fields(BenchItemModel, pk, sk, {"counter": rng.randint(0, 10 ** 6)})
+
+    return {
+        "get": lambda: DynamoRepository.get(BenchItemModel, *rng.choice(keys)),
+        "batch_get": lambda: list(DynamoRepository.batch_get(BenchItemModel, rng.sample(keys, min(100, items)))),
+        "query": lambda: list(DynamoRepository.query(BenchItemModel, f"P{rng.randrange(partitions):06d}")),
+        "query_index": lambda: list(DynamoRepository.query_index(
+            BenchItemModel, "bench_tenant_index", hash_key_value=f"T{rng.randrange(TENANTS)}"
+        )),
+        "scan": lambda: list(DynamoRepository.scan(BenchItemModel)),
+        "scan_paginated": lambda: list(DynamoRepository.scan_paginated(BenchItemModel, page_size=100)),
+        "upsert": upsert,
+        "update": update,
+        "update_fields": update_fields,
+    }
+
+
+def measure(operation: str, fn: Callable[[], Any], items: int, item_size: int, iterations: int, warmup: int) -> BenchmarkResult:
+    """
+    Executa ``fn`` ``warmup`` vezes sem medir e ``iterations`` vezes medindo cada chamada.
+    """
+    for _ in range(warmup):
+        fn()
+    histogram = Histogram(reservoir_size=iterations)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        fn()
+        histogram.observe(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return BenchmarkResult(
+        operation=operation,
+        items=items,
+        item_size=item_size,
+        iterations=iterations,
+        ops_per_sec=iterations / elapsed if elapsed > 0 else 0.0,
+        mean_ms=histogram.sum / histogram.count * 1000,
+        p50_ms=histogram.percentile(50) * 1000,
+        p99_ms=histogram.percentile(99) * 1000
+    )
+
+
+@contextmanager
+def _backend(endpoint: Optional[str]) -> Iterator[None]:
+    """
+    Aponta o modelo para o endpoint informado, ou para o moto em processo.
+    """
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    BenchItemModel.Meta.host = endpoint
+    BenchItemModel._connection = None
+    with mock_aws() if endpoint is None else nullcontext():
+        yield
+    BenchItemModel._connection = None
+
+
+def _reset_table(items: int, item_size: int) -> None:
+    if BenchItemModel.exists():
+        BenchItemModel.delete_table()
+    BenchItemModel.create_table(read_capacity_units=1000, write_capacity_units=1000, wait=True)
+    report = DynamoRepository.batch_write(puts=[make_item(i, item_size) for i in range(items)])
+    if not report.all_succeeded:
+        raise RuntimeError(f"Falha ao popular a tabela: {len(report.failed)} itens não gravados.")
+
+
+def run(
+    item_counts: Sequence[int] = (100, 1000),
+    item_sizes: Sequence[int] = (256, 4096),
+    operations: Sequence[str] = OPERATIONS,
+    iterations: int = 50,
+    scan_iterations: int = 5,
+    warmup: int = 3,
+    endpoint: Optional[str] = None,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Executa a matriz de benchmarks e devolve o documento JSON (metadados + resultados).
+
+    :param item_counts: Quantidades de itens na tabela.
+    :param item_sizes: Tamanhos (bytes) do campo ``payload`` de cada item.
+    :param operations: Operações a medir (subconjunto de OPERATIONS).
+    :param iterations: Repetições medidas por operação.
+    :param scan_iterations: Repetições de scan e scan_paginated (leem a tabela toda).
+    :param warmup: Repetições descartadas antes da medição.
+    :param endpoint: Endpoint DynamoDB (ex.: DynamoDB Local); None usa o moto em processo.
+    :param seed: Semente do gerador de chaves, para execuções reprodutíveis.
+    :raises ValueError: Se alguma operação for desconhecida.
+    :return: Dict serializável em JSON.
+    """
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Operações desconhecidas: {', '.join(sorted(unknown))}")
+
+    results: List[BenchmarkResult] = []
+    with _backend(endpoint):
+        for items in item_counts:
+            for item_size in item_sizes:
+                _reset_table(items, item_size)
+                rng = random.Random(seed)
+                available = _operations(items, item_size, rng)
+                for operation in operations:
+                    count = scan_iterations if operation.startswith("scan") else iterations
+                    results.append(measure(operation, available[operation], items, item_size, count, warmup))
+    return {"meta": _metadata(endpoint), "results": [asdict(r) for r in results]}
+
+
+def _metadata(endpoint: Optional[str]) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "backend": endpoint or "moto",
+        "python": platform.python_version(),
+        "pynamodb": pynamodb.__version__,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[str]:
+    """
+    Compara dois resultados e lista as regressões (queda de ops/s ou alta de p99 acima do limite).
+
+    :param baseline: Documento de referência.
+    :param current: Documento a avaliar.
+    :param threshold: Variação relativa tolerada (0.1 = 10%).
+    :return: Descrição de cada regressão encontrada.
+    """
+    def index(doc: Dict[str, Any]) -> Dict[Tuple[str, int, int], Dict[str, Any]]:
+        return {(r["operation"], r["items"], r["item_size"]): r for r in doc["results"]}
+
+    base = index(baseline)
+    regressions = []
+    for key, result in sorted(index(current).items()):
+        before = base.get(key)
+        if before is None:
+            continue
+        label = f"{key[0]} items={key[1]} size={key[2]}"
+        if result["ops_per_sec"] < before["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{label}: ops/s {before['ops_per_sec']:.1f} -> {result['ops_per_sec']:.1f}")
+        if result["p99_ms"] > before["p99_ms"] * (1 + threshold):
+            regressions.append(f"{label}: p99 {before['p99_ms']:.2f}ms -> {result['p99_ms']:.2f}ms")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do DynamoRepository.")
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000], help="Quantidades de itens na tabela.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 4096], help="Tamanhos do payload (bytes).")
+    parser.add_argument("--operations", nargs="+", default=list(OPERATIONS), choices=OPERATIONS)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--scan-iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--endpoint", help="Endpoint DynamoDB (ex.: DynamoDB Local); padrão: moto em processo.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: stdout).")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "ATUAL"), help="Compara dois JSONs e sai com 1 se houver regressão.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Variação tolerada na comparação.")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        for line in regressions:
+            print(line)
+        return 1 if regressions else 0
+
+    document = run(
+        item_counts=args.items,
+        item_sizes=args.sizes,
+        operations=args.operations,
+        iterations=args.iterations,
+        scan_iterations=args.scan_iterations,
+        warmup=args.warmup,
+        endpoint=args.endpoint,
+        seed=args.seed
+    )
+    output = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
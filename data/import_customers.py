@@ -0,0 +1,19 @@
+import sys
+
+from models.customer_model import CustomerModel
+from repository.base_repository import DynamoRepository
+
+
+def import_customers(path: str, capacity_fraction: float = 1.0) -> None:
+    """
+    Importa clientes de um arquivo NDJSON ou CSV e imprime o relatório de vazão.
+    """
+    report = DynamoRepository.bulk_import(CustomerModel, path, capacity_fraction=capacity_fraction)
+    print(f"Importados: {report.imported} em {report.elapsed:.1f}s ({report.items_per_second:.1f} itens/s)")
+    print(f"Falhas de escrita: {len(report.failed)} | Registros rejeitados: {len(report.rejected)}")
+    for rejected in report.rejected[:10]:
+        print(f" - registro {rejected.line}: {rejected.error}")
+
+
+if __name__ == "__main__":
+    import_customers(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else 1.0)
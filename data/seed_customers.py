@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List
 from faker import Faker
 from models.customer_model import CustomerModel
+from repository.base_repository import DynamoRepository
 
 fake = Faker()
 
@@ -28,5 +29,8 @@ def seed_customers(n: int = 10) -> None:
                 status=fake.random_element(elements=["active", "inactive"]),
                 created_at=datetime.now().isoformat()
             )
-            customer.save()
-            customers.append(customer)
\ No newline at end of file
+            customers.append(customer)
+
+        report = DynamoRepository.batch_write(puts=customers)
+        if not report.all_succeeded:
+            raise RuntimeError(f"Falha ao popular a tabela: {len(report.failed)} clientes não gravados.")
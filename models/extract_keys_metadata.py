@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import Optional, List, Type
 from pynamodb.models import Model
 from pynamodb.attributes import Attribute
+from pynamodb.indexes import LocalSecondaryIndex
 
 @dataclass
 class IndexKeyMetadata:
@@ -27,54 +28,38 @@ def extract_keys_metadata(
     :param return_attr_name: Se True, retorna o `attr_name` ao invés do nome do atributo Python.
     :return: ModelKeyMetadata com chaves primárias, GSIs e LSIs.
     """
-    attributes = model_cls._get_attributes()
+    attributes = model_cls.get_attributes()
 
-    def get_key(attr: Attribute) -> str:
-        return attr.attr_name if return_attr_name else attr.attr_name or attr.attr_name
+    def get_key(name: str, attr: Attribute) -> str:
+        return attr.attr_name if return_attr_name else name
 
     # Chaves primárias
     hash_key = None
     range_key = None
     for name, attr in attributes.items():
         if attr.is_hash_key:
-            hash_key = get_key(attr)
+            hash_key = get_key(name, attr)
         elif attr.is_range_key:
-            range_key = get_key(attr)
+            range_key = get_key(name, attr)
 
     if not hash_key:
         raise ValueError("Hash key não encontrada no modelo.")
 
-    # GSIs
+    # GSIs e LSIs (o PynamoDB guarda ambos em _indexes)
     gsis: List[IndexKeyMetadata] = []
-    for index_name, index in model_cls._indexes.items():
-        hash_key_name = None
-        range_key_name = None
-
-        for name, attr in index.attributes.items():
-            if attr.is_hash_key:
-                hash_key_name = get_key(attr)
-            elif attr.is_range_key:
-                range_key_name = get_key(attr)
-
-        gsis.append(IndexKeyMetadata(
-            name=index_name,
-            hash_key=hash_key_name,
-            range_key=range_key_name
-        ))
-
-    # LSIs
     lsis: List[IndexKeyMetadata] = []
-    for index_name, index in model_cls._local_indexes.items():
+    for index_name, index in model_cls._indexes.items():
         hash_key_name = None
         range_key_name = None
 
-        for name, attr in index.attributes.items():
+        for name, attr in index.Meta.attributes.items():
             if attr.is_hash_key:
-                hash_key_name = get_key(attr)
+                hash_key_name = get_key(name, attr)
             elif attr.is_range_key:
-                range_key_name = get_key(attr)
+                range_key_name = get_key(name, attr)
 
-        lsis.append(IndexKeyMetadata(
+        target = lsis if isinstance(index, LocalSecondaryIndex) else gsis
+        target.append(IndexKeyMetadata(
             name=index_name,
             hash_key=hash_key_name,
             range_key=range_key_name
@@ -0,0 +1,497 @@
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, Union
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import AioSession, get_session
+from botocore.exceptions import ClientError
+from pynamodb.constants import BATCH_GET_PAGE_LIMIT
+from pynamodb.exceptions import GetError
+from pynamodb.expressions.condition import Condition
+from pynamodb.expressions.projection import create_projection_expression
+from pynamodb.expressions.update import Action, Update
+from pynamodb.models import Model as PynamoModel
+
+from repository.backoff import backoff_delay
+from repository.model_metadata import model_metadata
+from repository.projection import key_projection, resolve_projection
+from repository.repository_interface import IAsyncDynamoRepository, T
+
+_CONDITIONAL_CHECK_FAILED = "ConditionalCheckFailedException"
+
+
+class _Expressions:
+    """
+    Acumula placeholders de nomes e valores ao serializar expressões PynamoDB.
+    """
+
+    def __init__(self) -> None:
+        self.names: Dict[str, str] = {}
+        self.values: Dict[str, Any] = {}
+
+    def serialize(self, expression: Union[Condition, Update]) -> str:
+        return expression.serialize(self.names, self.values)
+
+    def project(self, request: Dict[str, Any], model: Type[PynamoModel], attributes_to_get: Optional[List[Any]]) -> None:
+        projection = resolve_projection(model, attributes_to_get)
+        if projection:
+            request["ProjectionExpression"] = create_projection_expression(projection, self.names)
+
+    def apply(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if self.names:
+            request["ExpressionAttributeNames"] = {v: k for k, v in self.names.items()}
+        if self.values:
+            request["ExpressionAttributeValues"] = self.values
+        return request
+
+
+def _key_map(model: Type[PynamoModel], hash_key: Any, range_key: Optional[Any] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Monta o mapa ``Key`` do DynamoDB a partir dos valores Python das chaves.
+    """
+    hash_value, range_value = model._serialize_keys(hash_key, range_key)
+    key_attributes = model_metadata(model).key_attributes
+    hash_attr = key_attributes[0]
+    key = {hash_attr.attr_name: {hash_attr.attr_type: hash_value}}
+    if len(key_attributes) > 1 and range_value is not None:
+        range_attr = key_attributes[1]
+        key[range_attr.attr_name] = {range_attr.attr_type: range_value}
+    return key
+
+
+def _instance_key(model_instance: PynamoModel) -> Dict[str, Dict[str, Any]]:
+    model_cls = type(model_instance)
+    hash_key, range_key = model_metadata(model_cls).instance_keys(model_instance)
+    return _key_map(model_cls, hash_key, range_key)
+
+
+def _non_key_actions(model_instance: PynamoModel) -> List[Action]:
+    # Mesma regra de DynamoRepository.build_actions: None remove o atributo em vez de gravar NULL.
+    metadata = model_metadata(type(model_instance))
+    return [
+        metadata.attributes[name].remove() if value is None else metadata.attributes[name].set(value)
+        for name, value in metadata.non_key_values(model_instance.attribute_values).items()
+    ]
+
+
+def _is_conditional_failure(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") == _CONDITIONAL_CHECK_FAILED
+
+
+class AsyncDynamoRepository(IAsyncDynamoRepository):
+    """
+    Repositório assíncrono para DynamoDB sobre aiobotocore, com as mesmas operações do
+    DynamoRepository.
+
+    Os modelos PynamoDB continuam sendo usados para serializar chaves, itens e expressões;
+    apenas o transporte é assíncrono. Uma instância mantém um único cliente aiobotocore (e seu
+    pool HTTP), que deve ser compartilhado por toda a aplicação.
+
+    Exemplo:
+        async with AsyncDynamoRepository.from_model(CustomerModel) as repo:
+            customer = await repo.get(CustomerModel, "C001", "T1")
+            async for item in repo.query(CustomerModel, "C001"):
+                ...
+    """
+
+    def __init__(
+        self,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        max_pool_connections: int = 50,
+        session: Optional[AioSession] = None,
+        config: Optional[AioConfig] = None
+    ) -> None:
+        """
+        :param region_name: Região AWS.
+        :param endpoint_url: Endpoint alternativo (ex.: LocalStack).
+        :param max_pool_connections: Tamanho do pool HTTP do cliente.
+        :param session: Sessão aiobotocore a reutilizar (opcional).
+        :param config: Configuração completa do cliente (sobrepõe ``max_pool_connections``).
+        """
+        self._region_name = region_name
+        self._endpoint_url = endpoint_url
+        self._session = session or get_session()
+        self._config = config or AioConfig(max_pool_connections=max_pool_connections)
+        self._client: Any = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._client_lock = asyncio.Lock()
+
+    @classmethod
+    def from_model(cls, model: Type[PynamoModel], **kwargs: Any) -> "AsyncDynamoRepository":
+        """
+        Cria o repositório com a região e o host declarados no ``Meta`` do modelo.
+        """
+        return cls(
+            region_name=getattr(model.Meta, "region", None),
+            endpoint_url=getattr(model.Meta, "host", None),
+            **kwargs
+        )
+
+    async def __aenter__(self) -> "AsyncDynamoRepository":
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _get_client(self) -> Any:
+        if self._client is not None:
+            return self._client
+        async with self._client_lock:
+            if self._client is None:
+                exit_stack = AsyncExitStack()
+                self._client = await exit_stack.enter_async_context(self._session.create_client(
+                    "dynamodb",
+                    region_name=self._region_name,
+                    endpoint_url=self._endpoint_url,
+                    config=self._config
+                ))
+                self._exit_stack = exit_stack
+        return self._client
+
+    async def close(self) -> None:
+        """
+        Fecha o cliente e libera o pool de conexões.
+        """
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._client = None
+        self._exit_stack = None
+
+    async def get(
+        self,
+        model: Type[T],
+        hash_key: Any,
+        range_key: Optional[Any] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> Optional[T]:
+        """
+        Obtém um item pelo hash key e opcionalmente range key.
+
+        :param attributes_to_get: Atributos a retornar (ProjectionExpression); None traz o item completo.
+        :return: Instância do modelo se encontrada, None caso contrário.
+        """
+        if not hash_key:
+            return None
+        expressions = _Expressions()
+        request: Dict[str, Any] = {
+            "TableName": model.Meta.table_name,
+            "Key": _key_map(model, hash_key, range_key if range_key else None),
+            "ConsistentRead": consistent_read,
+        }
+        expressions.project(request, model, attributes_to_get)
+        client = await self._get_client()
+        response = await client.get_item(**expressions.apply(request))
+        item = response.get("Item")
+        return model.from_raw_data(item) if item else None
+
+    async def exists(
+        self,
+        model: Type[T],
+        hash_key: Any,
+        range_key: Optional[Any] = None,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> bool:
+        """
+        Verifica se um item existe na tabela, projetando apenas as chaves por padrão.
+        """
+        projection = attributes_to_get or key_projection(model)
+        return await self.get(model, hash_key, range_key, attributes_to_get=projection) is not None
+
+    async def insert(self, model_instance: T) -> T:
+        """
+        Insere (ou sobrescreve) um item com PutItem.
+        """
+        client = await self._get_client()
+        await client.put_item(TableName=type(model_instance).Meta.table_name, Item=model_instance.serialize())
+        return model_instance
+
+    async def update(
+        self,
+        model_instance: T,
+        hash_key_name: Optional[str] = None,
+        range_key_name: Optional[str] = None,
+        consistent_read: bool = False
+    ) -> T:
+        """
+        Atualiza os atributos não-chave de um item existente em um único UpdateItem.
+
+        As chaves são lidas da declaração do modelo; ``hash_key_name``/``range_key_name`` são
+        aceitos apenas por compatibilidade com DynamoRepository.update.
+
+        :raises DoesNotExist: Se o item não existir.
+        :return: Instância com o item completo após a atualização.
+        """
+        model_cls = type(model_instance)
+        actions = _non_key_actions(model_instance)
+        if not actions:
+            hash_key, range_key = model_metadata(model_cls).instance_keys(model_instance)
+            existing = await self.get(model_cls, hash_key, range_key, consistent_read=consistent_read)
+            if existing is None:
+                raise model_cls.DoesNotExist()
+            return existing
+
+        hash_attr = model_cls._hash_key_attribute()
+        try:
+            return await self._update_item(model_instance, actions, condition=hash_attr.exists())
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                raise model_cls.DoesNotExist() from e
+            raise
+
+    async def upsert(
+        self,
+        model_instance: T,
+        hash_key_name: Optional[str] = None,
+        range_key_name: Optional[str] = None,
+        consistent_read: bool = False
+    ) -> T:
+        """
+        Insere ou atualiza um item em uma única chamada (UpdateItem cria o item se não existir).
+
+        :return: Instância com o item completo após a escrita.
+        """
+        actions = _non_key_actions(model_instance)
+        if actions:
+            return await self._update_item(model_instance, actions)
+
+        model_cls = type(model_instance)
+        hash_attr = model_cls._hash_key_attribute()
+        expressions = _Expressions()
+        request = expressions.apply({
+            "TableName": model_cls.Meta.table_name,
+            "Item": _instance_key(model_instance),
+            "ConditionExpression": expressions.serialize(hash_attr.does_not_exist()),
+        })
+        client = await self._get_client()
+        try:
+            await client.put_item(**request)
+        except ClientError as e:
+            if not _is_conditional_failure(e):
+                raise
+        return model_instance
+
+    async def _update_item(
+        self,
+        model_instance: T,
+        actions: List[Action],
+        condition: Optional[Condition] = None
+    ) -> T:
+        model_cls = type(model_instance)
+        expressions = _Expressions()
+        request: Dict[str, Any] = {
+            "TableName": model_cls.Meta.table_name,
+            "Key": _instance_key(model_instance),
+            "UpdateExpression": expressions.serialize(Update(*actions)),
+            "ReturnValues": "ALL_NEW",
+        }
+        if condition is not None:
+            request["ConditionExpression"] = expressions.serialize(condition)
+        client = await self._get_client()
+        response = await client.update_item(**expressions.apply(request))
+        model_instance.deserialize(response["Attributes"])
+        return model_instance
+
+    async def delete(self, model: Type[T], hash_key: Any, range_key: Optional[Any] = None) -> None:
+        """
+        Remove um item da tabela pelo hash e range key.
+        """
+        client = await self._get_client()
+        await client.delete_item(TableName=model.Meta.table_name, Key=_key_map(model, hash_key, range_key))
+
+    def query(
+        self,
+        model_cls: Type[T],
+        hash_key_value: Optional[Any] = None,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Condition] = None,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        use_scan_if_missing_hash: bool = False,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> AsyncIterator[T]:
+        """
+        Query por partition key (ou scan, com ``use_scan_if_missing_hash``), como iterador assíncrono.
+
+        :raises ValueError: Se parâmetros inválidos para a consulta.
+        """
+        return self._query_or_scan(
+            model_cls, None, hash_key_value, range_key_condition, filter_condition,
+            limit, scan_forward, use_scan_if_missing_hash, consistent_read, attributes_to_get
+        )
+
+    def query_index(
+        self,
+        model_cls: Type[T],
+        index_name: str,
+        hash_key_value: Optional[Any] = None,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Condition] = None,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        use_scan_if_missing_hash: bool = False,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> AsyncIterator[T]:
+        """
+        Query em índice secundário, como iterador assíncrono.
+
+        :raises KeyError: Se o índice não existir no modelo.
+        :raises ValueError: Se parâmetros inválidos.
+        """
+        return self._query_or_scan(
+            model_cls, index_name, hash_key_value, range_key_condition, filter_condition,
+            limit, scan_forward, use_scan_if_missing_hash, consistent_read, attributes_to_get
+        )
+
+    def _query_or_scan(
+        self,
+        model_cls: Type[T],
+        index_name: Optional[str],
+        hash_key_value: Optional[Any],
+        range_key_condition: Optional[Condition],
+        filter_condition: Optional[Condition],
+        limit: Optional[int],
+        scan_forward: bool,
+        use_scan_if_missing_hash: bool,
+        consistent_read: bool,
+        attributes_to_get: Optional[List[Any]]
+    ) -> AsyncIterator[T]:
+        if hash_key_value is None:
+            if not (use_scan_if_missing_hash and range_key_condition is not None):
+                raise ValueError(
+                    "hash_key_value é obrigatório, exceto se use_scan_if_missing_hash=True e range_key_condition for fornecido."
+                )
+            full_filter = range_key_condition & filter_condition if filter_condition else range_key_condition
+            return self._scan(model_cls, full_filter, limit, consistent_read, attributes_to_get, index_name)
+
+        if index_name is not None:
+            hash_attr = model_cls._indexes[index_name]._hash_key_attribute()
+        else:
+            hash_attr = model_cls._hash_key_attribute()
+        key_condition = hash_attr == hash_key_value
+        if range_key_condition is not None:
+            key_condition &= range_key_condition
+
+        expressions = _Expressions()
+        request: Dict[str, Any] = {
+            "TableName": model_cls.Meta.table_name,
+            "KeyConditionExpression": expressions.serialize(key_condition),
+            "ScanIndexForward": scan_forward,
+            "ConsistentRead": consistent_read,
+        }
+        if filter_condition is not None:
+            request["FilterExpression"] = expressions.serialize(filter_condition)
+        if index_name is not None:
+            request["IndexName"] = index_name
+        expressions.project(request, model_cls, attributes_to_get)
+        return self._paginate("query", model_cls, expressions.apply(request), limit)
+
+    def scan(
+        self,
+        model: Type[T],
+        filter_condition: Optional[Condition] = None,
+        limit: Optional[int] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> AsyncIterator[T]:
+        """
+        Escaneia a tabela, opcionalmente filtrando, como iterador assíncrono.
+        """
+        return self._scan(model, filter_condition, limit, consistent_read, attributes_to_get)
+
+    def _scan(
+        self,
+        model: Type[T],
+        filter_condition: Optional[Condition],
+        limit: Optional[int],
+        consistent_read: bool,
+        attributes_to_get: Optional[List[Any]] = None,
+        index_name: Optional[str] = None
+    ) -> AsyncIterator[T]:
+        expressions = _Expressions()
+        request: Dict[str, Any] = {"TableName": model.Meta.table_name, "ConsistentRead": consistent_read}
+        if filter_condition is not None:
+            request["FilterExpression"] = expressions.serialize(filter_condition)
+        if index_name is not None:
+            request["IndexName"] = index_name
+        expressions.project(request, model, attributes_to_get)
+        return self._paginate("scan", model, expressions.apply(request), limit)
+
+    async def _paginate(
+        self,
+        operation: str,
+        model: Type[T],
+        request: Dict[str, Any],
+        limit: Optional[int]
+    ) -> AsyncIterator[T]:
+        """
+        Percorre as páginas de query/scan, buscando a próxima página apenas quando necessário.
+        """
+        if limit is not None:
+            if limit <= 0:
+                return
+            request["Limit"] = limit
+        client = await self._get_client()
+        remaining = limit
+        while True:
+            response = await getattr(client, operation)(**request)
+            for item in response.get("Items", []):
+                yield model.from_raw_data(item)
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if not last_evaluated_key:
+                return
+            request["ExclusiveStartKey"] = last_evaluated_key
+
+    async def batch_get(
+        self,
+        model: Type[T],
+        keys: List[Union[Any, tuple]],
+        consistent_read: bool = True,
+        attributes_to_get: Optional[List[Any]] = None,
+        max_retries: int = 8,
+        base_delay: float = 0.05,
+        max_delay: float = 5.0
+    ) -> AsyncIterator[T]:
+        """
+        Busca múltiplos itens em lotes de 100, reenviando UnprocessedKeys com backoff.
+
+        :param keys: Lista de chaves (tuplas hash e range, ou apenas hash).
+        :param attributes_to_get: Atributos a retornar (ProjectionExpression); None traz o item completo.
+        :param max_retries: Reenvios máximos de UnprocessedKeys por lote.
+        :param base_delay: Atraso base (segundos) do backoff exponencial.
+        :param max_delay: Atraso máximo (segundos) entre reenvios.
+        :raises pynamodb.exceptions.GetError: Se restarem UnprocessedKeys após ``max_retries`` reenvios.
+        """
+        table_name = model.Meta.table_name
+        expressions = _Expressions()
+        table_request: Dict[str, Any] = {"ConsistentRead": consistent_read}
+        expressions.project(table_request, model, attributes_to_get)
+        expressions.apply(table_request)
+        unique: List[Tuple[Any, Any]] = list(dict.fromkeys(
+            key if isinstance(key, tuple) else (key, None) for key in keys
+        ))
+        client = await self._get_client()
+        for start in range(0, len(unique), BATCH_GET_PAGE_LIMIT):
+            pending = [_key_map(model, h, r) for h, r in unique[start:start + BATCH_GET_PAGE_LIMIT]]
+            attempt = 0
+            while True:
+                response = await client.batch_get_item(RequestItems={
+                    table_name: dict(table_request, Keys=pending)
+                })
+                for item in response.get("Responses", {}).get(table_name, []):
+                    yield model.from_raw_data(item)
+                pending = response.get("UnprocessedKeys", {}).get(table_name, {}).get("Keys", [])
+                if not pending:
+                    break
+                if attempt >= max_retries:
+                    raise GetError(f"UnprocessedKeys após {attempt + 1} tentativas: {len(pending)} chaves não lidas.")
+                await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+                attempt += 1
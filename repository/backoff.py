@@ -0,0 +1,15 @@
+import random
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Backoff exponencial com jitter total: ``uniform(0, min(max_delay, base_delay * 2^attempt))``.
+
+    Compartilhado pelas retentativas de lote (UnprocessedItems/UnprocessedKeys) e de conflito.
+
+    :param attempt: Tentativa que falhou, começando em 0.
+    :param base_delay: Atraso base (segundos).
+    :param max_delay: Atraso máximo (segundos).
+    :return: Segundos a esperar antes da próxima tentativa.
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
@@ -1,13 +1,83 @@
-from typing import Type, Any, Optional, List, Dict, Union, Iterator, TypeVar
-from pynamodb.exceptions import DoesNotExist
+from __future__ import annotations
+
+import functools
+import itertools
+import weakref
+from typing import TYPE_CHECKING, Type, Any, Callable, Optional, List, Dict, Sequence, Tuple, Union, Iterator, TypeVar
+from pynamodb.exceptions import DoesNotExist, PutError
 from pynamodb.pagination import ResultIterator
 from pynamodb.models import Model as PynamoModel
-from pynamodb.expressions.update import SetAction
+from pynamodb.expressions.update import Action
 from pynamodb.expressions.operand import Path
 from pynamodb.expressions.condition import Condition
 
+from repository.lazy_import import LazyModule
+from repository.model_metadata import model_metadata
+from repository.pagination import (
+    CheckpointStore,
+    Page,
+    decode_continuation_token,
+    encode_continuation_token,
+    iter_pages,
+    resolve_start_token,
+)
+from repository.projection import key_projection, projection_key, resolve_projection
 from repository.repository_interface import IDynamoRepository
 
+if TYPE_CHECKING:
+    from repository.batch_loader import BatchGetLoader
+    from repository.batch_write import BatchWriteReport
+    from repository.bulk_import import ImportReport
+    from repository.cache import ItemCache
+    from repository.columnar import ColumnarTable
+    from repository.connection import ConnectionManager
+    from repository.export import ExportReport, Sink
+    from repository.metrics import MetricsHook
+    from repository.query_planner import QueryPlan
+    from repository.rate_limit import CapacityLimiter
+    from repository.scan_guard import ScanGuard
+    from repository.single_flight import SingleFlight
+
+# Funcionalidades opcionais: importadas só quando usadas, para reduzir o tempo de import.
+_batch_write_module = LazyModule("repository.batch_write")
+_bulk_import_module = LazyModule("repository.bulk_import")
+_columnar_module = LazyModule("repository.columnar")
+_conditional_module = LazyModule("repository.conditional")
+_export_module = LazyModule("repository.export")
+_metrics_module = LazyModule("repository.metrics")
+_parallel_scan_module = LazyModule("repository.parallel_scan")
+_query_planner_module = LazyModule("repository.query_planner")
+_raw_module = LazyModule("repository.raw")
+_single_flight_module = LazyModule("repository.single_flight")
+
+# Operações usadas pelo repositório, preparadas por warm_up.
+_DATA_OPERATIONS = (
+    "GetItem", "PutItem", "UpdateItem", "DeleteItem", "Query", "Scan", "BatchGetItem", "BatchWriteItem",
+)
+
+
+def _instrumented(operation: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Mede o método com o hook de configure_instrumentation; sem hook, chama direto.
+
+    Chamadas feitas de dentro de outra chamada medida (ex.: o get interno do upsert) não
+    geram registro próprio: seu consumo entra na chamada externa.
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            hook = DynamoRepository._metrics_hook
+            if hook is None or _metrics_module.in_scope():
+                return fn(*args, **kwargs)
+            target = args[0] if args else kwargs.get("model", kwargs.get("model_cls", kwargs.get("model_instance")))
+            model = target if isinstance(target, type) else type(target)
+            return _metrics_module.measure(hook, operation, model, functools.partial(fn, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+# Snapshot serializado (attr_name -> valor DynamoDB) das instâncias rastreadas por track_changes.
+_change_snapshots: "weakref.WeakKeyDictionary[PynamoModel, Dict[str, Any]]" = weakref.WeakKeyDictionary()
 
 class DynamoRepository(IDynamoRepository):
     """
@@ -24,116 +94,669 @@ class DynamoRepository(IDynamoRepository):
         fetched = DynamoRepository.get(CustomerModel, "C001", "T1")
     """
 
+    # Cache opcional de itens usado por get/exists (ver configure_cache).
+    _cache: Optional[ItemCache] = None
+    # Coalescência opcional de GetItems concorrentes (ver configure_single_flight).
+    _single_flight: Optional[SingleFlight] = None
+    # Agrupamento opcional de gets concorrentes em BatchGetItem (ver configure_batch_loader).
+    _batch_loader: Optional[BatchGetLoader] = None
+    # Limitador opcional de RCU/WCU por tabela e GSI (ver configure_rate_limiter).
+    _rate_limiter: Optional[CapacityLimiter] = None
+    _rate_limited_models: List[Type[PynamoModel]] = []
+    # Gerenciador opcional de conexões compartilhadas (ver configure_connections).
+    _connection_manager: Optional[ConnectionManager] = None
+    # Destino opcional das métricas por chamada (ver configure_instrumentation).
+    _metrics_hook: Optional[MetricsHook] = None
+    # Proteção opcional contra scans de fallback (ver configure_scan_guard).
+    _scan_guard: Optional[ScanGuard] = None
+
+    @staticmethod
+    def configure_cache(cache: Optional[ItemCache]) -> None:
+        """
+        Ativa (ou desativa, com None) o cache read-through de get/exists.
+
+        As escritas feitas pelo próprio repositório (insert, update, upsert, delete,
+        update_fields, update_changed e batch_write) invalidam as entradas afetadas.
+
+        :param cache: Instância de ItemCache, ou None para desativar.
+        """
+        DynamoRepository._cache = cache
+
+    @staticmethod
+    def configure_single_flight(enabled: bool = True) -> Optional[SingleFlight]:
+        """
+        Ativa (ou desativa) a coalescência de leituras concorrentes em get/exists.
+
+        Com o modo ativo, threads que pedem a mesma chave ao mesmo tempo compartilham um
+        único GetItem em voo. Cada thread recebe sua própria instância do modelo.
+
+        :param enabled: True para ativar, False para desativar.
+        :return: O SingleFlight ativo (expõe os contadores ``executions`` e ``shared``), ou None.
+        """
+        DynamoRepository._single_flight = _single_flight_module.SingleFlight() if enabled else None
+        return DynamoRepository._single_flight
+
+    @staticmethod
+    def configure_batch_loader(loader: Optional[BatchGetLoader]) -> None:
+        """
+        Ativa (ou desativa, com None) o agrupamento de get/exists concorrentes em BatchGetItem.
+
+        Com o loader ativo, as leituras pontuais feitas por threads diferentes dentro da janela
+        do loader (ou até 100 chaves) viram um único ``batch_get``, sem mudança para quem chama.
+
+        Limite: só há agrupamento entre threads concorrentes. Um ``get`` sem outra leitura em
+        andamento no mesmo modelo é enviado na hora (sem pagar a janela), e um laço sequencial
+        continua fazendo uma chamada por item; para ele, use ``batch_get`` ou
+        ``BatchGetLoader.load_many``.
+
+        :param loader: Instância de BatchGetLoader, ou None para desativar.
+        """
+        DynamoRepository._batch_loader = loader
+
+    @staticmethod
+    def configure_connections(
+        manager: Optional[ConnectionManager],
+        models: Sequence[Type[PynamoModel]] = ()
+    ) -> None:
+        """
+        Faz os modelos informados compartilharem o cliente botocore (e o pool HTTP) do gerenciador.
+
+        Configure antes de configure_rate_limiter: o limitador registra seus handlers no
+        cliente da conexão. Com None, o gerenciador anterior é fechado e cada modelo volta a
+        criar a própria conexão.
+
+        :param manager: Instância de ConnectionManager, ou None para desativar.
+        :param models: Modelos que passam a usar o cliente compartilhado.
+        """
+        previous = DynamoRepository._connection_manager
+        if previous is not None and previous is not manager:
+            previous.close()
+        DynamoRepository._connection_manager = manager
+        if manager is not None:
+            for model in models:
+                manager.attach(model)
+
     @staticmethod
-    def get(model: Type[PynamoModel], hash_key: Any, range_key: Optional[Any] = None) -> Optional[PynamoModel]:
+    def warm_up(models: Sequence[Type[PynamoModel]], connect: bool = False) -> None:
+        """
+        Monta antecipadamente o que o PynamoDB e o botocore criam na primeira chamada.
+
+        Para cada modelo: schema e MetaTable da conexão, cliente botocore (modelo de serviço,
+        regras de endpoint e credenciais) e os modelos das operações de dados. Chame na
+        inicialização de workers de vida curta (ex.: fora do handler do Lambda) para tirar esse
+        custo da primeira requisição. Com configure_connections ativo, os modelos são anexados
+        ao gerenciador e o modelo de serviço é carregado uma única vez.
+
+        :param models: Modelos a preparar.
+        :param connect: Se True, faz um DescribeTable por modelo para já abrir a conexão HTTP.
+        """
+        manager = DynamoRepository._connection_manager
+        for model in models:
+            connection = model._get_connection()
+            if manager is not None:
+                manager.attach(model)
+            service_model = connection.connection.client.meta.service_model
+            for operation in _DATA_OPERATIONS:
+                service_model.operation_model(operation)
+            if connect:
+                model.describe_table()
+
+    @staticmethod
+    def configure_rate_limiter(
+        limiter: Optional[CapacityLimiter],
+        models: Sequence[Type[PynamoModel]] = ()
+    ) -> None:
+        """
+        Ativa (ou desativa, com None) o limite de capacidade no cliente para os modelos informados.
+
+        Todas as chamadas feitas pelas conexões desses modelos (inclusive fora do repositório)
+        passam a pedir ``ReturnConsumedCapacity`` e a respeitar os baldes do limitador, que se
+        ajustam ao consumo observado e aos throttles. Um job em background pode usar, por
+        exemplo, ``CapacityLimiter(capacity_fraction=0.3)`` para deixar 70% da capacidade livre.
+        Trocas de cliente botocore feitas pelo PynamoDB são seguidas automaticamente; se a
+        conexão do modelo for recriada (``configure_connections(None)``), configure de novo.
+
+        :param limiter: Instância de CapacityLimiter, ou None para desativar.
+        :param models: Modelos cujas tabelas serão limitadas.
+        """
+        previous = DynamoRepository._rate_limiter
+        if previous is not None:
+            for model in DynamoRepository._rate_limited_models:
+                previous.detach(model)
+        DynamoRepository._rate_limiter = limiter
+        DynamoRepository._rate_limited_models = list(models) if limiter is not None else []
+        for model in DynamoRepository._rate_limited_models:
+            limiter.attach(model)
+
+    @staticmethod
+    def configure_instrumentation(hook: Optional[MetricsHook]) -> None:
+        """
+        Ativa (ou desativa, com None) a medição das chamadas do repositório.
+
+        Cada chamada a get, exists, insert, update, upsert, update_fields, delete, query,
+        query_index, scan, scan_paginated e batch_get gera um CallMetrics (latência, páginas,
+        itens retornados e avaliados, RCU/WCU consumida) entregue ao hook. Use MetricsRegistry
+        para percentis e exportação Prometheus, StatsDHook para StatsD, profiling.Profiler para
+        dividir o tempo entre rede, parsing e construção dos modelos, ou CompositeHook para combiná-los.
+
+        :param hook: Destino das métricas, ou None para desativar.
+        """
+        DynamoRepository._metrics_hook = hook
+
+    @staticmethod
+    def configure_scan_guard(guard: Optional[ScanGuard]) -> None:
+        """
+        Ativa (ou desativa, com None) a proteção dos scans de fallback.
+
+        Com ``use_scan_if_missing_hash=True``, query, query_index e flexible_query viram um scan
+        completo quando falta a chave hash. Com o guard ativo, cada um desses scans tem o custo
+        estimado pelo DescribeTable e, acima do orçamento, é recusado, registrado em log,
+        limitado em páginas ou paralelizado, conforme a política (ver ScanGuard).
+
+        :param guard: Instância de ScanGuard, ou None para desativar.
+        """
+        DynamoRepository._scan_guard = guard
+
+    @staticmethod
+    def _fallback_scan(
+        model_cls: Type[PynamoModel],
+        operation: str,
+        filter_condition: Optional[Condition],
+        index_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        attributes_to_get: Optional[List[Any]] = None,
+        segments: Optional[int] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[PynamoModel, Dict[str, Any]]]:
+        """
+        Scan usado quando a consulta não tem chave hash, passando pelo ScanGuard se configurado.
+
+        ``segments`` pede um scan paralelo (usado pelo planejador do flexible_query).
+        """
+        # Scan paralelo não retoma de um token nem projeta atributos.
+        can_parallelize = start_token is None and not attributes_to_get
+        guard = DynamoRepository._scan_guard
+        decision = None
+        if guard is not None:
+            decision = guard.check(
+                model_cls,
+                operation,
+                index_name=index_name,
+                consistent_read=consistent_read,
+                can_parallelize=can_parallelize
+            )
+            if decision.action == "parallelize":
+                segments = decision.segments
+            elif decision.action == "cap":
+                segments = None
+
+        if segments is not None and can_parallelize:
+            items = _parallel_scan_module.parallel_scan(
+                model_cls,
+                filter_condition=filter_condition,
+                segments=segments,
+                consistent_read=consistent_read,
+                index_name=index_name,
+                as_dict=as_dict
+            )
+            return itertools.islice(items, limit) if limit is not None else items
+
+        results = model_cls.scan(
+            index_name=index_name,
+            filter_condition=filter_condition,
+            limit=limit,
+            consistent_read=consistent_read,
+            last_evaluated_key=decode_continuation_token(start_token),
+            attributes_to_get=resolve_projection(model_cls, attributes_to_get)
+        )
+        if guard is not None:
+            guard.meter(results, decision)
+        return _raw_module.as_dicts(model_cls, results) if as_dict else results
+
+    @staticmethod
+    @_instrumented("get")
+    def get(
+        model: Type[PynamoModel],
+        hash_key: Any,
+        range_key: Optional[Any] = None,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> Optional[PynamoModel]:
         """
         Obtém um item pelo hash key e opcionalmente range key.
 
+        Se houver cache configurado, consulta-o antes do DynamoDB. Leituras com projeção
+        podem ser atendidas pelo cache, mas não o alimentam (o item retornado é parcial).
+
         :param model: Classe do modelo PynamoDB.
         :param hash_key: Valor da chave hash (partition key).
         :param range_key: Valor da chave de range (sort key), se aplicável.
+        :param attributes_to_get: Atributos a retornar (ProjectionExpression); None traz o item completo.
         :return: Instância do modelo se encontrada, None caso contrário.
         """
         if not hash_key:
             # Caso hash_key seja None ou vazio, retorna None diretamente.
             return None
+        range_key = range_key if range_key else None
+        projection = resolve_projection(model, attributes_to_get)
+
+        cache = DynamoRepository._cache
+        if cache is None:
+            return DynamoRepository._fetch(model, hash_key, range_key, projection)
+
+        found, item = cache.lookup(model, hash_key, range_key)
+        if found:
+            return item
+        generation = cache.generation
+        item = DynamoRepository._fetch(model, hash_key, range_key, projection)
+        if projection is None or item is None:
+            cache.put(model, hash_key, range_key, item, generation=generation)
+        return item
+
+    @staticmethod
+    def _fetch(
+        model: Type[PynamoModel],
+        hash_key: Any,
+        range_key: Optional[Any],
+        projection: Optional[List[Any]] = None
+    ) -> Optional[PynamoModel]:
+        single_flight = DynamoRepository._single_flight
+        if single_flight is None:
+            return DynamoRepository._get_item(model, hash_key, range_key, projection)
+
+        item, shared = single_flight.do(
+            (model, hash_key, range_key, projection_key(projection)),
+            lambda: DynamoRepository._get_item(model, hash_key, range_key, projection)
+        )
+        if shared and item is not None:
+            # Quem aguardou recebe uma cópia, para não compartilhar a instância entre threads.
+            return model.from_raw_data(item.serialize(null_check=False))
+        return item
+
+    @staticmethod
+    def _get_item(
+        model: Type[PynamoModel],
+        hash_key: Any,
+        range_key: Optional[Any],
+        projection: Optional[List[Any]] = None
+    ) -> Optional[PynamoModel]:
+        if DynamoRepository._batch_loader is not None and projection is None:
+            return DynamoRepository._batch_loader.load(model, hash_key, range_key)
         try:
-            return model.get(hash_key, range_key) if range_key else model.get(hash_key)
+            return model.get(hash_key, range_key, attributes_to_get=projection)
         except DoesNotExist:
             return None
 
     @staticmethod
-    def exists(model: Type[PynamoModel], hash_key: Any, range_key: Optional[Any] = None) -> bool:
+    def _invalidate(model_instance: PynamoModel) -> None:
+        if DynamoRepository._cache is not None:
+            DynamoRepository._cache.invalidate_instance(model_instance)
+
+    @staticmethod
+    @_instrumented("exists")
+    def exists(
+        model: Type[PynamoModel],
+        hash_key: Any,
+        range_key: Optional[Any] = None,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> bool:
         """
         Verifica se um item existe na tabela.
 
+        Por padrão projeta apenas as chaves primárias, sem baixar o restante do item.
+
         :param model: Classe do modelo PynamoDB.
         :param hash_key: Valor da chave hash.
         :param range_key: Valor da chave range (opcional).
+        :param attributes_to_get: Projeção a usar (padrão: somente as chaves).
         :return: True se o item existir, False caso contrário.
         """
-        return DynamoRepository.get(model, hash_key, range_key) is not None
+        projection = attributes_to_get or key_projection(model)
+        return DynamoRepository.get(model, hash_key, range_key, attributes_to_get=projection) is not None
 
     @staticmethod
-    def insert(model_instance: PynamoModel) -> PynamoModel:
+    @_instrumented("insert")
+    def insert(
+        model_instance: PynamoModel,
+        if_not_exists: bool = False,
+        condition: Optional[Condition] = None
+    ) -> PynamoModel:
         """
         Insere um novo item na tabela.
 
+        Por padrão o PutItem sobrescreve um item com a mesma chave. Com ``if_not_exists`` a
+        escrita é condicionada a ``attribute_not_exists`` da chave hash, e o DynamoDB recusa a
+        duplicata na mesma chamada. Modelos com VersionAttribute já recebem do PynamoDB a
+        condição de versão (item novo: versão inexistente).
+
         :param model_instance: Instância do modelo a ser inserida.
+        :param if_not_exists: Se True, falha quando o item já existir.
+        :param condition: Condição adicional para a escrita (ConditionExpression).
+        :raises pynamodb.exceptions.PutError: Se a condição não for satisfeita.
         :return: A própria instância inserida.
         """
-        model_instance.save()
+        if if_not_exists:
+            metadata = model_metadata(type(model_instance))
+            not_exists = metadata.attributes[metadata.hash_key_name].does_not_exist()
+            condition = not_exists if condition is None else not_exists & condition
+        model_instance.save(condition=condition)
+        DynamoRepository._invalidate(model_instance)
         return model_instance
 
     @staticmethod
+    @_instrumented("update")
     def update(
         model_instance: PynamoModel,
-        hash_key_name: str,
+        hash_key_name: Optional[str] = None,
         range_key_name: Optional[str] = None,
-        consistent_read: bool = False
+        consistent_read: bool = False,
+        condition: Optional[Condition] = None
     ) -> PynamoModel:
         """
         Atualiza um item existente na tabela com os dados da instância fornecida.
 
         Evita sobrescrever chaves primárias e salva o item.
 
+        Em modelos com VersionAttribute, ou quando ``condition`` é informada, não há leitura
+        prévia: os atributos não-chave viram um único UpdateItem condicionado à existência do
+        item, à ``condition`` e à versão carregada na instância (incrementada na escrita). Um
+        conflito de versão é recusado pelo DynamoDB; veja ``update_with_retry``.
+
         :param model_instance: Instância com os dados atualizados.
-        :param hash_key_name: Nome do campo de chave hash.
-        :param range_key_name: Nome do campo de chave range, se existir.
-        :param consistent_read: Se True, faz leitura consistente.
+        :param hash_key_name: Nome do campo de chave hash (padrão: o declarado no modelo).
+        :param range_key_name: Nome do campo de chave range, se existir (usado só com ``hash_key_name``).
+        :param consistent_read: Se True, faz leitura consistente (apenas no caminho com leitura).
+        :param condition: Condição adicional para a escrita (ConditionExpression).
+        :raises DoesNotExist: Se o item não existir (caminho com leitura).
+        :raises pynamodb.exceptions.UpdateError: Se a condição, a versão ou a existência do item
+            não forem satisfeitas (caminho condicional).
         :return: Instância atualizada salva no DynamoDB.
         """
         model_cls = type(model_instance)
-        hash_key = getattr(model_instance, hash_key_name)
-        range_key = getattr(model_instance, range_key_name) if range_key_name else None
+        if condition is not None or model_metadata(model_cls).version_attribute is not None:
+            return DynamoRepository._conditional_update(model_instance, condition)
+
+        hash_key, range_key = DynamoRepository._instance_keys(model_instance, hash_key_name, range_key_name)
 
         # Recupera o item existente
         if range_key is not None:
             existing = model_cls.get(hash_key, range_key, consistent_read=consistent_read)
         else:
             existing = model_cls.get(hash_key, consistent_read=consistent_read)
+        return DynamoRepository._merge_and_save(existing, model_instance)
 
-        # Atualiza os atributos, exceto as chaves primárias
-        for attr, value in model_instance.attribute_values.items():
-            attr_def = model_cls._get_attributes().get(attr)
-            if attr_def and not attr_def.is_hash_key and not attr_def.is_range_key:
-                setattr(existing, attr, value)
+    @staticmethod
+    def _merge_and_save(existing: PynamoModel, model_instance: PynamoModel) -> PynamoModel:
+        """
+        Copia os atributos não-chave da instância para o item lido e o salva.
+        """
+        metadata = model_metadata(type(existing))
+        for attr, value in metadata.non_key_values(model_instance.attribute_values).items():
+            setattr(existing, attr, value)
 
         existing.save()
+        DynamoRepository._invalidate(existing)
         return existing
 
     @staticmethod
+    def _conditional_update(model_instance: PynamoModel, condition: Optional[Condition] = None) -> PynamoModel:
+        """
+        UpdateItem único com os atributos não-chave, condicionado à existência do item e a
+        ``condition``; o PynamoDB acrescenta a condição e o incremento da versão.
+        """
+        model_cls = type(model_instance)
+        metadata = model_metadata(model_cls)
+        updates = metadata.non_key_values(model_instance.attribute_values)
+        updates.pop(metadata.version_attribute, None)
+        if not updates:
+            raise ValueError("Nenhum atributo não-chave para atualizar.")
+
+        exists = metadata.attributes[metadata.hash_key_name].exists()
+        model_instance.update(
+            actions=DynamoRepository.build_actions(updates, model_cls),
+            condition=exists if condition is None else exists & condition
+        )
+        DynamoRepository._invalidate(model_instance)
+        return model_instance
+
+    @staticmethod
+    def update_with_retry(
+        model_instance: PynamoModel,
+        mutate: Callable[[PynamoModel], None],
+        condition: Optional[Condition] = None,
+        max_attempts: int = 5,
+        base_delay: float = 0.02,
+        max_delay: float = 1.0
+    ) -> PynamoModel:
+        """
+        Aplica ``mutate`` à instância e grava com ``update`` condicional; em conflito (versão ou
+        ``condition`` não satisfeitas) relê o item com leitura consistente, reaplica ``mutate`` e
+        tenta de novo com backoff exponencial e jitter.
+
+        Sem disputa é uma única chamada: a instância recebida (por exemplo, vinda de ``get``)
+        é tomada como estado atual e só é relida após um conflito real.
+
+        Uso:
+            order = DynamoRepository.get(OrderModel, "o-1")
+            DynamoRepository.update_with_retry(order, lambda o: setattr(o, "total", o.total + 10))
+
+        :param model_instance: Instância carregada, com a versão lida.
+        :param mutate: Função que altera a instância in-place.
+        :param condition: Condição adicional para a escrita.
+        :param max_attempts: Tentativas de escrita, incluindo a primeira.
+        :param base_delay: Atraso base (segundos) do backoff.
+        :param max_delay: Atraso máximo (segundos) entre tentativas.
+        :raises ValueError: Se o modelo não tiver VersionAttribute e ``condition`` for None.
+        :raises DoesNotExist: Se o item deixar de existir durante os retries.
+        :raises pynamodb.exceptions.UpdateError: Se o conflito persistir após ``max_attempts``.
+        :return: Instância gravada, sincronizada com o item salvo.
+        """
+        model_cls = type(model_instance)
+        metadata = model_metadata(model_cls)
+        if metadata.version_attribute is None and condition is None:
+            raise ValueError("O modelo não declara VersionAttribute; informe condition para detectar conflitos.")
+
+        def reload(instance: PynamoModel) -> PynamoModel:
+            hash_key, range_key = metadata.instance_keys(instance)
+            return model_cls.get(hash_key, range_key, consistent_read=True)
+
+        return _conditional_module.retry_on_conflict(
+            model_instance,
+            mutate,
+            write=lambda instance: DynamoRepository.update(instance, condition=condition),
+            reload=reload,
+            max_attempts=max_attempts,
+            base_delay=base_delay,
+            max_delay=max_delay
+        )
+
+    @staticmethod
+    @_instrumented("upsert")
     def upsert(
         model_instance: PynamoModel,
-        hash_key_name: str,
+        hash_key_name: Optional[str] = None,
         range_key_name: Optional[str] = None,
-        consistent_read: bool = False
+        consistent_read: bool = False,
+        single_request: bool = False
     ) -> PynamoModel:
         """
         Insere ou atualiza um item (upsert).
 
         Tenta obter o item; se existir, atualiza, caso contrário insere novo.
 
+        Com ``single_request=True`` o upsert é feito com um único UpdateItem, montado a partir
+        dos atributos não-chave da instância. O DynamoDB cria o item caso ele não exista, então
+        não há leitura prévia nem ``save()`` completo.
+
         :param model_instance: Instância do modelo.
-        :param hash_key_name: Nome da chave hash.
-        :param range_key_name: Nome da chave range (opcional).
-        :param consistent_read: Leitura consistente se True.
+        :param hash_key_name: Nome da chave hash (padrão: o declarado no modelo).
+        :param range_key_name: Nome da chave range (usado só com ``hash_key_name``).
+        :param consistent_read: Leitura consistente se True (ignorado com ``single_request``).
+        :param single_request: Se True, usa um único UpdateItem em vez de get + update/insert.
         :return: Instância inserida ou atualizada.
         """
+        if single_request:
+            return DynamoRepository._upsert_single_request(model_instance)
+
         model_cls = type(model_instance)
-        hash_key = getattr(model_instance, hash_key_name)
-        range_key = getattr(model_instance, range_key_name) if range_key_name else None
+        hash_key, range_key = DynamoRepository._instance_keys(model_instance, hash_key_name, range_key_name)
 
         try:
             if range_key is not None:
-                model_cls.get(hash_key, range_key, consistent_read=consistent_read)
+                existing = model_cls.get(hash_key, range_key, consistent_read=consistent_read)
             else:
-                model_cls.get(hash_key, consistent_read=consistent_read)
-            return DynamoRepository.update(model_instance, hash_key_name, range_key_name)
+                existing = model_cls.get(hash_key, consistent_read=consistent_read)
         except DoesNotExist:
             return DynamoRepository.insert(model_instance)
+        return DynamoRepository._merge_and_save(existing, model_instance)
+
+    @staticmethod
+    def _instance_keys(
+        model_instance: PynamoModel,
+        hash_key_name: Optional[str] = None,
+        range_key_name: Optional[str] = None
+    ) -> Tuple[Any, Optional[Any]]:
+        """
+        Valores (hash, range) da instância: pelos nomes informados ou, sem eles, pelas chaves
+        declaradas no modelo (extrator em cache).
+        """
+        if hash_key_name is None:
+            return model_metadata(type(model_instance)).instance_keys(model_instance)
+        hash_key = getattr(model_instance, hash_key_name)
+        range_key = getattr(model_instance, range_key_name) if range_key_name else None
+        return hash_key, range_key
+
+    @staticmethod
+    def _upsert_single_request(model_instance: PynamoModel) -> PynamoModel:
+        """
+        Executa o upsert em uma única chamada ao DynamoDB.
+
+        Os atributos não-chave viram ações SET de um UpdateItem (que já devolve o item completo
+        com ALL_NEW). Se a instância só tiver as chaves, não há o que atualizar: faz um PutItem
+        condicionado à inexistência do item, ignorando a falha de condição quando ele já existe.
+
+        :param model_instance: Instância do modelo.
+        :return: A própria instância, sincronizada com o item salvo.
+        """
+        model_cls = type(model_instance)
+        metadata = model_metadata(model_cls)
+        updates = metadata.non_key_values(model_instance.attribute_values)
+
+        if updates:
+            model_instance.update(actions=DynamoRepository.build_actions(updates, model_cls))
+            DynamoRepository._invalidate(model_instance)
+            return model_instance
+
+        hash_attr = metadata.attributes[metadata.hash_key_name]
+        hash_key, range_key = model_instance._get_hash_range_key_serialized_values()
+        try:
+            model_cls._get_connection().put_item(
+                hash_key,
+                range_key=range_key,
+                condition=hash_attr.does_not_exist()
+            )
+        except PutError as e:
+            if not _conditional_module.is_conflict(e):
+                raise
+        DynamoRepository._invalidate(model_instance)
+        return model_instance
+
+    @staticmethod
+    @_instrumented("update_fields")
+    def update_fields(
+        model: Type[PynamoModel],
+        hash_key: Any,
+        range_key: Optional[Any],
+        updates: Dict[str, Any],
+        condition: Optional[Condition] = None
+    ) -> PynamoModel:
+        """
+        Atualiza parcialmente um item com um único UpdateItem, sem ler o item antes.
+
+        Apenas os atributos informados em ``updates`` são enviados (valores None removem o
+        atributo). Como o UpdateItem cria o item se ele não existir, use ``condition`` (por
+        exemplo ``Model.hash_attr.exists()``) quando o item precisar existir previamente.
+
+        :param model: Classe do modelo.
+        :param hash_key: Valor da chave hash.
+        :param range_key: Valor da chave range (None se o modelo não tiver).
+        :param updates: Dicionário atributo -> novo valor.
+        :param condition: Condição opcional para a escrita (ConditionExpression).
+        :raises ValueError: Se ``updates`` estiver vazio.
+        :raises pynamodb.exceptions.UpdateError: Se a condição não for satisfeita.
+        :return: Instância com o item completo após a atualização (ALL_NEW).
+        """
+        if not updates:
+            raise ValueError("updates não pode ser vazio.")
+        instance = model(hash_key, range_key) if range_key is not None else model(hash_key)
+        instance.update(actions=DynamoRepository.build_actions(updates, model), condition=condition)
+        DynamoRepository._invalidate(instance)
+        return instance
+
+    @staticmethod
+    def track_changes(model_instance: PynamoModel) -> PynamoModel:
+        """
+        Passa a rastrear as alterações feitas na instância a partir do estado atual.
+
+        Use em instâncias carregadas do DynamoDB (por exemplo via ``get``) e depois chame
+        ``update_changed`` para enviar somente os atributos modificados.
+
+        :param model_instance: Instância do modelo.
+        :return: A própria instância.
+        """
+        _change_snapshots[model_instance] = model_instance.serialize(null_check=False)
+        return model_instance
+
+    @staticmethod
+    def changed_attributes(model_instance: PynamoModel) -> Dict[str, Any]:
+        """
+        Retorna os atributos não-chave alterados desde ``track_changes``.
+
+        A comparação é feita sobre os valores serializados, então alterações in-place em
+        listas, mapas e sets também são detectadas.
+
+        :param model_instance: Instância rastreada.
+        :raises ValueError: Se a instância não estiver sendo rastreada.
+        :return: Dicionário atributo -> valor atual (None para atributos removidos).
+        """
+        snapshot = _change_snapshots.get(model_instance)
+        if snapshot is None:
+            raise ValueError("Instância não rastreada; chame track_changes antes.")
+
+        current = model_instance.serialize(null_check=False)
+        metadata = model_metadata(type(model_instance))
+        changed: Dict[str, Any] = {}
+        for name in metadata.non_key_attributes:
+            attr_name = metadata.attributes[name].attr_name
+            if current.get(attr_name) != snapshot.get(attr_name):
+                changed[name] = getattr(model_instance, name)
+        return changed
+
+    @staticmethod
+    def update_changed(model_instance: PynamoModel, condition: Optional[Condition] = None) -> PynamoModel:
+        """
+        Envia apenas os atributos alterados de uma instância rastreada em um único UpdateItem.
+
+        Se nada mudou, nenhuma chamada é feita. Após a escrita o rastreamento recomeça a partir
+        do item retornado pelo DynamoDB.
+
+        :param model_instance: Instância rastreada com ``track_changes``.
+        :param condition: Condição opcional para a escrita (ConditionExpression).
+        :raises ValueError: Se a instância não estiver sendo rastreada.
+        :return: A própria instância, sincronizada com o item salvo.
+        """
+        changed = DynamoRepository.changed_attributes(model_instance)
+        if not changed:
+            return model_instance
+        actions = DynamoRepository.build_actions(changed, type(model_instance))
+        model_instance.update(actions=actions, condition=condition)
+        DynamoRepository._invalidate(model_instance)
+        DynamoRepository.track_changes(model_instance)
+        return model_instance
 
     @staticmethod
+    @_instrumented("delete")
     def delete(model: Type[PynamoModel], hash_key: Any, range_key: Optional[Any] = None) -> None:
         """
         Remove um item da tabela pelo hash e range key.
@@ -142,12 +765,12 @@ class DynamoRepository(IDynamoRepository):
         :param hash_key: Valor da chave hash.
         :param range_key: Valor da chave range (opcional).
         """
-        if range_key is not None:
-            model(hash_key, range_key).delete()
-        else:
-            model(hash_key).delete()
+        instance = model(hash_key, range_key) if range_key is not None else model(hash_key)
+        instance.delete()
+        DynamoRepository._invalidate(instance)
 
     @staticmethod
+    @_instrumented("query")
     def query(
         model_cls: Type[PynamoModel],
         hash_key_value: Optional[Any] = None,
@@ -156,8 +779,11 @@ class DynamoRepository(IDynamoRepository):
         limit: Optional[int] = None,
         scan_forward: bool = True,
         use_scan_if_missing_hash: bool = False,
-        consistent_read: bool = False
-    ) -> Iterator[PynamoModel]:
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        attributes_to_get: Optional[List[Any]] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[PynamoModel, Dict[str, Any]]]:
         """
         Realiza query por partition key e opcionalmente sort key, ou scan com condição de range key.
 
@@ -169,34 +795,46 @@ class DynamoRepository(IDynamoRepository):
         :param scan_forward: Ordenação ascendente da sort key.
         :param use_scan_if_missing_hash: Se True, permite scan se hash_key_value não fornecido.
         :param consistent_read: Se True, leitura consistente.
+        :param start_token: Token de continuação (ver ``continuation_token``) para retomar a leitura.
+        :param attributes_to_get: Atributos a retornar (ProjectionExpression); None traz o item completo.
+        :param as_dict: Se True, retorna dicts montados direto da resposta, sem instanciar o modelo.
         :raises ValueError: Se parâmetros inválidos para a consulta.
         :return: Iterador dos itens encontrados.
         """
         if hash_key_value is not None:
-            return model_cls.query(
+            results = model_cls.query(
                 hash_key_value,
                 range_key_condition=range_key_condition,
                 filter_condition=filter_condition,
                 limit=limit,
                 scan_index_forward=scan_forward,
-                consistent_read=consistent_read
+                consistent_read=consistent_read,
+                last_evaluated_key=decode_continuation_token(start_token),
+                attributes_to_get=resolve_projection(model_cls, attributes_to_get)
             )
         elif use_scan_if_missing_hash and range_key_condition is not None:
             full_filter = (
                 range_key_condition & filter_condition
                 if filter_condition else range_key_condition
             )
-            return model_cls.scan(
-                filter_condition=full_filter,
+            return DynamoRepository._fallback_scan(
+                model_cls,
+                "query",
+                full_filter,
                 limit=limit,
-                consistent_read=consistent_read
+                consistent_read=consistent_read,
+                start_token=start_token,
+                attributes_to_get=attributes_to_get,
+                as_dict=as_dict
             )
         else:
             raise ValueError(
                 "hash_key_value é obrigatório, exceto se use_scan_if_missing_hash=True e range_key_condition for fornecido."
             )
+        return _raw_module.as_dicts(model_cls, results) if as_dict else results
 
     @staticmethod
+    @_instrumented("query_index")
     def query_index(
         model_cls: Type[PynamoModel],
         index_name: str,
@@ -206,8 +844,11 @@ class DynamoRepository(IDynamoRepository):
         limit: Optional[int] = None,
         scan_forward: bool = True,
         use_scan_if_missing_hash: bool = False,
-        consistent_read: bool = False
-    ) -> Iterator[PynamoModel]:
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        attributes_to_get: Optional[List[Any]] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[PynamoModel, Dict[str, Any]]]:
         """
         Consulta usando índice secundário global ou local.
 
@@ -220,42 +861,57 @@ class DynamoRepository(IDynamoRepository):
         :param scan_forward: Ordenação da chave sort.
         :param use_scan_if_missing_hash: Permite scan se hash_key_value não fornecido.
         :param consistent_read: Leitura consistente.
+        :param start_token: Token de continuação (ver ``continuation_token``) para retomar a leitura.
+        :param attributes_to_get: Atributos a retornar (ProjectionExpression); None traz o item completo.
+        :param as_dict: Se True, retorna dicts montados direto da resposta, sem instanciar o modelo.
         :raises ValueError: Se parâmetros inválidos.
         :return: Iterador dos itens encontrados.
         """
         if hash_key_value is not None:
-            return model_cls.query(
+            results = model_cls.query(
                 hash_key_value,
                 index_name=index_name,
                 range_key_condition=range_key_condition,
                 filter_condition=filter_condition,
                 limit=limit,
                 scan_index_forward=scan_forward,
-                consistent_read=consistent_read
+                consistent_read=consistent_read,
+                last_evaluated_key=decode_continuation_token(start_token),
+                attributes_to_get=resolve_projection(model_cls, attributes_to_get)
             )
         elif use_scan_if_missing_hash and range_key_condition is not None:
             full_filter = (
                 range_key_condition & filter_condition
                 if filter_condition else range_key_condition
             )
-            return model_cls.scan(
+            return DynamoRepository._fallback_scan(
+                model_cls,
+                "query_index",
+                full_filter,
                 index_name=index_name,
-                filter_condition=full_filter,
                 limit=limit,
-                consistent_read=consistent_read
+                consistent_read=consistent_read,
+                start_token=start_token,
+                attributes_to_get=attributes_to_get,
+                as_dict=as_dict
             )
         else:
             raise ValueError(
                 "hash_key_value é obrigatório, exceto se use_scan_if_missing_hash=True e range_key_condition for fornecido."
             )
+        return _raw_module.as_dicts(model_cls, results) if as_dict else results
 
     @staticmethod
+    @_instrumented("scan")
     def scan(
         model: Type[PynamoModel],
         filter_condition: Optional[Condition] = None,
         limit: Optional[int] = None,
-        consistent_read: bool = False
-    ) -> Iterator[PynamoModel]:
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        attributes_to_get: Optional[List[Any]] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[PynamoModel, Dict[str, Any]]]:
         """
         Escaneia toda a tabela, opcionalmente filtrando os resultados.
 
@@ -263,62 +919,443 @@ class DynamoRepository(IDynamoRepository):
         :param filter_condition: Condição para filtrar resultados.
         :param limit: Limite de itens retornados.
         :param consistent_read: Se True, leitura consistente.
+        :param start_token: Token de continuação (ver ``continuation_token``) para retomar a leitura.
+        :param attributes_to_get: Atributos a retornar (ProjectionExpression); None traz o item completo.
+        :param as_dict: Se True, retorna dicts montados direto da resposta, sem instanciar o modelo.
         :return: Iterador dos itens encontrados.
         """
-        return model.scan(filter_condition=filter_condition, limit=limit, consistent_read=consistent_read)
+        results = model.scan(
+            filter_condition=filter_condition,
+            limit=limit,
+            consistent_read=consistent_read,
+            last_evaluated_key=decode_continuation_token(start_token),
+            attributes_to_get=resolve_projection(model, attributes_to_get)
+        )
+        return _raw_module.as_dicts(model, results) if as_dict else results
 
     @staticmethod
+    @_instrumented("scan_paginated")
     def scan_paginated(
         model: Type[PynamoModel],
         filter_condition: Optional[Condition] = None,
         page_size: int = 10,
         limit: Optional[int] = None,
-        consistent_read: bool = False
-    ) -> ResultIterator[PynamoModel]:
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        as_dict: bool = False
+    ) -> ResultIterator[Union[PynamoModel, Dict[str, Any]]]:
         """
         Escaneia a tabela paginando resultados para controlar memória e latência.
 
+        O progresso pode ser salvo com ``continuation_token`` e retomado via ``start_token``.
+
         :param model: Classe do modelo.
         :param filter_condition: Condição para filtrar resultados.
         :param page_size: Tamanho da página (itens por página).
         :param limit: Limite total de itens a retornar.
         :param consistent_read: Leitura consistente.
+        :param start_token: Token de continuação para retomar a leitura.
+        :param as_dict: Se True, retorna dicts montados direto da resposta, sem instanciar o modelo.
         :return: ResultIterator para iteração paginada.
         """
-        return model.scan(
+        results = model.scan(
             filter_condition=filter_condition,
             limit=limit,
             page_size=page_size,
+            consistent_read=consistent_read,
+            last_evaluated_key=decode_continuation_token(start_token)
+        )
+        return _raw_module.as_dicts(model, results) if as_dict else results
+
+    @staticmethod
+    def continuation_token(results: ResultIterator) -> Optional[str]:
+        """
+        Gera o token de continuação de um ResultIterator retornado por scan/query.
+
+        O token aponta para o último item entregue, então pode ser obtido a qualquer momento
+        da iteração. Retorna None quando não há mais resultados.
+
+        :param results: Iterador retornado por ``scan``, ``scan_paginated``, ``query`` ou ``query_index``.
+        :return: Token opaco para ``start_token``, ou None.
+        """
+        return encode_continuation_token(results.last_evaluated_key)
+
+    @staticmethod
+    def scan_pages(
+        model: Type[PynamoModel],
+        filter_condition: Optional[Condition] = None,
+        page_size: int = 100,
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        checkpoint_id: Optional[str] = None
+    ) -> Iterator[Page]:
+        """
+        Escaneia a tabela página a página, emitindo um token de continuação por página.
+
+        Com ``checkpoint``, cada página concluída é registrada em ``checkpoint_id`` e uma nova
+        execução com o mesmo id retoma a partir da última página concluída.
+
+        :param model: Classe do modelo.
+        :param filter_condition: Condição para filtrar resultados.
+        :param page_size: Itens avaliados por página.
+        :param consistent_read: Leitura consistente.
+        :param start_token: Token de continuação (tem prioridade sobre o checkpoint).
+        :param checkpoint: Destino opcional do progresso (ex.: FileCheckpointStore).
+        :param checkpoint_id: Identificador do job no checkpoint.
+        :raises ValueError: Se ``checkpoint`` for informado sem ``checkpoint_id``.
+        :return: Iterador de Page.
+        """
+        start_token = resolve_start_token(start_token, checkpoint, checkpoint_id)
+        results = model.scan(
+            filter_condition=filter_condition,
+            page_size=page_size,
+            consistent_read=consistent_read,
+            last_evaluated_key=decode_continuation_token(start_token)
+        )
+        return iter_pages(model, results, checkpoint, checkpoint_id)
+
+    @staticmethod
+    def query_pages(
+        model_cls: Type[PynamoModel],
+        hash_key_value: Any,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Condition] = None,
+        page_size: int = 100,
+        scan_forward: bool = True,
+        consistent_read: bool = False,
+        index_name: Optional[str] = None,
+        start_token: Optional[str] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        checkpoint_id: Optional[str] = None
+    ) -> Iterator[Page]:
+        """
+        Consulta (na tabela ou em um índice) página a página, emitindo tokens de continuação.
+
+        :param model_cls: Classe do modelo.
+        :param hash_key_value: Valor da chave hash (da tabela ou do índice).
+        :param range_key_condition: Condição sobre a sort key.
+        :param filter_condition: Filtros adicionais.
+        :param page_size: Itens avaliados por página.
+        :param scan_forward: Ordenação ascendente da sort key.
+        :param consistent_read: Leitura consistente.
+        :param index_name: Nome do índice, se aplicável.
+        :param start_token: Token de continuação (tem prioridade sobre o checkpoint).
+        :param checkpoint: Destino opcional do progresso.
+        :param checkpoint_id: Identificador do job no checkpoint.
+        :raises ValueError: Se ``checkpoint`` for informado sem ``checkpoint_id``.
+        :return: Iterador de Page.
+        """
+        start_token = resolve_start_token(start_token, checkpoint, checkpoint_id)
+        results = model_cls.query(
+            hash_key_value,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            index_name=index_name,
+            page_size=page_size,
+            scan_index_forward=scan_forward,
+            consistent_read=consistent_read,
+            last_evaluated_key=decode_continuation_token(start_token)
+        )
+        return iter_pages(model_cls, results, checkpoint, checkpoint_id)
+
+    @staticmethod
+    def parallel_scan(
+        model: Type[PynamoModel],
+        filter_condition: Optional[Condition] = None,
+        segments: int = 4,
+        workers: Optional[int] = None,
+        queue_size: int = 1000,
+        page_size: Optional[int] = None,
+        consistent_read: bool = False
+    ) -> Iterator[PynamoModel]:
+        """
+        Escaneia a tabela em paralelo, dividindo-a em segmentos (Segment/TotalSegments).
+
+        Os itens de todos os segmentos chegam em um único iterador, sem ordem garantida.
+        A memória fica limitada por ``queue_size``: as threads só continuam paginando
+        conforme o consumidor retira itens.
+
+        :param model: Classe do modelo.
+        :param filter_condition: Condição para filtrar resultados.
+        :param segments: Número de segmentos do scan.
+        :param workers: Threads simultâneas (padrão: uma por segmento).
+        :param queue_size: Máximo de itens aguardando consumo.
+        :param page_size: Tamanho da página de cada segmento.
+        :param consistent_read: Se True, leitura consistente.
+        :return: Iterador dos itens encontrados.
+        """
+        return _parallel_scan_module.parallel_scan(
+            model,
+            filter_condition=filter_condition,
+            segments=segments,
+            workers=workers,
+            queue_size=queue_size,
+            page_size=page_size,
+            consistent_read=consistent_read
+        )
+
+    @staticmethod
+    def export(
+        model: Type[PynamoModel],
+        sink: Sink,
+        format: str = "ndjson",
+        index_name: Optional[str] = None,
+        segments: int = 1,
+        hash_key_value: Optional[Any] = None,
+        filter_condition: Optional[Condition] = None,
+        compression: Optional[str] = None,
+        page_size: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> ExportReport:
+        """
+        Exporta a tabela (ou um índice) em streaming para um arquivo NDJSON ou Parquet.
+
+        Sem ``hash_key_value`` é feito um scan, paralelo quando ``segments > 1``; com ele, uma
+        query. Cada bloco é gravado assim que lido, com memória limitada.
+
+        :param model: Classe do modelo.
+        :param sink: Caminho do arquivo ou objeto binário aberto para escrita.
+        :param format: "ndjson" ou "parquet" (requer pyarrow).
+        :param index_name: Índice a ler, se aplicável.
+        :param segments: Segmentos do scan paralelo.
+        :param hash_key_value: Chave hash para exportar via query.
+        :param filter_condition: Condição para filtrar resultados.
+        :param compression: NDJSON: None ou "gzip". Parquet: codec do pyarrow.
+        :param page_size: Itens avaliados por página.
+        :param batch_size: Linhas por bloco gravado.
+        :raises ValueError: Se formato ou compressão forem inválidos.
+        :raises ImportError: Se ``format="parquet"`` sem pyarrow instalado.
+        :return: ExportReport.
+        """
+        return _export_module.export(
+            model,
+            sink,
+            format=format,
+            index_name=index_name,
+            segments=segments,
+            hash_key_value=hash_key_value,
+            filter_condition=filter_condition,
+            compression=compression,
+            page_size=page_size,
+            batch_size=batch_size
+        )
+
+    @staticmethod
+    def scan_to_columns(
+        model: Type[PynamoModel],
+        attributes: Optional[List[str]] = None,
+        filter_condition: Optional[Condition] = None,
+        page_size: Optional[int] = None,
+        consistent_read: bool = False
+    ) -> ColumnarTable:
+        """
+        Escaneia a tabela materializando o resultado em colunas (uma por atributo).
+
+        As páginas são despejadas direto em buffers colunares, sem criar um objeto por item;
+        ``ColumnarTable.to_numpy`` converte as colunas para NumPy quando disponível. Colunas
+        numéricas só ficam exatas (int64) quando todos os itens têm valores inteiros; do
+        contrário viram float64, e inteiros acima de 2**53 perdem precisão.
+
+        :param model: Classe do modelo.
+        :param attributes: Atributos a materializar; None usa todos os do modelo.
+        :param filter_condition: Condição para filtrar resultados.
+        :param page_size: Itens avaliados por página.
+        :param consistent_read: Se True, leitura consistente.
+        :raises ValueError: Se algum atributo não existir no modelo.
+        :return: ColumnarTable.
+        """
+        return _columnar_module.scan_to_columns(
+            model,
+            attributes=attributes,
+            filter_condition=filter_condition,
+            page_size=page_size,
             consistent_read=consistent_read
         )
 
     @staticmethod
+    @_instrumented("batch_get")
     def batch_get(
         model: Type[PynamoModel],
         keys: List[Union[Any, tuple]],
-        consistent_read: bool = True
-    ) -> Iterator[PynamoModel]:
+        consistent_read: bool = True,
+        attributes_to_get: Optional[List[Any]] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[PynamoModel, Dict[str, Any]]]:
         """
         Busca múltiplos itens em lote pelo conjunto de chaves.
 
         :param model: Classe do modelo.
         :param keys: Lista de chaves (tuplas hash e range, ou apenas hash).
         :param consistent_read: Leitura consistente.
+        :param attributes_to_get: Atributos a retornar (ProjectionExpression); None traz o item completo.
+        :param as_dict: Se True, retorna dicts montados direto da resposta, sem instanciar o modelo.
         :return: Iterador com os itens encontrados.
         """
-        return model.batch_get(keys, consistent_read=consistent_read)
+        if as_dict:
+            return _raw_module.batch_get_dicts(
+                model,
+                keys,
+                consistent_read=consistent_read,
+                attributes_to_get=resolve_projection(model, attributes_to_get)
+            )
+        return model.batch_get(
+            keys,
+            consistent_read=consistent_read,
+            attributes_to_get=resolve_projection(model, attributes_to_get)
+        )
 
     @staticmethod
-    def build_actions(updates: Dict[str, Any]) -> List[SetAction]:
+    def batch_write(
+        puts: Optional[List[PynamoModel]] = None,
+        deletes: Optional[List[PynamoModel]] = None,
+        max_workers: int = 4,
+        max_retries: int = 8
+    ) -> BatchWriteReport:
+        """
+        Grava e remove múltiplos itens em lote.
+
+        As operações são agrupadas por tabela e divididas em lotes de 25 itens (limite do
+        BatchWriteItem), enviados em paralelo por um pool de threads limitado. Itens devolvidos
+        em UnprocessedItems são reenviados com backoff exponencial com jitter.
+
+        :param puts: Instâncias a inserir/sobrescrever.
+        :param deletes: Instâncias a remover (apenas as chaves são usadas).
+        :param max_workers: Número máximo de lotes enviados simultaneamente.
+        :param max_retries: Reenvios máximos de UnprocessedItems por lote.
+        :raises ValueError: Se a mesma chave aparecer mais de uma vez.
+        :return: BatchWriteReport com o resultado de cada item.
+        """
+        report = _batch_write_module.run_batch_write(puts, deletes, max_workers=max_workers, max_retries=max_retries)
+        for result in report.results:
+            DynamoRepository._invalidate(result.item)
+        return report
+
+    @staticmethod
+    def update_many(
+        items: Sequence[PynamoModel],
+        consistent_read: bool = False,
+        max_workers: int = 4,
+        max_retries: int = 8
+    ) -> BatchWriteReport:
+        """
+        Versão em lote de ``update`` para itens de uma ou mais tabelas.
+
+        Os itens são agrupados por tabela, lidos com BatchGetItem, mesclados com os atributos
+        não-chave de cada instância e gravados com BatchWriteItem em paralelo (ver
+        ``batch_write``). Itens inexistentes não são gravados e aparecem como falha no relatório.
+        O BatchWriteItem não aceita condições: VersionAttribute e travas otimistas não são
+        verificados aqui (use ``update``/``update_with_retry`` quando precisar delas).
+
+        :param items: Instâncias com os dados atualizados; as chaves vêm do modelo.
+        :param consistent_read: Leitura consistente dos itens atuais.
+        :param max_workers: Threads de leitura e escrita.
+        :param max_retries: Reenvios máximos de UnprocessedItems por lote.
+        :raises ValueError: Se a mesma chave aparecer mais de uma vez.
+        :return: BatchWriteReport com um resultado por item, na ordem de entrada.
+        """
+        report = _batch_write_module.run_upsert_many(
+            items,
+            require_existing=True,
+            consistent_read=consistent_read,
+            max_workers=max_workers,
+            max_retries=max_retries
+        )
+        for result in report.results:
+            DynamoRepository._invalidate(result.item)
+        return report
+
+    @staticmethod
+    def upsert_many(
+        items: Sequence[PynamoModel],
+        consistent_read: bool = False,
+        max_workers: int = 4,
+        max_retries: int = 8
+    ) -> BatchWriteReport:
+        """
+        Versão em lote de ``upsert`` para itens de uma ou mais tabelas.
+
+        Como ``update_many``, mas itens inexistentes são inseridos. Cada 100 itens custam uma
+        chamada BatchGetItem e quatro BatchWriteItem, em vez de uma leitura e uma escrita por item.
+
+        :param items: Instâncias a inserir ou atualizar; as chaves vêm do modelo.
+        :param consistent_read: Leitura consistente dos itens atuais.
+        :param max_workers: Threads de leitura e escrita.
+        :param max_retries: Reenvios máximos de UnprocessedItems por lote.
+        :raises ValueError: Se a mesma chave aparecer mais de uma vez.
+        :return: BatchWriteReport com um resultado por item, na ordem de entrada.
+        """
+        report = _batch_write_module.run_upsert_many(
+            items,
+            consistent_read=consistent_read,
+            max_workers=max_workers,
+            max_retries=max_retries
+        )
+        for result in report.results:
+            DynamoRepository._invalidate(result.item)
+        return report
+
+    @staticmethod
+    def bulk_import(
+        model: Type[PynamoModel],
+        path: str,
+        format: Optional[str] = None,
+        max_workers: int = 4,
+        write_capacity: Optional[float] = None,
+        capacity_fraction: float = 1.0,
+        max_retries: int = 8
+    ) -> ImportReport:
+        """
+        Importa registros de um arquivo NDJSON ou CSV para a tabela do modelo.
+
+        Os registros são validados contra os atributos do modelo e gravados em lotes de 25 por
+        um pool de threads, respeitando a WCU disponível (token bucket) e reenviando
+        UnprocessedItems. O cache de itens é limpo ao final, pois os itens gravados não são
+        rastreados individualmente.
+
+        :param model: Classe do modelo.
+        :param path: Caminho do arquivo (.ndjson/.jsonl/.csv, opcionalmente .gz).
+        :param format: "ndjson" ou "csv"; por padrão deduzido pela extensão.
+        :param max_workers: Threads que enviam lotes.
+        :param write_capacity: WCU/s disponível; por padrão a WCU provisionada da tabela.
+        :param capacity_fraction: Fração da capacidade a usar.
+        :param max_retries: Reenvios máximos de UnprocessedItems por lote.
+        :raises ValueError: Se o formato ou ``capacity_fraction`` forem inválidos.
+        :return: ImportReport com itens importados, falhas, rejeições e vazão (itens/s).
+        """
+        try:
+            return _bulk_import_module.bulk_import(
+                model,
+                path,
+                format=format,
+                max_workers=max_workers,
+                write_capacity=write_capacity,
+                capacity_fraction=capacity_fraction,
+                max_retries=max_retries
+            )
+        finally:
+            if DynamoRepository._cache is not None:
+                DynamoRepository._cache.clear()
+
+    @staticmethod
+    def build_actions(updates: Dict[str, Any], model: Optional[Type[PynamoModel]] = None) -> List[Action]:
         """
         Gera uma lista de ações para atualização parcial via update.
 
-        Cada ação corresponde a um atributo e seu novo valor, usando SetAction.
+        Cada ação corresponde a um atributo e seu novo valor, usando SetAction. Quando o modelo
+        é informado, o valor é serializado pelo atributo declarado (respeitando ``attr_name`` e o
+        tipo do atributo). Valores None geram RemoveAction.
 
         :param updates: Dicionário atributo -> novo valor.
+        :param model: Classe do modelo, usada para resolver os atributos (opcional).
         :return: Lista de ações para passar em update.
         """
-        return [SetAction(Path(attr), value) for attr, value in updates.items()]
+        attributes = model_metadata(model).attributes if model is not None else {}
+        actions: List[Action] = []
+        for attr, value in updates.items():
+            target = attributes[attr] if model is not None else Path(attr)
+            actions.append(target.remove() if value is None else target.set(value))
+        return actions
 
     @staticmethod
     def flexible_query(
@@ -330,11 +1367,17 @@ class DynamoRepository(IDynamoRepository):
         scan_forward: bool = True,
         consistent_read: bool = False,
         use_scan_if_missing_hash: bool = False,
-        index_name: Optional[str] = None
+        index_name: Optional[str] = None,
+        where: Optional[Sequence[Condition]] = None,
+        segments: int = 4
     ) -> Iterator[PynamoModel]:
         """
         Consulta flexível que unifica query normal, query com índice e fallback para scan.
 
+        Com ``where``, o caminho é escolhido pelo planejador (ver ``plan_query``): GetItem,
+        query na tabela, query em GSI/LSI ou, com ``use_scan_if_missing_hash``, scan paralelo.
+        ``range_key_condition`` e ``filter_condition`` entram como predicados adicionais.
+
         :param model_cls: Classe do modelo Pynamo.
         :param hash_key_value: Valor da chave de partição.
         :param range_key_condition: Condição de sort key.
@@ -344,9 +1387,35 @@ class DynamoRepository(IDynamoRepository):
         :param consistent_read: Se a leitura será consistente.
         :param use_scan_if_missing_hash: Permite scan se não houver hash_key.
         :param index_name: Nome do índice, se aplicável.
+        :param where: Predicados (ex.: ``[Model.status == "active", Model.created_at >= inicio]``) para o planejador.
+        :param segments: Segmentos do scan paralelo escolhido pelo planejador.
         :raises ValueError: Parâmetros inválidos.
         :return: Iterador com os resultados.
         """
+        if where is not None:
+            if hash_key_value is not None or index_name:
+                raise ValueError("where não pode ser combinado com hash_key_value ou index_name.")
+            predicates = [c for c in (*where, range_key_condition, filter_condition) if c is not None]
+            plan = DynamoRepository.plan_query(
+                model_cls,
+                predicates,
+                consistent_read=consistent_read,
+                use_scan_if_missing_hash=use_scan_if_missing_hash,
+                segments=segments
+            )
+            if plan.access == "scan":
+                return DynamoRepository._fallback_scan(
+                    model_cls,
+                    "flexible_query",
+                    plan.filter_condition,
+                    limit=limit,
+                    consistent_read=consistent_read,
+                    segments=plan.segments
+                )
+            return _query_planner_module.execute_plan(
+                model_cls, plan, limit=limit, scan_forward=scan_forward, consistent_read=consistent_read
+            )
+
         kwargs = {
             "range_key_condition": range_key_condition,
             "filter_condition": filter_condition,
@@ -369,13 +1438,44 @@ class DynamoRepository(IDynamoRepository):
                 )
         elif use_scan_if_missing_hash and range_key_condition is not None:
             full_filter = range_key_condition & filter_condition if filter_condition else range_key_condition
-            scan_kwargs = {
-                "filter_condition": full_filter,
-                "limit": limit,
-                "consistent_read": consistent_read,
-            }
-            if index_name:
-                scan_kwargs["index_name"] = index_name
-            return model_cls.scan(**scan_kwargs)
+            return DynamoRepository._fallback_scan(
+                model_cls,
+                "flexible_query",
+                full_filter,
+                index_name=index_name or None,
+                limit=limit,
+                consistent_read=consistent_read
+            )
 
-        raise ValueError("hash_key_value é obrigatório, exceto se use_scan_if_missing_hash=True e range_key_condition for fornecido.")
\ No newline at end of file
+        raise ValueError("hash_key_value é obrigatório, exceto se use_scan_if_missing_hash=True e range_key_condition for fornecido.")
+
+    @staticmethod
+    def plan_query(
+        model_cls: Type[PynamoModel],
+        where: Sequence[Condition],
+        consistent_read: bool = False,
+        use_scan_if_missing_hash: bool = False,
+        segments: int = 4
+    ) -> QueryPlan:
+        """
+        Escolhe o caminho de acesso mais barato para os predicados, sem executá-lo.
+
+        Usa as chaves da tabela, dos GSIs e dos LSIs do modelo: GetItem quando todas as chaves
+        da tabela são fixadas por igualdade, senão a query (na tabela ou em um índice) que usa
+        mais chaves; o scan paralelo é o último recurso. ``plan.explain()`` descreve a escolha.
+
+        :param model_cls: Classe do modelo Pynamo.
+        :param where: Condições PynamoDB combinadas com AND.
+        :param consistent_read: Se a leitura será consistente (descarta GSIs).
+        :param use_scan_if_missing_hash: Permite o scan paralelo quando nenhuma chave atende.
+        :param segments: Segmentos do scan paralelo.
+        :raises ValueError: Se nenhuma chave atende e o scan não é permitido.
+        :return: QueryPlan.
+        """
+        return _query_planner_module.plan_query(
+            model_cls,
+            where,
+            consistent_read=consistent_read,
+            allow_scan=use_scan_if_missing_hash,
+            segments=segments
+        )
\ No newline at end of file
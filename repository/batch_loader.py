@@ -0,0 +1,137 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, Type
+
+from pynamodb.constants import BATCH_GET_PAGE_LIMIT
+from pynamodb.models import Model as PynamoModel
+
+from repository.model_metadata import model_metadata
+
+
+class _PendingBatch:
+    """
+    Lote aberto de um modelo: chaves pedidas e os futures de quem as pediu.
+    """
+    def __init__(self) -> None:
+        self.futures: Dict[Tuple[Hashable, Hashable], List[Future]] = {}
+        self.closed = threading.Event()
+
+
+class BatchGetLoader:
+    """
+    Agrupa leituras pontuais concorrentes (estilo DataLoader) em chamadas BatchGetItem.
+
+    A primeira thread que pede uma chave de um modelo abre um lote. Se outras threads já
+    estiverem lendo o mesmo modelo pelo loader, ela espera até ``window`` segundos (ou até o
+    lote atingir ``max_batch`` chaves) e as chaves pedidas nesse intervalo entram no mesmo
+    lote; sem concorrência, o lote é enviado na hora, sem espera. O lote é enviado com
+    ``Model.batch_get`` e cada resultado é entregue a quem o pediu (None para chaves
+    inexistentes).
+
+    Como ``load`` precisa devolver o item, chamadas sequenciais de uma mesma thread nunca são
+    agrupadas: o ganho vem de threads concorrentes, e um laço sequencial deve usar ``load_many``.
+    """
+
+    def __init__(self, window: float = 0.005, max_batch: int = BATCH_GET_PAGE_LIMIT, consistent_read: bool = False) -> None:
+        """
+        :param window: Tempo máximo (segundos) que um lote fica aberto aguardando chaves.
+        :param max_batch: Chaves por lote (limite do BatchGetItem: 100).
+        :param consistent_read: Se True, leitura consistente.
+        """
+        if not 1 <= max_batch <= BATCH_GET_PAGE_LIMIT:
+            raise ValueError(f"max_batch deve estar entre 1 e {BATCH_GET_PAGE_LIMIT}.")
+        self._window = window
+        self._max_batch = max_batch
+        self._consistent_read = consistent_read
+        self._lock = threading.Lock()
+        self._open: Dict[Type[PynamoModel], _PendingBatch] = {}
+        # Threads dentro de load, por modelo: sem outras, não há com quem agrupar.
+        self._in_flight: Dict[Type[PynamoModel], int] = {}
+        self.batches = 0
+        self.keys_loaded = 0
+
+    def load(self, model: Type[PynamoModel], hash_key: Any, range_key: Optional[Any] = None) -> Optional[PynamoModel]:
+        """
+        Obtém um item, agrupando a leitura com as de outras threads.
+
+        :param model: Classe do modelo.
+        :param hash_key: Valor da chave hash.
+        :param range_key: Valor da chave range (opcional).
+        :return: Instância do modelo, ou None se não existir.
+        """
+        future: Future = Future()
+        with self._lock:
+            concurrent = self._in_flight.get(model, 0) > 0
+            self._in_flight[model] = self._in_flight.get(model, 0) + 1
+            batch = self._open.get(model)
+            leader = batch is None
+            if leader:
+                batch = _PendingBatch()
+                self._open[model] = batch
+            batch.futures.setdefault((hash_key, range_key), []).append(future)
+            if len(batch.futures) >= self._max_batch or not concurrent:
+                # Lote cheio, ou leitura isolada: envia sem esperar a janela.
+                if self._open.get(model) is batch:
+                    del self._open[model]
+                batch.closed.set()
+
+        try:
+            if leader:
+                batch.closed.wait(self._window)
+                with self._lock:
+                    if self._open.get(model) is batch:
+                        del self._open[model]
+                self._dispatch(model, batch)
+            return future.result()
+        finally:
+            with self._lock:
+                self._in_flight[model] -= 1
+
+    def load_many(self, model: Type[PynamoModel], keys: Iterable[Any]) -> List[Optional[PynamoModel]]:
+        """
+        Obtém vários itens de uma vez, na ordem das chaves (None para as inexistentes).
+
+        :param model: Classe do modelo.
+        :param keys: Chaves hash, ou tuplas (hash, range).
+        :return: Lista alinhada com ``keys``.
+        """
+        key_list = [k if isinstance(k, tuple) else (k, None) for k in keys]
+        found: Dict[Tuple[Hashable, Hashable], PynamoModel] = {}
+        unique = list(dict.fromkeys(key_list))
+        for start in range(0, len(unique), self._max_batch):
+            found.update(self._batch_get(model, unique[start:start + self._max_batch]))
+        return [found.get(k) for k in key_list]
+
+    def _batch_get(
+        self,
+        model: Type[PynamoModel],
+        keys: List[Tuple[Hashable, Hashable]]
+    ) -> Dict[Tuple[Hashable, Hashable], PynamoModel]:
+        metadata = model_metadata(model)
+        has_range = metadata.range_key_name is not None
+        request = [k if has_range else k[0] for k in keys]
+        with self._lock:
+            self.batches += 1
+            self.keys_loaded += len(keys)
+        found = {}
+        for item in model.batch_get(request, consistent_read=self._consistent_read):
+            found[metadata.instance_keys(item)] = item
+        return found
+
+    def _dispatch(self, model: Type[PynamoModel], batch: _PendingBatch) -> None:
+        try:
+            found = self._batch_get(model, list(batch.futures))
+        except BaseException as e:
+            for futures in batch.futures.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+
+        for key, futures in batch.futures.items():
+            item = found.get(key)
+            for i, future in enumerate(futures):
+                if item is not None and i > 0:
+                    # Pedidos repetidos da mesma chave recebem instâncias independentes.
+                    future.set_result(model.from_raw_data(item.serialize(null_check=False)))
+                else:
+                    future.set_result(item)
@@ -0,0 +1,291 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from pynamodb.constants import BATCH_WRITE_PAGE_LIMIT
+from pynamodb.exceptions import PynamoDBException
+from pynamodb.models import Model as PynamoModel
+
+from repository.backoff import backoff_delay
+from repository.model_metadata import KeyValues, model_metadata
+
+PUT = "put"
+DELETE = "delete"
+
+
+@dataclass
+class BatchWriteItemResult:
+    """
+    Resultado da escrita em lote de um item.
+
+    :param item: Instância enviada.
+    :param operation: ``"put"`` ou ``"delete"``.
+    :param success: True se o DynamoDB confirmou a escrita.
+    :param attempts: Quantidade de chamadas BatchWriteItem em que o item foi enviado.
+    :param error: Motivo da falha, quando houver.
+    """
+    item: PynamoModel
+    operation: str
+    success: bool = False
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchWriteReport:
+    """
+    Relatório por item de uma chamada a ``DynamoRepository.batch_write``.
+
+    Os resultados seguem a ordem de entrada: primeiro os puts, depois os deletes.
+    """
+    results: List[BatchWriteItemResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[BatchWriteItemResult]:
+        return [r for r in self.results if r.success]
+
+    @property
+    def failed(self) -> List[BatchWriteItemResult]:
+        return [r for r in self.results if not r.success]
+
+    @property
+    def all_succeeded(self) -> bool:
+        return all(r.success for r in self.results)
+
+
+def _key_names(model_cls: Type[PynamoModel]) -> Tuple[str, ...]:
+    """
+    Nomes (attr_name) das chaves primárias do modelo.
+    """
+    return model_metadata(model_cls).key_attr_names
+
+
+def key_identity(model_cls: Type[PynamoModel], attribute_map: Dict[str, Any]) -> str:
+    """
+    Identidade de um item a partir do mapa serializado, usada para casar UnprocessedItems.
+
+    :param model_cls: Classe do modelo.
+    :param attribute_map: Item ou chave já serializados (formato do DynamoDB).
+    :return: JSON estável com os valores das chaves primárias.
+    """
+    return json.dumps({name: attribute_map.get(name) for name in _key_names(model_cls)}, sort_keys=True)
+
+
+def write_chunk(
+    model_cls: Type[PynamoModel],
+    chunk: List[Tuple[BatchWriteItemResult, Dict[str, Any]]],
+    max_retries: int,
+    base_delay: float,
+    max_delay: float
+) -> None:
+    """
+    Envia um lote de até 25 operações, reenviando os UnprocessedItems com backoff.
+
+    Núcleo compartilhado por ``batch_write`` e ``bulk_import``. Os resultados do lote são
+    preenchidos in-place; falhas ficam em ``success``/``error`` de cada resultado.
+
+    :param model_cls: Classe do modelo (uma tabela por lote).
+    :param chunk: Pares (resultado, item ou chave serializados), com chaves distintas.
+    :param max_retries: Reenvios máximos de UnprocessedItems.
+    :param base_delay: Atraso base (segundos) do backoff exponencial.
+    :param max_delay: Atraso máximo (segundos) entre reenvios.
+    """
+    table_name = model_cls.Meta.table_name
+    pending = {
+        (result.operation, key_identity(model_cls, attribute_map)): (result, attribute_map)
+        for result, attribute_map in chunk
+    }
+
+    attempt = 0
+    while pending:
+        put_items = [m for (op, _), (_, m) in pending.items() if op == PUT]
+        delete_items = [m for (op, _), (_, m) in pending.items() if op == DELETE]
+        for result, _ in pending.values():
+            result.attempts += 1
+
+        try:
+            data = model_cls._get_connection().batch_write_item(
+                put_items=put_items,
+                delete_items=delete_items,
+            )
+        except PynamoDBException as e:
+            for result, _ in pending.values():
+                result.error = str(e)
+            return
+
+        unprocessed = (data or {}).get("UnprocessedItems", {}).get(table_name, [])
+        still_pending = {}
+        for request in unprocessed:
+            if "PutRequest" in request:
+                identity = (PUT, key_identity(model_cls, request["PutRequest"]["Item"]))
+            else:
+                identity = (DELETE, key_identity(model_cls, request["DeleteRequest"]["Key"]))
+            if identity in pending:
+                still_pending[identity] = pending[identity]
+
+        for identity, (result, _) in pending.items():
+            if identity not in still_pending:
+                result.success = True
+
+        pending = still_pending
+        if not pending:
+            return
+        if attempt >= max_retries:
+            for result, _ in pending.values():
+                result.error = f"UnprocessedItems após {result.attempts} tentativas."
+            return
+
+        time.sleep(backoff_delay(attempt, base_delay, max_delay))
+        attempt += 1
+
+
+def run_batch_write(
+    puts: Optional[Sequence[PynamoModel]] = None,
+    deletes: Optional[Sequence[PynamoModel]] = None,
+    max_workers: int = 4,
+    max_retries: int = 8,
+    base_delay: float = 0.05,
+    max_delay: float = 5.0
+) -> BatchWriteReport:
+    """
+    Executa puts e deletes em lotes de 25 itens por tabela, em paralelo.
+
+    :param puts: Instâncias a gravar.
+    :param deletes: Instâncias a remover (apenas as chaves são usadas).
+    :param max_workers: Tamanho do pool de threads que envia os lotes.
+    :param max_retries: Reenvios máximos de UnprocessedItems por lote.
+    :param base_delay: Atraso base (segundos) do backoff exponencial.
+    :param max_delay: Atraso máximo (segundos) entre reenvios.
+    :raises ValueError: Se a mesma chave aparecer mais de uma vez na chamada.
+    :return: BatchWriteReport com o resultado de cada item.
+    """
+    report = BatchWriteReport()
+    groups: Dict[Type[PynamoModel], List[Tuple[BatchWriteItemResult, Dict[str, Any]]]] = {}
+    seen = set()
+
+    operations = [(PUT, item) for item in puts or []] + [(DELETE, item) for item in deletes or []]
+    for operation, item in operations:
+        model_cls = type(item)
+        attribute_map = item.serialize() if operation == PUT else item.serialize(null_check=False)
+        identity = (model_cls.Meta.table_name, key_identity(model_cls, attribute_map))
+        if identity in seen:
+            raise ValueError(f"Chave duplicada no batch_write: {identity[1]}")
+        seen.add(identity)
+
+        if operation == DELETE:
+            attribute_map = {name: attribute_map[name] for name in _key_names(model_cls)}
+
+        result = BatchWriteItemResult(item=item, operation=operation)
+        report.results.append(result)
+        groups.setdefault(model_cls, []).append((result, attribute_map))
+
+    chunks = []
+    for model_cls, entries in groups.items():
+        # Carrega a conexão e o DescribeTable antes de distribuir os lotes entre as threads.
+        model_cls._get_connection().get_meta_table()
+        for start in range(0, len(entries), BATCH_WRITE_PAGE_LIMIT):
+            chunks.append((model_cls, entries[start:start + BATCH_WRITE_PAGE_LIMIT]))
+
+    if not chunks:
+        return report
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        futures = [
+            executor.submit(write_chunk, model_cls, chunk, max_retries, base_delay, max_delay)
+            for model_cls, chunk in chunks
+        ]
+        for future in futures:
+            future.result()
+
+    return report
+
+
+def _load_existing(
+    model_cls: Type[PynamoModel],
+    keys: List[KeyValues],
+    consistent_read: bool
+) -> Dict[KeyValues, PynamoModel]:
+    metadata = model_metadata(model_cls)
+    request = keys if metadata.range_key_name is not None else [hash_key for hash_key, _ in keys]
+    return {
+        metadata.instance_keys(item): item
+        for item in model_cls.batch_get(request, consistent_read=consistent_read)
+    }
+
+
+def run_upsert_many(
+    items: Sequence[PynamoModel],
+    require_existing: bool = False,
+    consistent_read: bool = False,
+    max_workers: int = 4,
+    max_retries: int = 8,
+    base_delay: float = 0.05,
+    max_delay: float = 5.0
+) -> BatchWriteReport:
+    """
+    Atualiza (ou insere) muitos itens, de uma ou mais tabelas, com leituras e escritas em lote.
+
+    Segue a semântica de ``DynamoRepository.update``/``upsert``: os itens atuais são lidos com
+    BatchGetItem (até 100 chaves por chamada, uma tarefa por tabela no pool), os atributos
+    não-chave informados em cada instância são aplicados sobre eles e o resultado é gravado
+    por ``run_batch_write``. Atributos ausentes na instância são preenchidos com os valores
+    atuais, então cada instância termina com o item completo salvo. Como no ``update``,
+    leitura e escrita não são atômicas.
+
+    :param items: Instâncias a gravar; as chaves vêm da declaração de cada modelo.
+    :param require_existing: Se True (``update_many``), itens inexistentes não são gravados e
+        aparecem no relatório como falha.
+    :param consistent_read: Leitura consistente dos itens atuais.
+    :param max_workers: Tamanho do pool de threads de leitura e escrita.
+    :param max_retries: Reenvios máximos de UnprocessedItems por lote.
+    :param base_delay: Atraso base (segundos) do backoff exponencial.
+    :param max_delay: Atraso máximo (segundos) entre reenvios.
+    :raises ValueError: Se a mesma chave aparecer mais de uma vez na chamada.
+    :return: BatchWriteReport com um resultado por item, na ordem de entrada.
+    """
+    groups: Dict[Type[PynamoModel], List[KeyValues]] = {}
+    seen = set()
+    for item in items:
+        model_cls = type(item)
+        key = model_metadata(model_cls).instance_keys(item)
+        if (model_cls, key) in seen:
+            raise ValueError(f"Chave duplicada no upsert em lote: {model_cls.Meta.table_name} {key}")
+        seen.add((model_cls, key))
+        groups.setdefault(model_cls, []).append(key)
+
+    existing: Dict[Type[PynamoModel], Dict[KeyValues, PynamoModel]] = {}
+    if groups:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as executor:
+            futures = {
+                model_cls: executor.submit(_load_existing, model_cls, keys, consistent_read)
+                for model_cls, keys in groups.items()
+            }
+            existing = {model_cls: future.result() for model_cls, future in futures.items()}
+
+    writes: List[PynamoModel] = []
+    missing: Dict[int, BatchWriteItemResult] = {}
+    for item in items:
+        model_cls = type(item)
+        current = existing[model_cls].get(model_metadata(model_cls).instance_keys(item))
+        if current is None:
+            if require_existing:
+                missing[id(item)] = BatchWriteItemResult(item=item, operation=PUT, error="Item não existe.")
+                continue
+        else:
+            for name, value in current.attribute_values.items():
+                if name not in item.attribute_values:
+                    setattr(item, name, value)
+        writes.append(item)
+
+    written = run_batch_write(
+        puts=writes,
+        max_workers=max_workers,
+        max_retries=max_retries,
+        base_delay=base_delay,
+        max_delay=max_delay
+    )
+    by_item = {id(result.item): result for result in written.results}
+    by_item.update(missing)
+    return BatchWriteReport(results=[by_item[id(item)] for item in items])
@@ -0,0 +1,246 @@
+import csv
+import gzip
+import io
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from pynamodb.attributes import Attribute, UTCDateTimeAttribute
+from pynamodb.constants import BATCH_WRITE_PAGE_LIMIT, BOOLEAN, LIST, MAP, NUMBER
+from pynamodb.models import Model as PynamoModel
+
+from repository.batch_write import PUT, BatchWriteItemResult, key_identity, write_chunk
+from repository.model_metadata import model_metadata
+from repository.rate_limit import TokenBucket
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+_TRUE = {"true", "1", "yes", "sim"}
+_FALSE = {"false", "0", "no", "nao", "não"}
+
+
+@dataclass
+class RejectedRecord:
+    """
+    Registro do arquivo que não passou na validação contra o modelo.
+
+    :param line: Número do registro no arquivo (1 = primeiro registro).
+    :param error: Motivo da rejeição.
+    """
+    line: int
+    error: str
+
+
+@dataclass
+class ImportReport:
+    """
+    Relatório de uma importação em lote.
+    """
+    imported: int = 0
+    failed: List[BatchWriteItemResult] = field(default_factory=list)
+    rejected: List[RejectedRecord] = field(default_factory=list)
+    elapsed: float = 0.0
+    throttled_seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.imported / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _detect_format(path: str) -> str:
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"Não foi possível deduzir o formato de {path!r}; informe format.")
+
+
+def iter_records(path: Union[str, "os.PathLike[str]"], format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lê registros de um arquivo NDJSON ou CSV (opcionalmente .gz) em streaming.
+
+    :param path: Caminho do arquivo.
+    :param format: "ndjson" ou "csv"; por padrão deduzido pela extensão.
+    :raises ValueError: Se o formato for inválido ou não puder ser deduzido.
+    :return: Iterador de dicts, um por registro (linhas em branco do NDJSON são ignoradas).
+    """
+    path = os.fspath(path)
+    format = format or _detect_format(path)
+    if format not in IMPORT_FORMATS:
+        raise ValueError(f"Formato inválido: {format!r}. Use um de {IMPORT_FORMATS}.")
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        if format == "csv":
+            yield from csv.DictReader(text)
+        else:
+            for line in text:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _convert(attribute: Attribute, value: Any) -> Any:
+    """
+    Converte um valor vindo do arquivo para o tipo Python esperado pelo atributo.
+
+    Valores de CSV chegam como texto; NDJSON já traz números, booleanos e objetos.
+    """
+    if value is None or value == "":
+        return None
+    if not isinstance(value, str):
+        return value
+    if isinstance(attribute, UTCDateTimeAttribute):
+        return datetime.fromisoformat(value)
+    if attribute.attr_type == NUMBER:
+        return json.loads(value)
+    if attribute.attr_type == BOOLEAN:
+        lowered = value.strip().lower()
+        if lowered in _TRUE:
+            return True
+        if lowered in _FALSE:
+            return False
+        raise ValueError(f"valor booleano inválido: {value!r}")
+    if attribute.attr_type in (MAP, LIST):
+        return json.loads(value)
+    return value
+
+
+def build_item(model: Type[PynamoModel], record: Dict[str, Any]) -> Tuple[PynamoModel, Dict[str, Any]]:
+    """
+    Valida um registro contra os atributos do modelo e monta a instância.
+
+    :param model: Classe do modelo.
+    :param record: Registro lido do arquivo (nomes Python dos atributos).
+    :raises ValueError: Se houver campos desconhecidos, valores inválidos ou atributos obrigatórios ausentes.
+    :return: Instância e seu mapa serializado para o BatchWriteItem.
+    """
+    attributes = model_metadata(model).attributes
+    unknown = [name for name in record if name not in attributes]
+    if unknown:
+        raise ValueError(f"campos desconhecidos: {', '.join(sorted(unknown))}")
+    values = {}
+    for name, value in record.items():
+        try:
+            converted = _convert(attributes[name], value)
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from e
+        if converted is not None:
+            values[name] = converted
+    item = model(**values)
+    return item, item.serialize()
+
+
+def _write_units(attribute_map: Dict[str, Any]) -> int:
+    """
+    Estimativa de WCU de um put: 1 unidade por KB (arredondado para cima) do item serializado.
+    """
+    size = len(json.dumps(attribute_map, separators=(",", ":"), default=str).encode("utf-8"))
+    return max(1, math.ceil(size / 1024))
+
+
+def provisioned_write_capacity(model: Type[PynamoModel]) -> Optional[float]:
+    """
+    WCU provisionada da tabela, ou None se a tabela for on-demand.
+    """
+    throughput = model.describe_table().get("ProvisionedThroughput", {})
+    units = throughput.get("WriteCapacityUnits") or 0
+    return float(units) if units > 0 else None
+
+
+def bulk_import(
+    model: Type[PynamoModel],
+    path: Union[str, "os.PathLike[str]"],
+    format: Optional[str] = None,
+    max_workers: int = 4,
+    write_capacity: Optional[float] = None,
+    capacity_fraction: float = 1.0,
+    max_retries: int = 8,
+    base_delay: float = 0.05,
+    max_delay: float = 5.0
+) -> ImportReport:
+    """
+    Importa um arquivo NDJSON/CSV para a tabela do modelo usando BatchWriteItem em paralelo.
+
+    Os registros são lidos em streaming, validados com ``build_item`` e agrupados em lotes de
+    25 itens enviados por um pool de threads; no máximo ``2 * max_workers`` lotes ficam em
+    memória. Registros inválidos vão para ``ImportReport.rejected`` sem interromper a carga.
+    Antes de cada lote, um token bucket consome a WCU estimada dos itens, limitando a vazão a
+    ``write_capacity * capacity_fraction`` unidades por segundo. UnprocessedItems são
+    reenviados com backoff exponencial.
+
+    :param model: Classe do modelo.
+    :param path: Caminho do arquivo (.ndjson/.jsonl/.csv, opcionalmente .gz).
+    :param format: "ndjson" ou "csv"; por padrão deduzido pela extensão.
+    :param max_workers: Threads que enviam lotes.
+    :param write_capacity: WCU/s disponível; por padrão a WCU provisionada da tabela (sem limite se on-demand).
+    :param capacity_fraction: Fração da capacidade a usar (ex.: 0.5 deixa metade para o tráfego online).
+    :param max_retries: Reenvios máximos de UnprocessedItems por lote.
+    :param base_delay: Atraso base (segundos) do backoff exponencial.
+    :param max_delay: Atraso máximo (segundos) entre reenvios.
+    :raises ValueError: Se ``capacity_fraction`` não estiver em (0, 1] ou o formato for inválido.
+    :return: ImportReport com itens importados, falhas, rejeições e vazão.
+    """
+    if not 0 < capacity_fraction <= 1:
+        raise ValueError("capacity_fraction deve estar entre 0 (exclusivo) e 1.")
+
+    started = time.monotonic()
+    report = ImportReport()
+    if write_capacity is None:
+        write_capacity = provisioned_write_capacity(model)
+    limiter = TokenBucket(write_capacity * capacity_fraction) if write_capacity else None
+
+    # Carrega a conexão e o DescribeTable antes de distribuir os lotes entre as threads.
+    model._get_connection().get_meta_table()
+
+    lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(max(1, max_workers) * 2)
+
+    def collect(chunk: List[Tuple[BatchWriteItemResult, Dict[str, Any]]], future: Future) -> None:
+        error = future.exception()
+        with lock:
+            for result, _ in chunk:
+                if error is not None:
+                    result.error = str(error)
+                if result.success:
+                    report.imported += 1
+                else:
+                    report.failed.append(result)
+        in_flight.release()
+
+    def submit(executor: ThreadPoolExecutor, chunk: List[Tuple[BatchWriteItemResult, Dict[str, Any]]]) -> None:
+        if limiter is not None:
+            report.throttled_seconds += limiter.acquire(sum(_write_units(m) for _, m in chunk))
+        in_flight.acquire()
+        future: Future = executor.submit(write_chunk, model, chunk, max_retries, base_delay, max_delay)
+        future.add_done_callback(lambda f: collect(chunk, f))
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        chunk: List[Tuple[BatchWriteItemResult, Dict[str, Any]]] = []
+        chunk_keys = set()
+        for line, record in enumerate(iter_records(path, format), start=1):
+            try:
+                item, attribute_map = build_item(model, record)
+            except (ValueError, TypeError) as e:
+                report.rejected.append(RejectedRecord(line=line, error=str(e)))
+                continue
+
+            identity = key_identity(model, attribute_map)
+            # O BatchWriteItem rejeita chaves repetidas no mesmo lote.
+            if identity in chunk_keys or len(chunk) == BATCH_WRITE_PAGE_LIMIT:
+                submit(executor, chunk)
+                chunk, chunk_keys = [], set()
+            chunk.append((BatchWriteItemResult(item=item, operation=PUT), attribute_map))
+            chunk_keys.add(identity)
+        if chunk:
+            submit(executor, chunk)
+
+    report.elapsed = time.monotonic() - started
+    return report
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+from pynamodb.models import Model as PynamoModel
+
+from repository.model_metadata import model_metadata
+
+CacheKey = Tuple[Type[PynamoModel], Hashable, Hashable]
+
+
+@dataclass
+class CacheStats:
+    """
+    Contadores do cache de itens.
+
+    :param hits: Leituras atendidas pelo cache (inclui hits negativos).
+    :param negative_hits: Hits de itens sabidamente inexistentes.
+    :param misses: Leituras que precisaram ir ao DynamoDB.
+    :param evictions: Entradas removidas pelo limite de tamanho (LRU).
+    :param invalidations: Entradas invalidadas por escritas do repositório.
+    :param size: Entradas atualmente no cache.
+    """
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ItemCache:
+    """
+    Cache read-through de itens por (modelo, hash_key, range_key), com LRU e TTL por modelo.
+
+    Os itens são guardados serializados (formato do DynamoDB) e reconstruídos a cada hit, então
+    quem chama pode alterar a instância recebida sem afetar o cache. Itens inexistentes também
+    são cacheados (cache negativo) para evitar GetItems repetidos de chaves ausentes.
+
+    Exemplo:
+        DynamoRepository.configure_cache(ItemCache(max_size=50_000, model_ttls={CustomerModel: 30}))
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        default_ttl: Optional[float] = 60.0,
+        model_ttls: Optional[Dict[Type[PynamoModel], Optional[float]]] = None,
+        negative_ttl: Optional[float] = None,
+        cache_misses: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        :param max_size: Número máximo de entradas; as menos usadas são descartadas primeiro.
+        :param default_ttl: TTL em segundos (None = sem expiração).
+        :param model_ttls: TTL específico por classe de modelo.
+        :param negative_ttl: TTL das entradas negativas (None = mesmo TTL do modelo).
+        :param cache_misses: Se False, itens inexistentes não são cacheados.
+        :param clock: Relógio monotônico (injetável para testes).
+        """
+        if max_size < 1:
+            raise ValueError("max_size deve ser maior ou igual a 1.")
+        self._max_size = max_size
+        self._default_ttl = default_ttl
+        self._model_ttls: Dict[Type[PynamoModel], Optional[float]] = dict(model_ttls or {})
+        self._negative_ttl = negative_ttl
+        self._cache_misses = cache_misses
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[Optional[Dict[str, Any]], Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = CacheStats()
+
+    def set_ttl(self, model: Type[PynamoModel], ttl: Optional[float]) -> None:
+        """
+        Define o TTL (segundos) das entradas de um modelo.
+        """
+        with self._lock:
+            self._model_ttls[model] = ttl
+
+    @property
+    def generation(self) -> int:
+        """
+        Contador incrementado a cada invalidação.
+
+        Capture o valor antes de ler do DynamoDB e passe-o para ``put``: se houve escrita no
+        meio tempo, o resultado (possivelmente desatualizado) não é cacheado.
+        """
+        return self._generation
+
+    def lookup(self, model: Type[PynamoModel], hash_key: Any, range_key: Any = None) -> Tuple[bool, Optional[PynamoModel]]:
+        """
+        Procura um item no cache.
+
+        :return: Tupla (encontrado, instância). ``(True, None)`` indica um hit negativo.
+        """
+        key = (model, hash_key, range_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                data, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    if data is None:
+                        self._stats.negative_hits += 1
+                        return True, None
+                    return True, model.from_raw_data(data)
+                del self._entries[key]
+            self._stats.misses += 1
+        return False, None
+
+    def put(
+        self,
+        model: Type[PynamoModel],
+        hash_key: Any,
+        range_key: Any,
+        item: Optional[PynamoModel],
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Guarda um item (ou a ausência dele, com ``item=None``).
+
+        :param generation: Valor de ``generation`` lido antes da consulta ao DynamoDB.
+        """
+        if item is None and not self._cache_misses:
+            return
+        data = item.serialize(null_check=False) if item is not None else None
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            ttl = self._model_ttls.get(model, self._default_ttl)
+            if item is None and self._negative_ttl is not None:
+                ttl = self._negative_ttl
+            expires_at = self._clock() + ttl if ttl is not None else None
+
+            key = (model, hash_key, range_key)
+            self._entries[key] = (data, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, model: Type[PynamoModel], hash_key: Any, range_key: Any = None) -> None:
+        """
+        Remove a entrada de um item (chamado pelas escritas do repositório).
+        """
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop((model, hash_key, range_key), None) is not None:
+                self._stats.invalidations += 1
+
+    def invalidate_instance(self, model_instance: PynamoModel) -> None:
+        """
+        Invalida a entrada correspondente às chaves de uma instância.
+        """
+        model_cls = type(model_instance)
+        hash_key, range_key = model_metadata(model_cls).instance_keys(model_instance)
+        self.invalidate(model_cls, hash_key, range_key)
+
+    def clear(self) -> None:
+        """
+        Remove todas as entradas, mantendo os contadores.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Cópia dos contadores atuais.
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                negative_hits=self._stats.negative_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                size=len(self._entries),
+            )
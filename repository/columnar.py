@@ -0,0 +1,125 @@
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+
+from pynamodb.attributes import NumberAttribute
+from pynamodb.expressions.condition import Condition
+from pynamodb.models import Model as PynamoModel
+
+from repository.model_metadata import model_metadata
+from repository.raw import decode_value
+
+Column = Union[array, List[Any]]
+
+_NUMPY_DTYPES = {"q": "int64", "d": "float64"}
+
+
+@dataclass
+class ColumnarTable:
+    """
+    Resultado de um scan organizado em colunas, uma por atributo.
+
+    Atributos NumberAttribute ficam em ``array('q')`` quando todos os valores são inteiros de
+    64 bits e presentes em todos os itens; caso contrário, em ``array('d')`` (NaN quando o item
+    não tem o atributo), com a precisão de um float64. Os demais atributos ficam em listas com
+    os valores primitivos do DynamoDB (None quando ausentes).
+    """
+
+    columns: Dict[str, Column]
+    num_rows: int
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Converte as colunas em arrays NumPy (colunas numéricas sem cópia, int64 ou float64).
+
+        :raises ImportError: Se o NumPy não estiver instalado.
+        :return: Dict nome -> numpy.ndarray.
+        """
+        import numpy as np
+
+        return {
+            name: np.frombuffer(col, dtype=_NUMPY_DTYPES[col.typecode]) if isinstance(col, array)
+            else np.array(col, dtype=object)
+            for name, col in self.columns.items()
+        }
+
+
+def scan_to_columns(
+    model: Type[PynamoModel],
+    attributes: Optional[Sequence[str]] = None,
+    filter_condition: Optional[Condition] = None,
+    page_size: Optional[int] = None,
+    consistent_read: bool = False
+) -> ColumnarTable:
+    """
+    Escaneia a tabela preenchendo diretamente buffers colunares, página a página.
+
+    Os itens não são convertidos em instâncias do modelo nem em dicts por linha: cada página
+    crua é despejada coluna a coluna nos buffers.
+
+    Colunas NumberAttribute começam como ``array('q')`` e passam a ``array('d')`` no primeiro
+    valor fracionário, ausente ou fora do int64; nesse caso, inteiros acima de 2**53 perdem
+    precisão. Use um atributo não numérico se a coluna precisar de valores exatos e esparsos.
+
+    :param model: Classe do modelo.
+    :param attributes: Atributos (nomes Python) a materializar; None usa todos os do modelo.
+    :param filter_condition: Condição para filtrar resultados.
+    :param page_size: Itens avaliados por página.
+    :param consistent_read: Se True, leitura consistente.
+    :raises ValueError: Se algum atributo não existir no modelo.
+    :return: ColumnarTable com uma coluna por atributo.
+    """
+    model_attributes = model_metadata(model).attributes
+    names = list(attributes) if attributes else list(model_attributes)
+    unknown = [name for name in names if name not in model_attributes]
+    if unknown:
+        raise ValueError(f"Atributos inexistentes em {model.__name__}: {', '.join(unknown)}")
+
+    specs = [
+        (name, model_attributes[name].attr_name, isinstance(model_attributes[name], NumberAttribute))
+        for name in names
+    ]
+    columns: Dict[str, Column] = {
+        name: array("q") if numeric else [] for name, _, numeric in specs
+    }
+
+    results = model.scan(
+        filter_condition=filter_condition,
+        page_size=page_size,
+        consistent_read=consistent_read,
+        attributes_to_get=[model_attributes[name] for name in names]
+    )
+    num_rows = 0
+    nan = math.nan
+    for page in results.page_iter:
+        items = page.get("Items", [])
+        for name, attr_name, numeric in specs:
+            if numeric:
+                numbers = [item[attr_name]["N"] if "N" in item.get(attr_name, ()) else None for item in items]
+                column = columns[name]
+                if column.typecode == "q":
+                    try:
+                        # Monta o lote à parte: uma falha no meio não deixa a coluna pela metade.
+                        column.extend(array("q", [int(number) for number in numbers]))
+                        continue
+                    except (TypeError, ValueError, OverflowError):
+                        column = columns[name] = array("d", column)
+                column.extend(float(number) if number is not None else nan for number in numbers)
+            else:
+                columns[name].extend(
+                    decode_value(item[attr_name]) if attr_name in item else None
+                    for item in items
+                )
+        num_rows += len(items)
+    return ColumnarTable(columns, num_rows)
@@ -0,0 +1,65 @@
+import time
+from typing import Callable, TypeVar
+
+from pynamodb.exceptions import PynamoDBException
+from pynamodb.models import Model as PynamoModel
+
+from repository.backoff import backoff_delay
+
+CONDITIONAL_CHECK_FAILED = "ConditionalCheckFailedException"
+
+M = TypeVar("M", bound=PynamoModel)
+
+
+def is_conflict(error: BaseException) -> bool:
+    """
+    True se a escrita falhou pela ConditionExpression (versão divergente, item já existente...).
+    """
+    return isinstance(error, PynamoDBException) and error.cause_response_code == CONDITIONAL_CHECK_FAILED
+
+
+def retry_on_conflict(
+    model_instance: M,
+    mutate: Callable[[M], None],
+    write: Callable[[M], M],
+    reload: Callable[[M], M],
+    max_attempts: int = 5,
+    base_delay: float = 0.02,
+    max_delay: float = 1.0,
+    sleep: Callable[[float], None] = time.sleep
+) -> M:
+    """
+    Aplica ``mutate`` e grava com ``write`` (uma escrita condicional); só em conflito relê o
+    item com ``reload``, espera um backoff exponencial com jitter total e tenta de novo.
+
+    O caminho sem disputa custa uma única chamada ao DynamoDB: a instância recebida já é
+    tratada como o estado atual.
+
+    :param model_instance: Instância de partida (por exemplo, lida antes pelo chamador).
+    :param mutate: Altera a instância in-place; é reaplicado a cada nova leitura.
+    :param write: Escrita condicional; deve lançar um erro de condição em conflito.
+    :param reload: Relê o item atual a partir da instância em conflito.
+    :param max_attempts: Tentativas de escrita, incluindo a primeira.
+    :param base_delay: Atraso base (segundos) do backoff.
+    :param max_delay: Atraso máximo (segundos) entre tentativas.
+    :param sleep: Função de espera (injetável para testes).
+    :raises ValueError: Se ``max_attempts`` for menor que 1.
+    :raises pynamodb.exceptions.PynamoDBException: O erro de condição da última tentativa, ou
+        qualquer outro erro da escrita.
+    :return: A instância gravada.
+    """
+    if max_attempts < 1:
+        raise ValueError("max_attempts deve ser pelo menos 1.")
+    instance = model_instance
+    attempt = 0
+    while True:
+        mutate(instance)
+        try:
+            return write(instance)
+        except PynamoDBException as e:
+            attempt += 1
+            if not is_conflict(e) or attempt >= max_attempts:
+                raise
+        sleep(backoff_delay(attempt - 1, base_delay, max_delay))
+        instance = reload(instance)
+
@@ -0,0 +1,154 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type
+
+import botocore.session
+from botocore.config import Config
+from pynamodb.models import Model as PynamoModel
+
+_ClientKey = Tuple[Optional[str], Optional[str], Optional[Tuple[Optional[str], ...]], Optional[Tuple[Tuple[str, str], ...]]]
+
+
+@dataclass
+class ConnectionSettings:
+    """
+    Ajustes do cliente botocore compartilhado.
+
+    Os padrões do PynamoDB (pool de 10 conexões, timeouts de 15s/30s) fazem workers com
+    muitas threads disputarem poucas conexões e demorarem a desistir de um nó lento.
+    """
+    max_pool_connections: int = 50
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+    tcp_keepalive: bool = True
+    max_retry_attempts: int = 3
+
+    def to_config(self) -> Config:
+        return Config(
+            # Mesmo ajuste do PynamoDB: a validação de parâmetros só custa CPU.
+            parameter_validation=False,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            max_pool_connections=self.max_pool_connections,
+            tcp_keepalive=self.tcp_keepalive,
+            retries={"total_max_attempts": 1 + self.max_retry_attempts, "mode": "standard"},
+        )
+
+
+class ConnectionManager:
+    """
+    Compartilha uma sessão botocore e um cliente DynamoDB (com seu pool HTTP) entre modelos.
+
+    Cada modelo PynamoDB cria a própria conexão, com sessão, cliente e pool próprios. Ao ser
+    anexado (``attach``), o modelo passa a usar o cliente do gerenciador para a sua região e
+    host; modelos com o mesmo destino, credenciais e cabeçalhos extras compartilham o mesmo
+    cliente e, portanto, as mesmas conexões keep-alive.
+
+    Uso:
+        manager = ConnectionManager(ConnectionSettings(max_pool_connections=100))
+        DynamoRepository.configure_connections(manager, models=[CustomerModel, OrderModel])
+    """
+
+    def __init__(self, settings: Optional[ConnectionSettings] = None, session: Optional[botocore.session.Session] = None) -> None:
+        """
+        :param settings: Ajustes do cliente (padrão: ConnectionSettings()).
+        :param session: Sessão botocore a reutilizar (padrão: uma nova).
+        """
+        self.settings = settings or ConnectionSettings()
+        self._session = session or botocore.session.get_session()
+        self._config = self.settings.to_config()
+        # Criar clientes a partir da mesma sessão não é thread-safe no botocore.
+        self._lock = threading.Lock()
+        self._clients: Dict[_ClientKey, Any] = {}
+        self._models: List[Type[PynamoModel]] = []
+
+    def client(
+        self,
+        region: Optional[str] = None,
+        host: Optional[str] = None,
+        credentials: Optional[Tuple[Optional[str], ...]] = None,
+        extra_headers: Optional[Mapping[str, str]] = None
+    ) -> Any:
+        """
+        Cliente compartilhado para um destino, criado na primeira chamada.
+
+        :param region: Região AWS.
+        :param host: Endpoint alternativo (ex.: LocalStack).
+        :param credentials: (access_key_id, secret_access_key, session_token), se fixos no modelo.
+        :param extra_headers: Cabeçalhos HTTP adicionados a toda requisição.
+        :return: Cliente botocore do DynamoDB.
+        """
+        headers = tuple(sorted(extra_headers.items())) if extra_headers else None
+        key = (region, host, credentials, headers)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                access_key, secret_key, token = credentials or (None, None, None)
+                client = self._session.create_client(
+                    "dynamodb",
+                    region_name=region,
+                    endpoint_url=host,
+                    aws_access_key_id=access_key,
+                    aws_secret_access_key=secret_key,
+                    aws_session_token=token,
+                    config=self._config
+                )
+                if headers:
+                    client.meta.events.register_first("before-send.dynamodb", _HeaderInjector(dict(headers)))
+                self._clients[key] = client
+        return client
+
+    def attach(self, model: Type[PynamoModel]) -> None:
+        """
+        Faz a conexão do modelo usar o cliente compartilhado (idempotente).
+
+        Deve ser chamado antes de anexar limitadores ou instrumentação, que registram
+        handlers no cliente da conexão.
+        """
+        meta = model.Meta
+        credentials = None
+        if getattr(meta, "aws_access_key_id", None) and getattr(meta, "aws_secret_access_key", None):
+            credentials = (meta.aws_access_key_id, meta.aws_secret_access_key, getattr(meta, "aws_session_token", None))
+        client = self.client(
+            region=getattr(meta, "region", None),
+            host=getattr(meta, "host", None),
+            credentials=credentials,
+            extra_headers=getattr(meta, "extra_headers", None)
+        )
+        model._get_connection().connection._client = client
+        with self._lock:
+            if model not in self._models:
+                self._models.append(model)
+
+    def detach(self, model: Type[PynamoModel]) -> None:
+        """
+        Devolve ao modelo uma conexão própria (recriada na próxima chamada).
+        """
+        with self._lock:
+            if model not in self._models:
+                return
+            self._models.remove(model)
+        model._connection = None
+
+    def close(self) -> None:
+        """
+        Desanexa todos os modelos e fecha os clientes, liberando o pool HTTP.
+        """
+        for model in list(self._models):
+            self.detach(model)
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+class _HeaderInjector:
+    def __init__(self, headers: Dict[str, str]) -> None:
+        self._headers = headers
+
+    def __call__(self, request: Any, **_: Any) -> None:
+        request.headers.update(self._headers)
@@ -0,0 +1,266 @@
+import base64
+import gzip
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from pynamodb.expressions.condition import Condition
+from pynamodb.models import Model as PynamoModel
+
+from repository.parallel_scan import parallel_scan
+from repository.raw import as_dicts
+
+EXPORT_FORMATS = ("ndjson", "parquet")
+
+Sink = Union[str, "os.PathLike[str]", BinaryIO]
+
+
+@dataclass
+class ExportReport:
+    """
+    Resumo de uma exportação.
+    """
+    format: str
+    items: int
+    bytes_written: int
+
+
+class _CountingWriter:
+    """
+    Repassa escritas para o destino contando os bytes gravados.
+    """
+    def __init__(self, target: BinaryIO) -> None:
+        self._target = target
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> int:
+        self._target.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self._target.flush()
+
+    def tell(self) -> int:
+        return self._target.tell()
+
+    @property
+    def closed(self) -> bool:
+        return self._target.closed
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+
+
+def _plain(value: Any) -> Any:
+    """
+    Troca sets por listas ordenadas (o Arrow não aceita sets).
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+@contextmanager
+def _open_sink(sink: Sink, compression: Optional[str]) -> Iterator[Tuple[BinaryIO, _CountingWriter]]:
+    """
+    Abre o destino (caminho ou arquivo já aberto), com gzip opcional.
+
+    Entrega o objeto de escrita e o contador de bytes efetivamente gravados no destino.
+    """
+    owned = isinstance(sink, (str, os.PathLike))
+    target = open(sink, "wb") if owned else sink
+    counter = _CountingWriter(target)
+    try:
+        if compression == "gzip":
+            with gzip.GzipFile(fileobj=counter, mode="wb") as compressed:
+                yield compressed, counter
+        else:
+            yield counter, counter
+    finally:
+        if owned:
+            target.close()
+        else:
+            target.flush()
+
+
+def _iter_rows(
+    model: Type[PynamoModel],
+    hash_key_value: Optional[Any],
+    index_name: Optional[str],
+    filter_condition: Optional[Condition],
+    segments: int,
+    page_size: Optional[int]
+) -> Iterator[Dict[str, Any]]:
+    if hash_key_value is not None:
+        results = model.query(
+            hash_key_value,
+            index_name=index_name,
+            filter_condition=filter_condition,
+            page_size=page_size
+        )
+        return as_dicts(model, results)
+    if segments > 1:
+        return parallel_scan(
+            model,
+            filter_condition=filter_condition,
+            segments=segments,
+            page_size=page_size,
+            index_name=index_name,
+            as_dict=True
+        )
+    results = model.scan(filter_condition=filter_condition, page_size=page_size, index_name=index_name)
+    return as_dicts(model, results)
+
+
+def _write_ndjson(rows: Iterator[Dict[str, Any]], out: BinaryIO, batch_size: int) -> int:
+    count = 0
+    lines: List[str] = []
+    for row in rows:
+        lines.append(json.dumps(row, default=_json_default, ensure_ascii=False))
+        if len(lines) >= batch_size:
+            out.write(("\n".join(lines) + "\n").encode("utf-8"))
+            count += len(lines)
+            lines = []
+    if lines:
+        out.write(("\n".join(lines) + "\n").encode("utf-8"))
+        count += len(lines)
+    return count
+
+
+def _parquet_schema(pa: Any, model: Type[PynamoModel]) -> Tuple[Any, Dict[str, Callable[[Any], Any]]]:
+    """
+    Schema Arrow montado a partir dos atributos declarados no modelo (e não da primeira
+    linha): itens do DynamoDB são esparsos, e atributos ausentes viram null.
+
+    Números viram float64 (o tipo N não distingue inteiros), sets viram listas e mapas e
+    listas (``M``/``L``) são gravados como JSON, pois sua estrutura varia de item para item.
+
+    :return: Schema e, por coluna, a conversão aplicada ao valor antes do Arrow.
+    """
+    scalar = {"S": pa.string(), "N": pa.float64(), "B": pa.binary(), "BOOL": pa.bool_()}
+    fields = []
+    converters: Dict[str, Callable[[Any], Any]] = {}
+    for name, attr in model.get_attributes().items():
+        attr_type = attr.attr_type
+        if attr_type in scalar:
+            fields.append(pa.field(name, scalar[attr_type]))
+        elif attr_type in ("SS", "NS", "BS"):
+            fields.append(pa.field(name, pa.list_(scalar[attr_type[0]])))
+            converters[name] = sorted
+        else:
+            fields.append(pa.field(name, pa.string()))
+            converters[name] = lambda value: json.dumps(_plain(value), default=_json_default, ensure_ascii=False)
+    return pa.schema(fields), converters
+
+
+def _write_parquet(
+    model: Type[PynamoModel],
+    rows: Iterator[Dict[str, Any]],
+    out: BinaryIO,
+    batch_size: int,
+    compression: Optional[str]
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("A exportação em parquet requer o pacote pyarrow.") from e
+
+    schema, converters = _parquet_schema(pa, model)
+    columns = set(schema.names)
+    count = 0
+    batch: List[Dict[str, Any]] = []
+
+    def flush() -> None:
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+    writer = pq.ParquetWriter(out, schema, compression=compression or "snappy")
+    try:
+        for row in rows:
+            extra = row.keys() - columns
+            if extra:
+                raise ValueError(
+                    f"Item com atributos não declarados no modelo {model.__name__}: {', '.join(sorted(extra))}. "
+                    "Declare-os no modelo ou exporte em NDJSON."
+                )
+            for name, convert in converters.items():
+                value = row.get(name)
+                if value is not None:
+                    row[name] = convert(value)
+            batch.append(row)
+            if len(batch) >= batch_size:
+                flush()
+                count += len(batch)
+                batch = []
+        if batch:
+            flush()
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def export(
+    model: Type[PynamoModel],
+    sink: Sink,
+    format: str = "ndjson",
+    index_name: Optional[str] = None,
+    segments: int = 1,
+    hash_key_value: Optional[Any] = None,
+    filter_condition: Optional[Condition] = None,
+    compression: Optional[str] = None,
+    page_size: Optional[int] = None,
+    batch_size: int = 1000
+) -> ExportReport:
+    """
+    Exporta uma tabela (ou índice) em streaming para NDJSON ou Parquet.
+
+    Com ``hash_key_value`` é feita uma query; sem ele, um scan (paralelo quando
+    ``segments > 1``). Os itens são lidos como dicts crus (ver ``repository.raw``) e gravados
+    em blocos de ``batch_size`` linhas, então a memória não cresce com o tamanho da tabela.
+    Em NDJSON, binários viram base64 e sets viram listas ordenadas. Em Parquet, o schema vem
+    dos atributos declarados no modelo (ausências viram null) e itens com atributos não
+    declarados interrompem a exportação com ValueError.
+
+    :param model: Classe do modelo.
+    :param sink: Caminho do arquivo ou objeto binário aberto para escrita.
+    :param format: "ndjson" ou "parquet" (este requer pyarrow).
+    :param index_name: Índice a ler, se aplicável.
+    :param segments: Segmentos do scan paralelo (ignorado em query).
+    :param hash_key_value: Chave hash para exportar via query.
+    :param filter_condition: Condição para filtrar resultados.
+    :param compression: NDJSON: None ou "gzip". Parquet: codec do pyarrow (padrão "snappy").
+    :param page_size: Itens avaliados por página.
+    :param batch_size: Linhas por bloco gravado (row group no Parquet).
+    :raises ValueError: Se formato, compressão ou parâmetros forem inválidos, ou (Parquet) se
+        um item tiver atributos fora do modelo.
+    :raises ImportError: Se ``format="parquet"`` e o pyarrow não estiver instalado.
+    :return: ExportReport com a quantidade de itens e de bytes gravados.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato inválido: {format!r}. Use um de {EXPORT_FORMATS}.")
+    if format == "ndjson" and compression not in (None, "gzip"):
+        raise ValueError("Para NDJSON, compression deve ser None ou 'gzip'.")
+    if batch_size < 1:
+        raise ValueError("batch_size deve ser maior ou igual a 1.")
+
+    rows = _iter_rows(model, hash_key_value, index_name, filter_condition, segments, page_size)
+    if format == "ndjson":
+        with _open_sink(sink, compression) as (out, counter):
+            items = _write_ndjson(rows, out, batch_size)
+    else:
+        with _open_sink(sink, None) as (out, counter):
+            items = _write_parquet(model, rows, out, batch_size, compression)
+    return ExportReport(format=format, items=items, bytes_written=counter.bytes_written)
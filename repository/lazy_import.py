@@ -0,0 +1,42 @@
+import importlib
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """
+    Referência a um módulo que só é importado no primeiro acesso a um atributo.
+
+    Usado pelo repositório para adiar o import de funcionalidades opcionais (exportação,
+    importação em massa, métricas, limitador...) até que sejam usadas, reduzindo o tempo de
+    import em workers de vida curta. O import passa pelo ``importlib`` e é thread-safe.
+
+    Uso:
+        _export = LazyModule("repository.export")
+        _export.export(...)  # importa repository.export aqui
+    """
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def load(self) -> ModuleType:
+        """
+        Importa (se ainda necessário) e devolve o módulo.
+        """
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self._name!r} ({'carregado' if self.loaded else 'pendente'})>"
@@ -0,0 +1,499 @@
+import bisect
+import socket
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from pynamodb.models import Model as PynamoModel
+from pynamodb.pagination import ResultIterator
+
+from repository.rate_limit import READ, WRITE, OPERATION_KINDS
+
+# Limites (segundos) dos buckets do histograma de latência exportado em formato Prometheus.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class CallMetrics:
+    """
+    Medições de uma chamada ao repositório.
+
+    :param operation: Método do repositório (ex.: "get", "query").
+    :param table: Tabela do modelo.
+    :param latency: Segundos gastos na chamada; em iteradores, soma do tempo de cada página.
+    :param pages: Chamadas feitas ao DynamoDB (páginas de query/scan, lotes de batch_get...).
+    :param items: Itens retornados.
+    :param scanned: Itens avaliados pelo DynamoDB (query/scan); ``items / scanned`` mede a eficiência do filtro.
+    :param read_units: RCU consumida.
+    :param write_units: WCU consumida.
+    :param error: Nome da exceção, se a chamada falhou.
+    :param network_time: Segundos entre o envio da requisição HTTP e a chegada da resposta.
+    :param parse_time: Segundos gastos pelo botocore convertendo a resposta em dict.
+    :param model_time: Segundos convertendo os itens de query/scan (``from_raw_data`` ou o
+        decodificador cru de ``as_dict``). Em get e batch_get a conversão acontece dentro do
+        PynamoDB e fica em ``other_time``.
+    """
+    operation: str
+    table: str
+    latency: float = 0.0
+    pages: int = 0
+    items: int = 0
+    scanned: int = 0
+    read_units: float = 0.0
+    write_units: float = 0.0
+    error: Optional[str] = None
+    network_time: float = 0.0
+    parse_time: float = 0.0
+    model_time: float = 0.0
+
+    @property
+    def other_time(self) -> float:
+        """
+        Restante da latência: montagem da requisição, lógica do PynamoDB/repositório e esperas.
+        """
+        return max(0.0, self.latency - self.network_time - self.parse_time - self.model_time)
+
+
+class MetricsHook(ABC):
+    """
+    Destino das medições do repositório (ver ``DynamoRepository.configure_instrumentation``).
+    """
+
+    @abstractmethod
+    def record(self, metrics: CallMetrics) -> None:
+        """
+        Recebe as medições de uma chamada concluída. Não deve lançar exceções.
+        """
+        pass
+
+    def profile(self, operation: str) -> Optional[Any]:
+        """
+        Profiler (objeto com ``enable()``/``disable()``, como ``cProfile.Profile``) a ligar
+        enquanto a operação executa, ou None para não capturar.
+        """
+        return None
+
+
+class CompositeHook(MetricsHook):
+    """
+    Repassa cada medição para vários hooks (ex.: registry local + StatsD).
+    """
+
+    def __init__(self, hooks: Sequence[MetricsHook]) -> None:
+        self.hooks = list(hooks)
+
+    def record(self, metrics: CallMetrics) -> None:
+        for hook in self.hooks:
+            hook.record(metrics)
+
+    def profile(self, operation: str) -> Optional[Any]:
+        for hook in self.hooks:
+            capture = hook.profile(operation)
+            if capture is not None:
+                return capture
+        return None
+
+
+class Histogram:
+    """
+    Histograma de latência: buckets cumulativos (para exportação) e uma janela das últimas
+    ``reservoir_size`` amostras, usada no cálculo de percentis.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, reservoir_size: int = 2048) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._samples: Deque[float] = deque(maxlen=reservoir_size)
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self._samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        """
+        Percentil ``q`` (0-100) das amostras recentes, por interpolação linear.
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        position = (len(ordered) - 1) * q / 100
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+@dataclass
+class OperationStats:
+    """
+    Agregado de uma operação em uma tabela.
+    """
+    calls: int = 0
+    errors: int = 0
+    pages: int = 0
+    items: int = 0
+    scanned: int = 0
+    read_units: float = 0.0
+    write_units: float = 0.0
+    latency: Histogram = field(default_factory=Histogram)
+
+    @property
+    def filter_efficiency(self) -> Optional[float]:
+        """
+        Fração dos itens avaliados que foi retornada (None se nada foi avaliado).
+        """
+        return self.items / self.scanned if self.scanned else None
+
+
+class MetricsRegistry(MetricsHook):
+    """
+    Registry em memória com agregados por (operação, tabela) e percentis de latência.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, reservoir_size: int = 2048) -> None:
+        self._buckets = buckets
+        self._reservoir_size = reservoir_size
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], OperationStats] = {}
+
+    def record(self, metrics: CallMetrics) -> None:
+        key = (metrics.operation, metrics.table)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = OperationStats(latency=Histogram(self._buckets, self._reservoir_size))
+                self._stats[key] = stats
+            stats.calls += 1
+            stats.errors += 1 if metrics.error else 0
+            stats.pages += metrics.pages
+            stats.items += metrics.items
+            stats.scanned += metrics.scanned
+            stats.read_units += metrics.read_units
+            stats.write_units += metrics.write_units
+            stats.latency.observe(metrics.latency)
+
+    def stats(self, operation: str, table: str) -> Optional[OperationStats]:
+        """
+        Agregado de uma operação em uma tabela, ou None se nunca foi chamada.
+        """
+        with self._lock:
+            return self._stats.get((operation, table))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resumo legível por ``"operação:tabela"``, com p50/p90/p99 de latência em segundos.
+        """
+        with self._lock:
+            items = list(self._stats.items())
+        return {
+            f"{operation}:{table}": {
+                "calls": s.calls,
+                "errors": s.errors,
+                "pages": s.pages,
+                "items": s.items,
+                "scanned": s.scanned,
+                "filter_efficiency": s.filter_efficiency,
+                "read_units": s.read_units,
+                "write_units": s.write_units,
+                "p50": s.latency.percentile(50),
+                "p90": s.latency.percentile(90),
+                "p99": s.latency.percentile(99),
+            }
+            for (operation, table), s in items
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self, prefix: str = "dynamo_repository") -> str:
+        """
+        Exporta os agregados no formato texto do Prometheus.
+
+        :param prefix: Prefixo dos nomes das métricas.
+        :return: Texto pronto para um endpoint ``/metrics``.
+        """
+        with self._lock:
+            items = sorted(self._stats.items())
+
+        counters = [
+            ("calls_total", "Chamadas ao repositório.", lambda s: s.calls),
+            ("errors_total", "Chamadas que lançaram exceção.", lambda s: s.errors),
+            ("pages_total", "Requisições feitas ao DynamoDB.", lambda s: s.pages),
+            ("items_total", "Itens retornados.", lambda s: s.items),
+            ("scanned_items_total", "Itens avaliados pelo DynamoDB.", lambda s: s.scanned),
+            ("consumed_read_units_total", "RCU consumida.", lambda s: s.read_units),
+            ("consumed_write_units_total", "WCU consumida.", lambda s: s.write_units),
+        ]
+        lines: List[str] = []
+        for name, help_text, value in counters:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for (operation, table), s in items:
+                lines.append(f'{prefix}_{name}{{operation="{operation}",table="{table}"}} {value(s)}')
+
+        name = f"{prefix}_latency_seconds"
+        lines.append(f"# HELP {name} Latência das chamadas ao repositório.")
+        lines.append(f"# TYPE {name} histogram")
+        for (operation, table), s in items:
+            labels = f'operation="{operation}",table="{table}"'
+            cumulative = 0
+            for bound, count in zip(s.latency.buckets, s.latency.bucket_counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {s.latency.count}')
+            lines.append(f"{name}_sum{{{labels}}} {s.latency.sum}")
+            lines.append(f"{name}_count{{{labels}}} {s.latency.count}")
+        return "\n".join(lines) + "\n"
+
+
+class StatsDHook(MetricsHook):
+    """
+    Envia cada medição para um servidor StatsD via UDP.
+
+    Gera ``<prefix>.<tabela>.<operação>.latency`` (ms) e contadores ``calls``, ``errors``,
+    ``pages``, ``items``, ``scanned``, ``read_units`` e ``write_units``.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8125, prefix: str = "dynamo_repository") -> None:
+        self._address = (host, port)
+        self._prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def record(self, metrics: CallMetrics) -> None:
+        base = f"{self._prefix}.{metrics.table}.{metrics.operation}"
+        lines = [
+            f"{base}.latency:{metrics.latency * 1000:.3f}|ms",
+            f"{base}.calls:1|c",
+            f"{base}.pages:{metrics.pages}|c",
+            f"{base}.items:{metrics.items}|c",
+            f"{base}.scanned:{metrics.scanned}|c",
+            f"{base}.read_units:{metrics.read_units:g}|c",
+            f"{base}.write_units:{metrics.write_units:g}|c",
+        ]
+        if metrics.error:
+            lines.append(f"{base}.errors:1|c")
+        try:
+            self._socket.sendto("\n".join(lines).encode("utf-8"), self._address)
+        except OSError:
+            # Métricas nunca devem derrubar a operação.
+            pass
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+# --- Coleta ---
+
+_local = threading.local()
+_instrumented_clients: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_clients_lock = threading.Lock()
+
+
+class CallScope:
+    """
+    Acumula as medições de uma chamada enquanto ela (ou o iterador que ela devolveu) fala
+    com o DynamoDB. As respostas chegam pelo evento ``after-call`` do botocore.
+    """
+
+    def __init__(self, hook: MetricsHook, operation: str, model: Type[PynamoModel]) -> None:
+        self._hook = hook
+        self._finished = False
+        self._capture = hook.profile(operation)
+        self.metrics = CallMetrics(operation=operation, table=model.Meta.table_name)
+
+    def add_response(self, operation_name: str, parsed: Dict[str, Any]) -> None:
+        metrics = self.metrics
+        metrics.pages += 1
+        if "ScannedCount" in parsed:
+            metrics.scanned += parsed["ScannedCount"]
+        capacity = parsed.get("ConsumedCapacity") or []
+        units = sum(entry.get("CapacityUnits", 0.0) for entry in (capacity if isinstance(capacity, list) else [capacity]))
+        kind = OPERATION_KINDS.get(operation_name)
+        if kind == READ:
+            metrics.read_units += units
+        elif kind == WRITE:
+            metrics.write_units += units
+
+    def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Executa ``fn`` com o escopo ativo na thread, somando o tempo gasto à latência.
+        """
+        stack = _scope_stack()
+        stack.append(self)
+        capture = self._capture
+        if capture is not None:
+            capture.enable()
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except StopIteration:
+            raise
+        except BaseException as e:
+            self.metrics.error = type(e).__name__
+            raise
+        finally:
+            self.metrics.latency += time.perf_counter() - started
+            if capture is not None:
+                capture.disable()
+            stack.pop()
+
+    def finish(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        try:
+            self._hook.record(self.metrics)
+        except Exception:
+            pass
+
+
+def _scope_stack() -> List[CallScope]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def in_scope() -> bool:
+    """
+    True se a thread já está dentro de uma chamada instrumentada (chamadas aninhadas não são medidas).
+    """
+    return bool(getattr(_local, "stack", None))
+
+
+def _after_call(parsed: Dict[str, Any], model: Any, **_: Any) -> None:
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].add_response(model.name, parsed)
+
+
+def _before_send(**_: Any) -> None:
+    if getattr(_local, "stack", None):
+        _local.sent_at = time.perf_counter()
+
+
+def _before_parse(**_: Any) -> None:
+    stack = getattr(_local, "stack", None)
+    sent_at = getattr(_local, "sent_at", None)
+    if stack and sent_at is not None:
+        now = time.perf_counter()
+        stack[-1].metrics.network_time += now - sent_at
+        _local.sent_at = None
+        _local.parse_started_at = now
+
+
+def _response_received(**_: Any) -> None:
+    stack = getattr(_local, "stack", None)
+    parse_started_at = getattr(_local, "parse_started_at", None)
+    if stack and parse_started_at is not None:
+        stack[-1].metrics.parse_time += time.perf_counter() - parse_started_at
+        _local.parse_started_at = None
+
+
+def instrument_client(model: Type[PynamoModel]) -> None:
+    """
+    Registra (uma vez por cliente botocore) os handlers que entregam respostas e tempos de
+    rede/parsing ao escopo ativo. A classe do modelo não é alterada.
+    """
+    client = model._get_connection().connection.client
+    if client in _instrumented_clients:
+        return
+    with _clients_lock:
+        if client not in _instrumented_clients:
+            events = client.meta.events
+            # Primeiro da fila: stubs como o do moto respondem no próprio before-send.
+            events.register_first("before-send.dynamodb", _before_send)
+            events.register("before-parse.dynamodb", _before_parse)
+            events.register("response-received.dynamodb", _response_received)
+            events.register("after-call.dynamodb", _after_call)
+            _instrumented_clients.add(client)
+
+
+def _wrap_result_iterator(scope: CallScope, results: ResultIterator) -> ResultIterator:
+    page_iter = results.page_iter
+    operation = page_iter._operation
+    map_fn = results._map_fn
+    # Itens da última página ainda não convertidos; o registro sai quando chegar a zero.
+    remaining: List[int] = []
+
+    def fetch_page(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        page = scope.run(operation, *args, **kwargs)
+        count = page.get("Count", 0)
+        scope.metrics.items += count
+        if not page.get("LastEvaluatedKey"):
+            if count and map_fn is not None:
+                remaining.append(count)
+            else:
+                scope.finish()
+        return page
+
+    def convert(item: Dict[str, Any]) -> Any:
+        # A conversão de cada item (from_raw_data ou decodificador cru) entra na latência e no
+        # tempo de modelo, sem precisar alterar a classe do modelo.
+        started = time.perf_counter()
+        try:
+            converted = scope.run(map_fn, item)
+        finally:
+            scope.metrics.model_time += time.perf_counter() - started
+        if remaining:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                scope.finish()
+        return converted
+
+    # O PageIterator chama _operation a cada página; a chave de paginação também usa
+    # _operation.__self__ para descobrir os nomes das chaves.
+    fetch_page.__self__ = operation.__self__  # type: ignore[attr-defined]
+    page_iter._operation = fetch_page
+    if map_fn is not None:
+        results._map_fn = convert
+    # Iteração interrompida antes do fim: registra quando o iterador for descartado.
+    weakref.finalize(results, scope.finish)
+    return results
+
+
+def _wrap_iterator(scope: CallScope, iterator: Iterator[Any]) -> Iterator[Any]:
+    try:
+        while True:
+            try:
+                item = scope.run(next, iterator)
+            except StopIteration:
+                return
+            scope.metrics.items += 1
+            yield item
+    finally:
+        scope.finish()
+
+
+def measure(hook: MetricsHook, operation: str, model: Type[PynamoModel], call: Callable[[], Any]) -> Any:
+    """
+    Executa uma operação do repositório medindo-a.
+
+    Resultados de query/scan (ResultIterator) e iteradores (batch_get) são medidos à medida que
+    são consumidos; o registro é feito ao final da iteração. Demais resultados são registrados
+    na hora, contando 1 item quando o retorno não é None.
+    """
+    instrument_client(model)
+    scope = CallScope(hook, operation, model)
+    try:
+        result = scope.run(call)
+    except BaseException:
+        scope.finish()
+        raise
+
+    if isinstance(result, ResultIterator):
+        return _wrap_result_iterator(scope, result)
+    if isinstance(result, Iterator):
+        return _wrap_iterator(scope, result)
+    found = result if isinstance(result, bool) else result is not None
+    scope.metrics.items = 1 if found else 0
+    scope.finish()
+    return result
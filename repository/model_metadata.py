@@ -0,0 +1,119 @@
+import threading
+import weakref
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, FrozenSet, MutableMapping, Optional, Tuple, Type
+
+from pynamodb.attributes import Attribute
+from pynamodb.models import Model as PynamoModel
+
+from models.extract_keys_metadata import ModelKeyMetadata, extract_keys_metadata
+
+KeyValues = Tuple[Any, Optional[Any]]
+
+
+@dataclass(frozen=True)
+class ModelMetadata:
+    """
+    Metadados de chaves e atributos de um modelo, calculados uma única vez por classe.
+
+    ``keys`` usa os nomes Python e ``stored_keys`` o ``attr_name`` gravado no DynamoDB.
+    ``non_key_attributes`` segue a ordem de declaração; ``non_key_set`` serve às buscas.
+    ``key_attributes`` traz os Attribute das chaves primárias (hash, range) e
+    ``python_names`` mapeia ``attr_name`` -> nome Python de cada atributo.
+    ``instance_keys`` é um extrator pré-montado que devolve ``(hash, range)`` de uma
+    instância (range None quando o modelo não tem range key). ``version_attribute`` é o
+    nome do VersionAttribute do modelo, se houver.
+    """
+    keys: ModelKeyMetadata
+    stored_keys: ModelKeyMetadata
+    attributes: Dict[str, Attribute]
+    non_key_attributes: Tuple[str, ...]
+    non_key_set: FrozenSet[str]
+    key_attributes: Tuple[Attribute, ...]
+    python_names: Dict[str, str]
+    instance_keys: Callable[[PynamoModel], KeyValues]
+    version_attribute: Optional[str] = None
+
+    @property
+    def hash_key_name(self) -> str:
+        return self.keys.hash_key
+
+    @property
+    def range_key_name(self) -> Optional[str]:
+        return self.keys.range_key
+
+    @property
+    def key_attr_names(self) -> Tuple[str, ...]:
+        """
+        ``attr_name`` das chaves primárias, na ordem hash, range.
+        """
+        keys = self.stored_keys
+        return (keys.hash_key,) if keys.range_key is None else (keys.hash_key, keys.range_key)
+
+    def non_key_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Filtra um ``attribute_values`` deixando só atributos declarados que não são chave.
+        """
+        non_key = self.non_key_set
+        return {name: value for name, value in values.items() if name in non_key}
+
+
+def _key_extractor(hash_key: str, range_key: Optional[str]) -> Callable[[PynamoModel], KeyValues]:
+    if range_key is not None:
+        return attrgetter(hash_key, range_key)
+    get_hash = attrgetter(hash_key)
+    return lambda instance: (get_hash(instance), None)
+
+
+def _build(model: Type[PynamoModel]) -> ModelMetadata:
+    keys = extract_keys_metadata(model)
+    attributes = dict(model.get_attributes())
+    non_key = tuple(name for name, attr in attributes.items() if not attr.is_hash_key and not attr.is_range_key)
+    return ModelMetadata(
+        keys=keys,
+        stored_keys=extract_keys_metadata(model, return_attr_name=True),
+        attributes=attributes,
+        non_key_attributes=non_key,
+        non_key_set=frozenset(non_key),
+        key_attributes=tuple(attributes[name] for name in (keys.hash_key, keys.range_key) if name is not None),
+        python_names={attr.attr_name: name for name, attr in attributes.items()},
+        instance_keys=_key_extractor(keys.hash_key, keys.range_key),
+        version_attribute=model._version_attribute_name
+    )
+
+
+# Chaveado pela classe com referência fraca: modelos criados dinamicamente podem ser coletados.
+_registry: MutableMapping[Type[PynamoModel], ModelMetadata] = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def model_metadata(model: Type[PynamoModel]) -> ModelMetadata:
+    """
+    Metadados do modelo, montados no primeiro uso e reaproveitados depois.
+
+    Modelos são declarações estáticas, então o resultado não expira; use ``clear_metadata``
+    se a classe for alterada em tempo de execução.
+
+    :param model: Classe do modelo PynamoDB.
+    :raises ValueError: Se o modelo não declarar hash key.
+    :return: ModelMetadata.
+    """
+    metadata = _registry.get(model)
+    if metadata is None:
+        with _lock:
+            metadata = _registry.get(model)
+            if metadata is None:
+                metadata = _registry[model] = _build(model)
+    return metadata
+
+
+def clear_metadata(model: Optional[Type[PynamoModel]] = None) -> None:
+    """
+    Descarta os metadados de um modelo (ou de todos), recalculados no próximo uso.
+    """
+    with _lock:
+        if model is None:
+            _registry.clear()
+        else:
+            _registry.pop(model, None)
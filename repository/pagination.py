@@ -0,0 +1,228 @@
+import base64
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from pynamodb.models import Model as PynamoModel
+from pynamodb.pagination import ResultIterator
+
+
+def encode_continuation_token(last_evaluated_key: Optional[Dict[str, Dict[str, Any]]]) -> Optional[str]:
+    """
+    Converte um ``last_evaluated_key`` do DynamoDB em um token opaco (base64 url-safe).
+
+    Valores binários (``B``) são codificados em base64 para o token ser JSON puro.
+
+    :param last_evaluated_key: Chave retornada pelo DynamoDB, ou None na última página.
+    :return: Token serializável, ou None se não houver próxima página.
+    """
+    if not last_evaluated_key:
+        return None
+    payload = {}
+    for name, value in last_evaluated_key.items():
+        (attr_type, raw), = value.items()
+        if attr_type == "B":
+            raw = base64.b64encode(raw).decode("ascii")
+        payload[name] = {attr_type: raw}
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_continuation_token(token: Optional[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Converte um token gerado por ``encode_continuation_token`` de volta em ``last_evaluated_key``.
+
+    :param token: Token opaco, ou None.
+    :raises ValueError: Se o token for inválido.
+    :return: ``last_evaluated_key`` para iniciar a leitura, ou None.
+    """
+    if not token:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Token de continuação inválido: {token!r}") from e
+    key = {}
+    for name, value in payload.items():
+        (attr_type, raw), = value.items()
+        if attr_type == "B":
+            raw = base64.b64decode(raw)
+        key[name] = {attr_type: raw}
+    return key
+
+
+@dataclass
+class Page:
+    """
+    Página de resultados de um scan ou query.
+
+    :param items: Itens da página.
+    :param next_token: Token para continuar após esta página (None na última).
+    :param scanned_count: Itens avaliados pelo DynamoDB na página (antes do filtro).
+    """
+    items: List[PynamoModel] = field(default_factory=list)
+    next_token: Optional[str] = None
+    scanned_count: int = 0
+
+
+class CheckpointStore(ABC):
+    """
+    Destino para o progresso de leituras longas, identificado por ``checkpoint_id``.
+    """
+
+    @abstractmethod
+    def load(self, checkpoint_id: str) -> Optional[str]:
+        """
+        Retorna o último token salvo, ou None se não houver.
+        """
+        return None
+
+    @abstractmethod
+    def save(self, checkpoint_id: str, token: str) -> None:
+        """
+        Salva o token da última página concluída.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self, checkpoint_id: str) -> None:
+        """
+        Remove o checkpoint (leitura concluída).
+        """
+        pass
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Checkpoints em um arquivo JSON local (checkpoint_id -> token).
+
+    A gravação é atômica (arquivo temporário + ``os.replace``).
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, data: Dict[str, str]) -> None:
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self._path)
+
+    def load(self, checkpoint_id: str) -> Optional[str]:
+        with self._lock:
+            return self._read().get(checkpoint_id)
+
+    def save(self, checkpoint_id: str, token: str) -> None:
+        with self._lock:
+            data = self._read()
+            data[checkpoint_id] = token
+            self._write(data)
+
+    def clear(self, checkpoint_id: str) -> None:
+        with self._lock:
+            data = self._read()
+            if data.pop(checkpoint_id, None) is not None:
+                self._write(data)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    Checkpoints em um banco SQLite local, útil quando vários jobs compartilham o destino.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints (checkpoint_id TEXT PRIMARY KEY, token TEXT NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator["sqlite3.Connection"]:
+        """
+        Conexão dentro de uma transação; fecha a conexão ao sair (o ``with`` do sqlite3 só
+        faz commit/rollback).
+        """
+        import sqlite3
+        with closing(sqlite3.connect(self._path)) as conn, conn:
+            yield conn
+
+    def load(self, checkpoint_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT token FROM checkpoints WHERE checkpoint_id = ?", (checkpoint_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, checkpoint_id: str, token: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (checkpoint_id, token) VALUES (?, ?)",
+                (checkpoint_id, token)
+            )
+
+    def clear(self, checkpoint_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM checkpoints WHERE checkpoint_id = ?", (checkpoint_id,))
+
+
+def resolve_start_token(
+    start_token: Optional[str],
+    checkpoint: Optional[CheckpointStore],
+    checkpoint_id: Optional[str]
+) -> Optional[str]:
+    """
+    Define o ponto de partida: o token explícito tem prioridade sobre o checkpoint salvo.
+
+    :raises ValueError: Se ``checkpoint`` for informado sem ``checkpoint_id``.
+    """
+    if checkpoint is None:
+        return start_token
+    if not checkpoint_id:
+        raise ValueError("checkpoint_id é obrigatório quando checkpoint é informado.")
+    return start_token or checkpoint.load(checkpoint_id)
+
+
+def iter_pages(
+    model: Type[PynamoModel],
+    results: ResultIterator,
+    checkpoint: Optional[CheckpointStore] = None,
+    checkpoint_id: Optional[str] = None
+) -> Iterator[Page]:
+    """
+    Percorre um ResultIterator página a página, emitindo o token de continuação de cada uma.
+
+    Com ``checkpoint``, o token de uma página é salvo quando o consumidor pede a página
+    seguinte (ou seja, depois de terminar de processá-la), e o checkpoint é removido ao fim
+    da leitura.
+
+    :param model: Classe do modelo, usada para desserializar os itens.
+    :param results: ResultIterator retornado por ``Model.scan``/``Model.query``.
+    :param checkpoint: Destino opcional do progresso.
+    :param checkpoint_id: Identificador do job no checkpoint.
+    :return: Iterador de páginas.
+    """
+    for raw_page in results.page_iter:
+        next_token = encode_continuation_token(results.page_iter.last_evaluated_key)
+        yield Page(
+            items=[model.from_raw_data(item) for item in raw_page.get("Items", [])],
+            next_token=next_token,
+            scanned_count=raw_page.get("ScannedCount", 0)
+        )
+        if checkpoint is not None and next_token is not None:
+            checkpoint.save(checkpoint_id, next_token)
+
+    if checkpoint is not None:
+        checkpoint.clear(checkpoint_id)
@@ -0,0 +1,122 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Type, Union
+
+from pynamodb.expressions.condition import Condition
+from pynamodb.models import Model as PynamoModel
+
+from repository.raw import as_dicts
+
+# Marca o fim de um segmento na fila compartilhada.
+_SEGMENT_DONE = object()
+
+
+class _SegmentError:
+    """
+    Envolve a exceção de um segmento para ser relançada na thread consumidora.
+    """
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _put(items: "queue.Queue[Any]", stop: threading.Event, value: Any) -> bool:
+    """
+    Coloca um valor na fila, bloqueando enquanto ela estiver cheia (backpressure).
+
+    Retorna False se o consumidor desistiu da iteração.
+    """
+    while not stop.is_set():
+        try:
+            items.put(value, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _scan_segment(
+    model: Type[PynamoModel],
+    segment: int,
+    total_segments: int,
+    items: "queue.Queue[Any]",
+    stop: threading.Event,
+    scan_kwargs: dict,
+    as_dict: bool
+) -> None:
+    try:
+        results = model.scan(segment=segment, total_segments=total_segments, **scan_kwargs)
+        if as_dict:
+            results = as_dicts(model, results)
+        for item in results:
+            if not _put(items, stop, item):
+                return
+    except Exception as e:
+        _put(items, stop, _SegmentError(e))
+        return
+    _put(items, stop, _SEGMENT_DONE)
+
+
+def parallel_scan(
+    model: Type[PynamoModel],
+    filter_condition: Optional[Condition] = None,
+    segments: int = 4,
+    workers: Optional[int] = None,
+    queue_size: int = 1000,
+    page_size: Optional[int] = None,
+    consistent_read: bool = False,
+    index_name: Optional[str] = None,
+    as_dict: bool = False
+) -> Iterator[Union[PynamoModel, Dict[str, Any]]]:
+    """
+    Escaneia a tabela em ``segments`` segmentos (Segment/TotalSegments) em paralelo.
+
+    Cada segmento é lido por uma thread e os itens são entregues em um único fluxo, na ordem
+    em que chegam. A fila entre as threads e o consumidor é limitada a ``queue_size`` itens:
+    quando o consumidor é mais lento, as threads param de paginar até haver espaço.
+
+    :param model: Classe do modelo.
+    :param filter_condition: Condição para filtrar resultados.
+    :param segments: Número total de segmentos (TotalSegments).
+    :param workers: Threads simultâneas; por padrão uma por segmento.
+    :param queue_size: Quantidade máxima de itens em memória aguardando consumo.
+    :param page_size: Tamanho da página de cada scan.
+    :param consistent_read: Se True, leitura consistente.
+    :param index_name: Nome do índice a escanear, se aplicável.
+    :param as_dict: Se True, entrega dicts em vez de instâncias do modelo (ver ``repository.raw``).
+    :raises ValueError: Se ``segments`` ou ``queue_size`` forem menores que 1.
+    :return: Iterador com os itens de todos os segmentos.
+    """
+    if segments < 1:
+        raise ValueError("segments deve ser maior ou igual a 1.")
+    if queue_size < 1:
+        raise ValueError("queue_size deve ser maior ou igual a 1.")
+
+    scan_kwargs = {
+        "filter_condition": filter_condition,
+        "page_size": page_size,
+        "consistent_read": consistent_read,
+        "index_name": index_name,
+    }
+    # Cria a conexão antes de distribuir os segmentos entre as threads.
+    model._get_connection()
+
+    items: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=min(workers or segments, segments))
+    try:
+        for segment in range(segments):
+            executor.submit(_scan_segment, model, segment, segments, items, stop, scan_kwargs, as_dict)
+
+        finished = 0
+        while finished < segments:
+            value = items.get()
+            if value is _SEGMENT_DONE:
+                finished += 1
+            elif isinstance(value, _SegmentError):
+                raise value.error
+            else:
+                yield value
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,162 @@
+import cProfile
+import io
+import pstats
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from repository.metrics import CallMetrics, MetricsHook
+
+CAPTURE_MODES = ("cprofile", "pyinstrument")
+
+
+@dataclass
+class TimeBreakdown:
+    """
+    Tempo acumulado de uma operação, dividido por etapa (segundos).
+    """
+    calls: int = 0
+    total: float = 0.0
+    network: float = 0.0
+    parse: float = 0.0
+    model: float = 0.0
+    other: float = 0.0
+
+    def fractions(self) -> Dict[str, float]:
+        """
+        Participação de cada etapa no tempo total (0 a 1).
+        """
+        if not self.total:
+            return {"network": 0.0, "parse": 0.0, "model": 0.0, "other": 0.0}
+        return {
+            "network": self.network / self.total,
+            "parse": self.parse / self.total,
+            "model": self.model / self.total,
+            "other": self.other / self.total,
+        }
+
+
+class _Capture:
+    """
+    Liga/desliga um profiler compartilhado por todas as chamadas de uma operação.
+
+    Um profiler só acompanha uma thread por vez: se outra thread já estiver capturando, a
+    chamada corrente segue sem captura.
+    """
+
+    def __init__(self, profiler: Any, start: str, stop: str) -> None:
+        self.profiler = profiler
+        self._start = getattr(profiler, start)
+        self._stop = getattr(profiler, stop)
+        self._lock = threading.Lock()
+        self._owner: Optional[int] = None
+        self._depth = 0
+
+    def enable(self) -> None:
+        me = threading.get_ident()
+        if self._owner != me and not self._lock.acquire(blocking=False):
+            return
+        self._owner = me
+        self._depth += 1
+        if self._depth == 1:
+            self._start()
+
+    def disable(self) -> None:
+        if self._owner != threading.get_ident():
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            self._stop()
+            self._owner = None
+            self._lock.release()
+
+
+class Profiler(MetricsHook):
+    """
+    Modo de profiling do repositório: divide o tempo de cada chamada em rede, parsing da
+    resposta (botocore), construção do modelo (``from_raw_data`` dos itens de query/scan) e o
+    restante.
+
+    Com ``capture``, cada operação também é perfilada com cProfile ou pyinstrument (este é
+    opcional e precisa estar instalado); o relatório sai em ``report``.
+
+    Uso:
+        profiler = Profiler(capture="cprofile")
+        DynamoRepository.configure_instrumentation(profiler)
+        ...
+        print(profiler.breakdown()["scan"].fractions())
+        print(profiler.report("scan"))
+    """
+
+    def __init__(self, capture: Optional[str] = None, operations: Optional[Sequence[str]] = None) -> None:
+        """
+        :param capture: None, "cprofile" ou "pyinstrument".
+        :param operations: Operações a capturar (padrão: todas). A divisão de tempo vale sempre para todas.
+        :raises ValueError: Se ``capture`` for inválido.
+        :raises ImportError: Se ``capture="pyinstrument"`` sem o pacote instalado.
+        """
+        if capture is not None and capture not in CAPTURE_MODES:
+            raise ValueError(f"capture inválido: {capture!r}. Use um de {CAPTURE_MODES}.")
+        if capture == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError as e:
+                raise ImportError("capture='pyinstrument' requer o pacote pyinstrument.") from e
+        self._capture_mode = capture
+        self._operations = set(operations) if operations else None
+        self._lock = threading.Lock()
+        self._breakdown: Dict[str, TimeBreakdown] = {}
+        self._captures: Dict[str, _Capture] = {}
+
+    def record(self, metrics: CallMetrics) -> None:
+        with self._lock:
+            breakdown = self._breakdown.setdefault(metrics.operation, TimeBreakdown())
+            breakdown.calls += 1
+            breakdown.total += metrics.latency
+            breakdown.network += metrics.network_time
+            breakdown.parse += metrics.parse_time
+            breakdown.model += metrics.model_time
+            breakdown.other += metrics.other_time
+
+    def profile(self, operation: str) -> Optional[_Capture]:
+        if self._capture_mode is None or (self._operations is not None and operation not in self._operations):
+            return None
+        with self._lock:
+            capture = self._captures.get(operation)
+            if capture is None:
+                if self._capture_mode == "cprofile":
+                    capture = _Capture(cProfile.Profile(), "enable", "disable")
+                else:
+                    from pyinstrument import Profiler as PyinstrumentProfiler
+                    capture = _Capture(PyinstrumentProfiler(), "start", "stop")
+                self._captures[operation] = capture
+            return capture
+
+    def breakdown(self) -> Dict[str, TimeBreakdown]:
+        """
+        Cópia da divisão de tempo acumulada por operação.
+        """
+        with self._lock:
+            return {op: TimeBreakdown(**vars(b)) for op, b in self._breakdown.items()}
+
+    def report(self, operation: str, sort: str = "cumulative", limit: Optional[int] = 30) -> str:
+        """
+        Relatório do profiler capturado para uma operação.
+
+        :param operation: Nome da operação (ex.: "scan").
+        :param sort: Ordenação do pstats (apenas cProfile).
+        :param limit: Linhas do relatório; None para todas (apenas cProfile).
+        :raises KeyError: Se a operação não foi capturada.
+        :return: Texto do relatório.
+        """
+        capture = self._captures[operation]
+        if self._capture_mode == "cprofile":
+            out = io.StringIO()
+            pstats.Stats(capture.profiler, stream=out).sort_stats(sort).print_stats(limit)
+            return out.getvalue()
+        return capture.profiler.output_text()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakdown.clear()
+            self._captures.clear()
@@ -0,0 +1,40 @@
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from pynamodb.models import Model as PynamoModel
+
+from repository.model_metadata import model_metadata
+
+
+def resolve_projection(model: Type[PynamoModel], attributes_to_get: Optional[Sequence[Any]]) -> Optional[List[Any]]:
+    """
+    Converte uma projeção informada pelo usuário no formato aceito pelo PynamoDB.
+
+    Nomes de atributos Python são trocados pelo atributo do modelo (o PynamoDB então usa o
+    ``attr_name`` gravado no DynamoDB). Caminhos aninhados (``"endereco.cidade"``), objetos
+    Attribute e Path são repassados como estão.
+
+    :param model: Classe do modelo.
+    :param attributes_to_get: Atributos desejados, ou None para o item completo.
+    :return: Lista para ``attributes_to_get``, ou None.
+    """
+    if not attributes_to_get:
+        return None
+    attributes = model_metadata(model).attributes
+    return [
+        attributes[attr] if isinstance(attr, str) and attr in attributes else attr
+        for attr in attributes_to_get
+    ]
+
+
+def key_projection(model: Type[PynamoModel]) -> List[Any]:
+    """
+    Projeção apenas com as chaves primárias do modelo (usada por ``exists``).
+    """
+    return list(model_metadata(model).key_attributes)
+
+
+def projection_key(projection: Optional[Sequence[Any]]) -> Tuple[str, ...]:
+    """
+    Identidade hashable de uma projeção já resolvida (para deduplicar leituras iguais).
+    """
+    return tuple(str(getattr(attr, "attr_name", attr)) for attr in projection or ())
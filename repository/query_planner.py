@@ -0,0 +1,258 @@
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from pynamodb.constants import ALL
+from pynamodb.exceptions import DoesNotExist
+from pynamodb.expressions.condition import Condition
+from pynamodb.expressions.operand import Path, Value
+from pynamodb.models import Model as PynamoModel
+
+from repository.model_metadata import model_metadata
+from repository.parallel_scan import parallel_scan
+
+GET = "get"
+QUERY = "query"
+INDEX_QUERY = "index_query"
+SCAN = "scan"
+
+# Operadores aceitos pelo DynamoDB em KeyConditionExpression para a sort key.
+_RANGE_OPERATORS = {"=", "<", "<=", ">", ">=", "BETWEEN", "begins_with"}
+# Desempate entre caminhos com o mesmo número de chaves usadas.
+_KIND_ORDER = {"tabela": 0, "LSI": 1, "GSI": 2}
+
+
+@dataclass
+class _Candidate:
+    kind: str
+    index_name: Optional[str]
+    hash_key: Optional[str]
+    range_key: Optional[str]
+
+
+@dataclass
+class QueryPlan:
+    """
+    Caminho de acesso escolhido por ``plan_query`` para um conjunto de predicados.
+
+    ``access`` é GET (GetItem), QUERY (query na tabela), INDEX_QUERY (query em GSI/LSI) ou
+    SCAN (scan paralelo, último recurso). Chaves usam o ``attr_name`` do DynamoDB.
+    """
+    table_name: str
+    access: str
+    index_name: Optional[str] = None
+    hash_key: Optional[str] = None
+    hash_key_value: Any = None
+    range_key: Optional[str] = None
+    range_key_value: Any = None
+    range_key_condition: Optional[Condition] = None
+    filter_condition: Optional[Condition] = None
+    segments: int = 1
+    notes: List[str] = field(default_factory=list)
+
+    def explain(self) -> str:
+        """
+        Descrição legível do plano e dos caminhos avaliados.
+        """
+        if self.access == GET:
+            target = "GetItem na tabela"
+        elif self.access == QUERY:
+            target = "Query na tabela"
+        elif self.access == INDEX_QUERY:
+            target = f"Query no índice {self.index_name}"
+        else:
+            target = f"Scan paralelo da tabela ({self.segments} segmentos)"
+        lines = [f"{target} {self.table_name}"]
+        if self.hash_key is not None:
+            lines.append(f"  hash: {self.hash_key} = {self.hash_key_value!r}")
+        if self.range_key_value is not None:
+            lines.append(f"  range: {self.range_key} = {self.range_key_value!r}")
+        elif self.range_key_condition is not None:
+            lines.append(f"  range: {self.range_key_condition}")
+        if self.filter_condition is not None:
+            lines.append(f"  filtro: {self.filter_condition}")
+        if self.notes:
+            lines.append("  caminhos avaliados:")
+            lines.extend(f"    - {note}" for note in self.notes)
+        return "\n".join(lines)
+
+
+def _flatten(conditions: Sequence[Condition]) -> List[Condition]:
+    flat: List[Condition] = []
+    for condition in conditions:
+        if condition.operator == "AND":
+            flat.extend(_flatten(condition.values))
+        else:
+            flat.append(condition)
+    return flat
+
+
+def _key_attribute(condition: Condition) -> Optional[str]:
+    """
+    ``attr_name`` do atributo de topo comparado com valores literais, ou None.
+    """
+    path, *operands = condition.values
+    if not isinstance(path, Path) or len(path.path) != 1 or not operands:
+        return None
+    if not all(isinstance(operand, Value) for operand in operands):
+        return None
+    return path.path[0]
+
+
+def _combine(conditions: Sequence[Condition]) -> Optional[Condition]:
+    combined = None
+    for condition in conditions:
+        combined = condition if combined is None else combined & condition
+    return combined
+
+
+def _candidates(model: Type[PynamoModel], consistent_read: bool, notes: List[str]) -> List[_Candidate]:
+    metadata = model_metadata(model).stored_keys
+    candidates = [_Candidate("tabela", None, metadata.hash_key, metadata.range_key)]
+    for lsi in metadata.lsis:
+        candidates.append(_Candidate("LSI", lsi.name, lsi.hash_key, lsi.range_key))
+    for gsi in metadata.gsis:
+        if consistent_read:
+            notes.append(f"{gsi.name} (GSI): descartado, GSIs não suportam leitura consistente")
+            continue
+        if model._indexes[gsi.name].Meta.projection.projection_type != ALL:
+            notes.append(f"{gsi.name} (GSI): descartado, a projeção não traz todos os atributos")
+            continue
+        candidates.append(_Candidate("GSI", gsi.name, gsi.hash_key, gsi.range_key))
+    return candidates
+
+
+def plan_query(
+    model: Type[PynamoModel],
+    conditions: Sequence[Condition],
+    consistent_read: bool = False,
+    allow_scan: bool = False,
+    segments: int = 4
+) -> QueryPlan:
+    """
+    Escolhe o caminho de acesso mais barato para os predicados, a partir das chaves da tabela,
+    GSIs e LSIs do modelo (``model_metadata``).
+
+    Igualdades e condições de intervalo (<, <=, >, >=, between, begins_with) sobre atributos
+    de chave viram condições de chave; o resto vira filtro. Ordem de preferência: GetItem
+    (igualdade em todas as chaves da tabela, sem outros predicados), depois o caminho que usa
+    mais chaves (hash + range antes de só hash), com desempate tabela, LSI, GSI. GSIs são
+    descartados com ``consistent_read`` ou projeção parcial. Sem nenhuma igualdade em chave
+    hash, o scan paralelo só é usado com ``allow_scan``.
+
+    :param model: Classe do modelo.
+    :param conditions: Condições PynamoDB (ex.: ``Model.status == "active"``), combinadas com AND.
+    :param consistent_read: Se a leitura precisa ser consistente.
+    :param allow_scan: Permite scan paralelo quando nenhum índice atende.
+    :param segments: Segmentos do scan paralelo.
+    :raises ValueError: Se nenhum caminho por chave atende e ``allow_scan`` é False.
+    :return: QueryPlan (use ``explain()`` para inspecioná-lo).
+    """
+    predicates = _flatten(conditions)
+    equalities: Dict[str, Tuple[int, Condition]] = {}
+    ranges: Dict[str, Tuple[int, Condition]] = {}
+    for position, condition in enumerate(predicates):
+        attr_name = _key_attribute(condition)
+        if attr_name is None or condition.operator not in _RANGE_OPERATORS:
+            continue
+        target = equalities if condition.operator == "=" else ranges
+        target.setdefault(attr_name, (position, condition))
+
+    notes: List[str] = []
+    table_name = model.Meta.table_name
+    best: Optional[Tuple[Tuple[int, int], _Candidate]] = None
+    for candidate in _candidates(model, consistent_read, notes):
+        label = f"{candidate.index_name} ({candidate.kind})" if candidate.index_name else "tabela"
+        if candidate.hash_key not in equalities:
+            notes.append(f"{label}: sem igualdade em {candidate.hash_key}")
+            continue
+        uses_range = candidate.range_key is not None and (
+            candidate.range_key in equalities or candidate.range_key in ranges
+        )
+        notes.append(f"{label}: usa {'hash + range' if uses_range else 'apenas hash'}")
+        score = (1 + int(uses_range), -_KIND_ORDER[candidate.kind])
+        if best is None or score > best[0]:
+            best = (score, candidate)
+
+    if best is None:
+        plan = QueryPlan(table_name, SCAN, filter_condition=_combine(predicates), segments=segments, notes=notes)
+        if not allow_scan:
+            raise ValueError(
+                "Nenhuma chave de tabela ou índice atende aos predicados; use use_scan_if_missing_hash=True "
+                f"para permitir o scan.\n{plan.explain()}"
+            )
+        return plan
+
+    candidate = best[1]
+    used = {equalities[candidate.hash_key][0]}
+    hash_value = _python_value(model, candidate.hash_key, equalities[candidate.hash_key][1])
+    range_condition = None
+    if candidate.range_key in equalities:
+        position, range_condition = equalities[candidate.range_key]
+        used.add(position)
+    elif candidate.range_key in ranges:
+        position, range_condition = ranges[candidate.range_key]
+        used.add(position)
+    remaining = [condition for position, condition in enumerate(predicates) if position not in used]
+
+    plan = QueryPlan(
+        table_name,
+        QUERY if candidate.index_name is None else INDEX_QUERY,
+        index_name=candidate.index_name,
+        hash_key=candidate.hash_key,
+        hash_key_value=hash_value,
+        range_key=candidate.range_key if range_condition is not None else None,
+        range_key_condition=range_condition,
+        filter_condition=_combine(remaining),
+        notes=notes
+    )
+    table_key_complete = candidate.range_key is None or (
+        range_condition is not None and range_condition.operator == "="
+    )
+    if plan.access == QUERY and table_key_complete and not remaining:
+        plan.access = GET
+        if range_condition is not None:
+            plan.range_key_value = _python_value(model, candidate.range_key, range_condition)
+            plan.range_key_condition = None
+    return plan
+
+
+def _python_value(model: Type[PynamoModel], attr_name: str, condition: Condition) -> Any:
+    attribute = next(attr for attr in model_metadata(model).attributes.values() if attr.attr_name == attr_name)
+    return attribute.deserialize(attribute.get_value(condition.values[1].value))
+
+
+def execute_plan(
+    model: Type[PynamoModel],
+    plan: QueryPlan,
+    limit: Optional[int] = None,
+    scan_forward: bool = True,
+    consistent_read: bool = False
+) -> Iterator[PynamoModel]:
+    """
+    Executa um QueryPlan.
+
+    :return: Iterador dos itens encontrados.
+    """
+    if plan.access == GET:
+        try:
+            return iter([model.get(plan.hash_key_value, plan.range_key_value, consistent_read=consistent_read)])
+        except DoesNotExist:
+            return iter([])
+    if plan.access in (QUERY, INDEX_QUERY):
+        return model.query(
+            plan.hash_key_value,
+            range_key_condition=plan.range_key_condition,
+            filter_condition=plan.filter_condition,
+            index_name=plan.index_name,
+            limit=limit,
+            scan_index_forward=scan_forward,
+            consistent_read=consistent_read
+        )
+    items = parallel_scan(
+        model,
+        filter_condition=plan.filter_condition,
+        segments=plan.segments,
+        consistent_read=consistent_read
+    )
+    return itertools.islice(items, limit) if limit is not None else items
@@ -0,0 +1,397 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pynamodb.models import Model as PynamoModel
+
+READ = "read"
+WRITE = "write"
+
+THROTTLE_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+# Operação do DynamoDB -> tipo de capacidade consumida; usado pelo limitador e pelas métricas.
+OPERATION_KINDS = {
+    "GetItem": READ,
+    "BatchGetItem": READ,
+    "Query": READ,
+    "Scan": READ,
+    "TransactGetItems": READ,
+    "PutItem": WRITE,
+    "UpdateItem": WRITE,
+    "DeleteItem": WRITE,
+    "BatchWriteItem": WRITE,
+    "TransactWriteItems": WRITE,
+}
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe: ``rate`` tokens por segundo, acumulando até ``capacity``.
+
+    ``acquire`` bloqueia até haver tokens. Pedidos maiores que a capacidade são liberados
+    quando o balde está cheio e deixam o saldo negativo, atrasando os pedidos seguintes.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        :param rate: Tokens repostos por segundo.
+        :param capacity: Máximo acumulado (padrão: ``rate``, ou seja, 1 segundo de rajada).
+        :param clock: Relógio monotônico (injetável para testes).
+        :param sleep: Função de espera (injetável para testes).
+        """
+        if rate <= 0:
+            raise ValueError("rate deve ser maior que zero.")
+        self._rate = float(rate)
+        self._capacity = float(capacity if capacity is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self._capacity
+        self._updated = clock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Consome ``tokens``, esperando o necessário.
+
+        :param tokens: Quantidade a consumir.
+        :return: Tempo total esperado, em segundos.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                needed = min(tokens, self._capacity)
+                if self._tokens >= needed:
+                    self._tokens -= tokens
+                    return waited
+                delay = (needed - self._tokens) / self._rate
+            self._sleep(delay)
+            waited += delay
+
+    def consume(self, tokens: float) -> None:
+        """
+        Debita ``tokens`` sem esperar (o saldo pode ficar negativo).
+
+        Usado para lançar o custo real de uma operação já executada.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+    def _set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill()
+            self._rate = rate
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket cuja taxa reage aos throttles do DynamoDB (AIMD).
+
+    Cada throttle multiplica a taxa por ``decrease_factor`` (sem ficar abaixo de
+    ``min_fraction`` do alvo); cada chamada bem-sucedida devolve ``increase_fraction`` do alvo,
+    até voltar a ``target_rate``.
+    """
+
+    def __init__(
+        self,
+        target_rate: float,
+        min_fraction: float = 0.1,
+        decrease_factor: float = 0.5,
+        increase_fraction: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        super().__init__(target_rate, clock=clock, sleep=sleep)
+        self.target_rate = float(target_rate)
+        self._min_rate = self.target_rate * min_fraction
+        self._decrease_factor = decrease_factor
+        self._increase = self.target_rate * increase_fraction
+        self.consumed = 0.0
+        self.throttles = 0
+        self.waited = 0.0
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        waited = super().acquire(tokens)
+        self.waited += waited
+        return waited
+
+    def record(self, units: float) -> None:
+        """
+        Registra o consumo real de uma chamada bem-sucedida.
+        """
+        self.consumed += units
+        if self.rate < self.target_rate:
+            self._set_rate(min(self.target_rate, self.rate + self._increase))
+
+    def on_throttle(self) -> None:
+        """
+        Reduz a taxa após um ProvisionedThroughputExceeded/Throttling.
+        """
+        self.throttles += 1
+        self._set_rate(max(self._min_rate, self.rate * self._decrease_factor))
+
+
+@dataclass
+class CapacityStats:
+    """
+    Contadores de um balde de capacidade (tabela ou GSI, leitura ou escrita).
+    """
+    rate: float
+    target_rate: float
+    consumed: float
+    throttles: int
+    waited: float
+
+
+class CapacityLimiter:
+    """
+    Limita, no cliente, o consumo de RCU/WCU por tabela e por GSI.
+
+    Ao ser anexado a um modelo (``attach``), registra handlers no cliente botocore da conexão
+    do modelo: toda chamada passa a pedir ``ReturnConsumedCapacity=INDEXES``, espera um token
+    no balde da tabela (e do índice, em queries/scans de GSI) antes de sair e, ao voltar,
+    debita a capacidade efetivamente consumida. Throttles reduzem a taxa do balde, que se
+    recupera aos poucos.
+
+    As taxas alvo vêm do DescribeTable (capacidade provisionada da tabela e de cada GSI)
+    multiplicadas por ``capacity_fraction``. Tabelas on-demand não são limitadas, a não ser
+    que ``read_capacity``/``write_capacity`` sejam informados.
+    """
+
+    def __init__(
+        self,
+        capacity_fraction: float = 1.0,
+        read_capacity: Optional[float] = None,
+        write_capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        :param capacity_fraction: Fração da capacidade provisionada a usar (ex.: 0.3 para jobs em background).
+        :param read_capacity: RCU/s da tabela, substituindo o valor do DescribeTable.
+        :param write_capacity: WCU/s da tabela, substituindo o valor do DescribeTable.
+        :param clock: Relógio monotônico (injetável para testes).
+        :param sleep: Função de espera (injetável para testes).
+        """
+        if not 0 < capacity_fraction <= 1:
+            raise ValueError("capacity_fraction deve estar entre 0 (exclusivo) e 1.")
+        self._fraction = capacity_fraction
+        self._overrides = {READ: read_capacity, WRITE: write_capacity}
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, Optional[str], str], AdaptiveTokenBucket] = {}
+        # Tabela -> emissor de eventos do cliente botocore em que os handlers estão registrados.
+        self._attached: Dict[str, Any] = {}
+        # Tabela -> Connection do PynamoDB cujo _make_api_call foi envolvido (ver _guard).
+        self._connections: Dict[str, Any] = {}
+        self._local = threading.local()
+
+    def attach(self, model: Type[PynamoModel]) -> None:
+        """
+        Passa a limitar as chamadas feitas pela conexão do modelo (idempotente por tabela).
+
+        Os handlers ficam no cliente botocore da conexão. O PynamoDB troca esse cliente quando
+        as credenciais ficam vazias (ex.: falha no serviço de metadados da instância); por isso
+        cada chamada da conexão confere o cliente atual e, se ele mudou, os handlers são
+        registrados no novo antes do envio. Se a conexão do modelo for recriada
+        (``model._connection = None``, ``ConnectionManager.detach``), é preciso chamar
+        ``attach`` de novo.
+        """
+        table_name = model.Meta.table_name
+        connection = model._get_connection().connection
+        events = connection.client.meta.events
+        with self._lock:
+            if table_name in self._attached:
+                return
+            self._attached[table_name] = events
+            self._connections[table_name] = connection
+
+        description = model.describe_table()
+        with self._lock:
+            self._add_buckets(table_name, None, description.get("ProvisionedThroughput", {}), use_overrides=True)
+            for index in description.get("GlobalSecondaryIndexes", []):
+                self._add_buckets(table_name, index["IndexName"], index.get("ProvisionedThroughput", {}))
+
+        self._register(events)
+        self._guard(table_name, connection)
+
+    def _register(self, events: Any) -> None:
+        # Com ConnectionManager, várias tabelas podem compartilhar o cliente: o unique_id
+        # evita registrar os handlers duas vezes.
+        for event_name, handler in self._handlers():
+            events.register(event_name, handler, unique_id=self._unique_id(event_name))
+
+    def _unregister_if_unused(self, events: Any) -> None:
+        with self._lock:
+            shared = any(other is events for other in self._attached.values())
+        if not shared:
+            for event_name, handler in self._handlers():
+                events.unregister(event_name, handler, unique_id=self._unique_id(event_name))
+
+    def _guard(self, table_name: str, connection: Any) -> None:
+        """
+        Envolve ``_make_api_call`` da conexão (só da instância) para seguir trocas de cliente.
+        """
+        original = connection._make_api_call
+
+        def make_api_call(operation_name: str, operation_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            events = connection.client.meta.events
+            if self._attached.get(table_name, events) is not events:
+                self._rebind(table_name, events)
+            return original(operation_name, operation_kwargs)
+
+        make_api_call.capacity_limiter = self  # type: ignore[attr-defined]
+        connection._make_api_call = make_api_call
+
+    def _rebind(self, table_name: str, events: Any) -> None:
+        with self._lock:
+            previous = self._attached.get(table_name)
+            if previous is None or previous is events:
+                return
+            self._attached[table_name] = events
+        self._register(events)
+        self._unregister_if_unused(previous)
+
+    def detach(self, model: Type[PynamoModel]) -> None:
+        """
+        Remove os handlers da conexão do modelo e descarta os baldes da tabela.
+        """
+        table_name = model.Meta.table_name
+        with self._lock:
+            events = self._attached.pop(table_name, None)
+            if events is None:
+                return
+            connection = self._connections.pop(table_name, None)
+            self._buckets = {key: bucket for key, bucket in self._buckets.items() if key[0] != table_name}
+
+        wrapper = connection.__dict__.get("_make_api_call") if connection is not None else None
+        if getattr(wrapper, "capacity_limiter", None) is self:
+            del connection._make_api_call
+        self._unregister_if_unused(events)
+
+    def _unique_id(self, event_name: str) -> str:
+        return f"capacity-limiter-{id(self)}-{event_name}"
+
+    def _handlers(self) -> List[Tuple[str, Callable[..., None]]]:
+        return [
+            ("before-parameter-build.dynamodb", self._before_call),
+            ("needs-retry.dynamodb", self._on_retry),
+            ("after-call.dynamodb", self._after_call),
+        ]
+
+    def stats(self) -> Dict[str, CapacityStats]:
+        """
+        Contadores por balde, com chaves como ``"customers:read"`` ou ``"customers/idx:write"``.
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            f"{table}{'/' + index if index else ''}:{kind}": CapacityStats(
+                rate=bucket.rate,
+                target_rate=bucket.target_rate,
+                consumed=bucket.consumed,
+                throttles=bucket.throttles,
+                waited=bucket.waited
+            )
+            for (table, index, kind), bucket in buckets.items()
+        }
+
+    def bucket(self, table_name: str, kind: str, index_name: Optional[str] = None) -> Optional[AdaptiveTokenBucket]:
+        """
+        Balde de uma tabela/índice (``kind`` = "read" ou "write"), ou None se não houver limite.
+        """
+        return self._buckets.get((table_name, index_name, kind))
+
+    def _add_buckets(self, table_name: str, index_name: Optional[str], throughput: Dict[str, Any], use_overrides: bool = False) -> None:
+        for kind, field_name in ((READ, "ReadCapacityUnits"), (WRITE, "WriteCapacityUnits")):
+            units = (self._overrides[kind] if use_overrides else None) or throughput.get(field_name) or 0
+            if units > 0:
+                self._buckets[(table_name, index_name, kind)] = AdaptiveTokenBucket(
+                    units * self._fraction, clock=self._clock, sleep=self._sleep
+                )
+
+    def _before_call(self, params: Dict[str, Any], model: Any, **_: Any) -> None:
+        kind = OPERATION_KINDS.get(model.name)
+        if kind is None:
+            self._local.acquired = []
+            return
+        if "ReturnConsumedCapacity" in model.input_shape.members:
+            params["ReturnConsumedCapacity"] = "INDEXES"
+
+        tables = [params["TableName"]] if "TableName" in params else list(params.get("RequestItems", {}))
+        index_name = params.get("IndexName")
+        acquired = []
+        for table_name in tables:
+            # Leituras em GSI consomem a capacidade do índice; em LSI, a da tabela.
+            key = (table_name, index_name, kind)
+            if key not in self._buckets:
+                key = (table_name, None, kind)
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.acquire(1.0)
+                acquired.append(key)
+        self._local.acquired = acquired
+
+    def _on_retry(self, response: Any = None, **_: Any) -> None:
+        if not response:
+            return
+        code = response[1].get("Error", {}).get("Code")
+        if code in THROTTLE_ERROR_CODES:
+            for key in getattr(self._local, "acquired", []):
+                self._buckets[key].on_throttle()
+
+    def _after_call(self, parsed: Dict[str, Any], model: Any, **_: Any) -> None:
+        acquired = getattr(self._local, "acquired", [])
+        self._local.acquired = []
+        kind = OPERATION_KINDS.get(model.name)
+        if kind is None:
+            return
+        if parsed.get("Error", {}).get("Code") in THROTTLE_ERROR_CODES:
+            for key in acquired:
+                self._buckets[key].on_throttle()
+            return
+
+        capacity = parsed.get("ConsumedCapacity") or []
+        for entry in capacity if isinstance(capacity, list) else [capacity]:
+            table_name = entry.get("TableName")
+            table_units = entry.get("Table", {}).get("CapacityUnits", entry.get("CapacityUnits", 0.0))
+            self._debit((table_name, None, kind), table_units, acquired)
+            indexes = {**entry.get("LocalSecondaryIndexes", {}), **entry.get("GlobalSecondaryIndexes", {})}
+            for index_name, usage in indexes.items():
+                self._debit((table_name, index_name, kind), usage.get("CapacityUnits", 0.0), acquired)
+
+    def _debit(self, key: Tuple[str, Optional[str], str], units: float, acquired: List[Tuple[str, Optional[str], str]]) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        # O token pego antes da chamada já foi descontado do saldo.
+        bucket.consume(units - (1.0 if key in acquired else 0.0))
+        bucket.record(units)
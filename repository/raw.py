@@ -0,0 +1,135 @@
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Type, Union
+
+from pynamodb.constants import BATCH_GET_PAGE_LIMIT
+from pynamodb.exceptions import GetError
+from pynamodb.models import Model as PynamoModel
+from pynamodb.pagination import ResultIterator
+
+from repository.backoff import backoff_delay
+from repository.model_metadata import model_metadata
+
+RawItem = Dict[str, Dict[str, Any]]
+
+
+def _decode_number(value: str) -> Union[int, float]:
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def decode_value(attribute_value: Dict[str, Any]) -> Any:
+    """
+    Converte um AttributeValue do DynamoDB (ex.: ``{"S": "abc"}``) em um valor Python primitivo.
+    """
+    (attr_type, value), = attribute_value.items()
+    return _DECODERS[attr_type](value)
+
+
+_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "S": lambda v: v,
+    "N": _decode_number,
+    "B": lambda v: v,
+    "BOOL": lambda v: v,
+    "NULL": lambda v: None,
+    "SS": set,
+    "NS": lambda v: {_decode_number(n) for n in v},
+    "BS": set,
+    "L": lambda v: [decode_value(e) for e in v],
+    "M": lambda v: {k: decode_value(e) for k, e in v.items()},
+}
+
+
+def item_decoder(model: Type[PynamoModel]) -> Callable[[RawItem], Dict[str, Any]]:
+    """
+    Cria um decodificador de itens crus do DynamoDB para dicts, sem instanciar o modelo.
+
+    As chaves do dict usam os nomes dos atributos Python do modelo (atributos não declarados
+    mantêm o nome do DynamoDB). Os valores ficam no formato primitivo do DynamoDB: atributos
+    com serialização própria (datas, JSON, enums) não são convertidos.
+
+    :param model: Classe do modelo, usada apenas para mapear ``attr_name`` -> nome Python.
+    :return: Função item cru -> dict.
+    """
+    names = model_metadata(model).python_names
+    decoders = _DECODERS
+
+    def decode(item: RawItem) -> Dict[str, Any]:
+        row = {}
+        for attr_name, attribute_value in item.items():
+            (attr_type, value), = attribute_value.items()
+            row[names.get(attr_name, attr_name)] = decoders[attr_type](value)
+        return row
+
+    return decode
+
+
+def as_dicts(model: Type[PynamoModel], results: ResultIterator) -> ResultIterator:
+    """
+    Faz um ResultIterator de query/scan entregar dicts em vez de instâncias do modelo.
+
+    A paginação, o ``limit`` e o ``last_evaluated_key`` continuam funcionando normalmente.
+    """
+    # O ResultIterator aplica _map_fn (Model.from_raw_data por padrão) a cada item cru.
+    results._map_fn = item_decoder(model)
+    return results
+
+
+def batch_get_dicts(
+    model: Type[PynamoModel],
+    keys: Sequence[Any],
+    consistent_read: Optional[bool] = None,
+    attributes_to_get: Optional[List[Any]] = None,
+    max_retries: int = 8,
+    base_delay: float = 0.05,
+    max_delay: float = 5.0
+) -> Iterator[Dict[str, Any]]:
+    """
+    BatchGetItem que devolve dicts decodificados diretamente do DynamoDB.
+
+    Chaves repetidas são lidas uma vez, na ordem da primeira ocorrência. UnprocessedKeys são
+    reenviadas com o mesmo backoff exponencial com jitter do ``batch_write``.
+
+    :param model: Classe do modelo.
+    :param keys: Chaves hash, ou tuplas/listas (hash, range).
+    :param consistent_read: Leitura consistente.
+    :param attributes_to_get: Projeção opcional.
+    :param max_retries: Reenvios máximos de UnprocessedKeys por lote.
+    :param base_delay: Atraso base (segundos) do backoff exponencial.
+    :param max_delay: Atraso máximo (segundos) entre reenvios.
+    :raises pynamodb.exceptions.GetError: Se restarem UnprocessedKeys após ``max_retries`` reenvios.
+    :return: Iterador de dicts (itens inexistentes são omitidos).
+    """
+    decode = item_decoder(model)
+    hash_attr = model._hash_key_attribute()
+    range_attr = model._range_key_attribute()
+
+    serialized = []
+    unique = dict.fromkeys(tuple(key) if range_attr is not None else key for key in keys)
+    for key in unique:
+        if range_attr is not None:
+            hash_key, range_key = key
+            hash_value, range_value = model._serialize_keys(hash_key, range_key)
+            serialized.append({hash_attr.attr_name: hash_value, range_attr.attr_name: range_value})
+        else:
+            hash_value, _ = model._serialize_keys(key)
+            serialized.append({hash_attr.attr_name: hash_value})
+
+    connection = model._get_connection()
+    for start in range(0, len(serialized), BATCH_GET_PAGE_LIMIT):
+        pending = serialized[start:start + BATCH_GET_PAGE_LIMIT]
+        attempt = 0
+        while True:
+            data = connection.batch_get_item(
+                pending, consistent_read=consistent_read, attributes_to_get=attributes_to_get
+            )
+            for item in data.get("Responses", {}).get(model.Meta.table_name, []):
+                yield decode(item)
+            pending = data.get("UnprocessedKeys", {}).get(model.Meta.table_name, {}).get("Keys")
+            if not pending:
+                break
+            if attempt >= max_retries:
+                raise GetError(f"UnprocessedKeys após {attempt + 1} tentativas: {len(pending)} chaves não lidas.")
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            attempt += 1
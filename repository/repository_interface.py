@@ -1,10 +1,18 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from typing import Type, Any, Optional, List, Dict, Union, Iterator, TypeVar
+from typing import TYPE_CHECKING, Type, Any, Optional, List, Dict, Sequence, Union, Iterator, AsyncIterator, TypeVar
 from pynamodb.models import Model as PynamoModel
 from pynamodb.expressions.condition import Condition
-from pynamodb.expressions.update import SetAction
+from pynamodb.expressions.update import Action
 from pynamodb.pagination import ResultIterator
 
+if TYPE_CHECKING:
+    from repository.batch_write import BatchWriteReport
+    from repository.bulk_import import ImportReport
+    from repository.columnar import ColumnarTable
+    from repository.export import ExportReport, Sink
+
 T = TypeVar("T", bound=PynamoModel)
 
 class IDynamoRepository(ABC):
@@ -17,7 +25,12 @@ class IDynamoRepository(ABC):
 
     @staticmethod
     @abstractmethod
-    def get(model: Type[T], hash_key: Any, range_key: Optional[Any] = None) -> Optional[T]:
+    def get(
+        model: Type[T],
+        hash_key: Any,
+        range_key: Optional[Any] = None,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> Optional[T]:
         """
         Obtém um item pelo hash_key e range_key opcional.
         Retorna None se não encontrado ou parâmetros inválidos.
@@ -26,7 +39,12 @@ class IDynamoRepository(ABC):
 
     @staticmethod
     @abstractmethod
-    def exists(model: Type[T], hash_key: Any, range_key: Optional[Any] = None) -> bool:
+    def exists(
+        model: Type[T],
+        hash_key: Any,
+        range_key: Optional[Any] = None,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> bool:
         """
         Verifica se um item existe. Retorna False se não existir.
         """
@@ -34,7 +52,7 @@ class IDynamoRepository(ABC):
 
     @staticmethod
     @abstractmethod
-    def insert(model_instance: T) -> T:
+    def insert(model_instance: T, if_not_exists: bool = False, condition: Optional[Condition] = None) -> T:
         """
         Insere um novo item e retorna a instância inserida.
         """
@@ -44,9 +62,10 @@ class IDynamoRepository(ABC):
     @abstractmethod
     def update(
         model_instance: T,
-        hash_key_name: str,
+        hash_key_name: Optional[str] = None,
         range_key_name: Optional[str] = None,
-        consistent_read: bool = False
+        consistent_read: bool = False,
+        condition: Optional[Condition] = None
     ) -> T:
         """
         Atualiza um item existente e retorna a instância atualizada.
@@ -57,15 +76,30 @@ class IDynamoRepository(ABC):
     @abstractmethod
     def upsert(
         model_instance: T,
-        hash_key_name: str,
+        hash_key_name: Optional[str] = None,
         range_key_name: Optional[str] = None,
-        consistent_read: bool = False
+        consistent_read: bool = False,
+        single_request: bool = False
     ) -> T:
         """
         Insere ou atualiza um item (upsert) e retorna a instância resultante.
         """
         return model_instance
 
+    @staticmethod
+    @abstractmethod
+    def update_fields(
+        model: Type[T],
+        hash_key: Any,
+        range_key: Optional[Any],
+        updates: Dict[str, Any],
+        condition: Optional[Condition] = None
+    ) -> T:
+        """
+        Atualiza parcialmente um item (apenas os campos informados) e retorna o item resultante.
+        """
+        return model(hash_key, range_key)
+
     @staticmethod
     @abstractmethod
     def delete(model: Type[T], hash_key: Any, range_key: Optional[Any] = None) -> None:
@@ -84,8 +118,11 @@ class IDynamoRepository(ABC):
         limit: Optional[int] = None,
         scan_forward: bool = True,
         use_scan_if_missing_hash: bool = False,
-        consistent_read: bool = False
-    ) -> Iterator[T]:
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        attributes_to_get: Optional[List[Any]] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[T, Dict[str, Any]]]:
         """
         Consulta itens por hash_key e range_key ou scan via condição.
         Retorna iterador vazio se inválido.
@@ -103,8 +140,11 @@ class IDynamoRepository(ABC):
         limit: Optional[int] = None,
         scan_forward: bool = True,
         use_scan_if_missing_hash: bool = False,
-        consistent_read: bool = False
-    ) -> Iterator[T]:
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        attributes_to_get: Optional[List[Any]] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[T, Dict[str, Any]]]:
         """
         Consulta via índice secundário.
         Retorna iterador vazio se inválido.
@@ -117,8 +157,11 @@ class IDynamoRepository(ABC):
         model: Type[T],
         filter_condition: Optional[Condition] = None,
         limit: Optional[int] = None,
-        consistent_read: bool = False
-    ) -> Iterator[T]:
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        attributes_to_get: Optional[List[Any]] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[T, Dict[str, Any]]]:
         """
         Escaneia itens com filtro opcional.
         Retorna iterador vazio se nenhum resultado.
@@ -132,8 +175,10 @@ class IDynamoRepository(ABC):
         filter_condition: Optional[Condition] = None,
         page_size: int = 10,
         limit: Optional[int] = None,
-        consistent_read: bool = False
-    ) -> ResultIterator[T]:
+        consistent_read: bool = False,
+        start_token: Optional[str] = None,
+        as_dict: bool = False
+    ) -> ResultIterator[Union[T, Dict[str, Any]]]:
         """
         Escaneia itens paginados.
         Pode retornar ResultIterator vazio ou padrão.
@@ -144,13 +189,65 @@ class IDynamoRepository(ABC):
         # Retornando iterador vazio genérico (cast forçar tipo)
         return iter([])  # type: ignore
 
+    @staticmethod
+    @abstractmethod
+    def parallel_scan(
+        model: Type[T],
+        filter_condition: Optional[Condition] = None,
+        segments: int = 4,
+        workers: Optional[int] = None,
+        queue_size: int = 1000,
+        page_size: Optional[int] = None,
+        consistent_read: bool = False
+    ) -> Iterator[T]:
+        """
+        Escaneia itens em segmentos paralelos.
+        Retorna iterador vazio se nenhum resultado.
+        """
+        return iter([])
+
+    @staticmethod
+    @abstractmethod
+    def export(
+        model: Type[T],
+        sink: Sink,
+        format: str = "ndjson",
+        index_name: Optional[str] = None,
+        segments: int = 1,
+        hash_key_value: Optional[Any] = None,
+        filter_condition: Optional[Condition] = None,
+        compression: Optional[str] = None,
+        page_size: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> ExportReport:
+        """
+        Exporta a tabela ou índice em streaming (NDJSON ou Parquet).
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def scan_to_columns(
+        model: Type[T],
+        attributes: Optional[List[str]] = None,
+        filter_condition: Optional[Condition] = None,
+        page_size: Optional[int] = None,
+        consistent_read: bool = False
+    ) -> ColumnarTable:
+        """
+        Escaneia itens materializando o resultado em colunas.
+        """
+        pass
+
     @staticmethod
     @abstractmethod
     def batch_get(
         model: Type[T],
         keys: List[Union[Any, tuple]],
-        consistent_read: bool = True
-    ) -> Iterator[T]:
+        consistent_read: bool = True,
+        attributes_to_get: Optional[List[Any]] = None,
+        as_dict: bool = False
+    ) -> Iterator[Union[T, Dict[str, Any]]]:
         """
         Busca múltiplos itens por lote.
         Retorna iterador vazio se nada encontrado.
@@ -159,9 +256,210 @@ class IDynamoRepository(ABC):
 
     @staticmethod
     @abstractmethod
-    def build_actions(updates: Dict[str, Any]) -> List[SetAction]:
+    def batch_write(
+        puts: Optional[List[T]] = None,
+        deletes: Optional[List[T]] = None,
+        max_workers: int = 4,
+        max_retries: int = 8
+    ) -> BatchWriteReport:
+        """
+        Grava e remove múltiplos itens em lote.
+        Retorna um relatório com o resultado de cada item.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def update_many(
+        items: Sequence[T],
+        consistent_read: bool = False,
+        max_workers: int = 4,
+        max_retries: int = 8
+    ) -> BatchWriteReport:
+        """
+        Atualiza múltiplos itens existentes em lote, agrupados por tabela.
+        Retorna um relatório com o resultado de cada item.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def upsert_many(
+        items: Sequence[T],
+        consistent_read: bool = False,
+        max_workers: int = 4,
+        max_retries: int = 8
+    ) -> BatchWriteReport:
+        """
+        Insere ou atualiza múltiplos itens em lote, agrupados por tabela.
+        Retorna um relatório com o resultado de cada item.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def bulk_import(
+        model: Type[T],
+        path: str,
+        format: Optional[str] = None,
+        max_workers: int = 4,
+        write_capacity: Optional[float] = None,
+        capacity_fraction: float = 1.0,
+        max_retries: int = 8
+    ) -> ImportReport:
+        """
+        Importa registros de um arquivo NDJSON ou CSV em lotes paralelos.
+        Retorna um relatório com vazão, falhas e registros rejeitados.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def build_actions(updates: Dict[str, Any], model: Optional[Type[T]] = None) -> List[Action]:
         """
         Gera ações para atualização parcial.
         Retorna lista vazia se nenhum update.
         """
         return []
+
+
+class IAsyncDynamoRepository(ABC):
+    """
+    Interface assíncrona equivalente a IDynamoRepository.
+
+    As leituras paginadas (query, query_index, scan, batch_get) retornam iteradores assíncronos.
+    """
+
+    @abstractmethod
+    async def get(
+        self,
+        model: Type[T],
+        hash_key: Any,
+        range_key: Optional[Any] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> Optional[T]:
+        """
+        Obtém um item pelo hash_key e range_key opcional.
+        """
+        return None
+
+    @abstractmethod
+    async def exists(
+        self,
+        model: Type[T],
+        hash_key: Any,
+        range_key: Optional[Any] = None,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> bool:
+        """
+        Verifica se um item existe.
+        """
+        return False
+
+    @abstractmethod
+    async def insert(self, model_instance: T) -> T:
+        """
+        Insere um novo item e retorna a instância inserida.
+        """
+        return model_instance
+
+    @abstractmethod
+    async def update(
+        self,
+        model_instance: T,
+        hash_key_name: Optional[str] = None,
+        range_key_name: Optional[str] = None,
+        consistent_read: bool = False
+    ) -> T:
+        """
+        Atualiza um item existente e retorna a instância atualizada.
+        """
+        return model_instance
+
+    @abstractmethod
+    async def upsert(
+        self,
+        model_instance: T,
+        hash_key_name: Optional[str] = None,
+        range_key_name: Optional[str] = None,
+        consistent_read: bool = False
+    ) -> T:
+        """
+        Insere ou atualiza um item (upsert) e retorna a instância resultante.
+        """
+        return model_instance
+
+    @abstractmethod
+    async def delete(self, model: Type[T], hash_key: Any, range_key: Optional[Any] = None) -> None:
+        """
+        Remove um item pelo hash_key e range_key.
+        """
+        pass
+
+    @abstractmethod
+    def query(
+        self,
+        model_cls: Type[T],
+        hash_key_value: Optional[Any] = None,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Condition] = None,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        use_scan_if_missing_hash: bool = False,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> AsyncIterator[T]:
+        """
+        Consulta itens por hash_key e range_key ou scan via condição.
+        """
+        pass
+
+    @abstractmethod
+    def query_index(
+        self,
+        model_cls: Type[T],
+        index_name: str,
+        hash_key_value: Optional[Any] = None,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Condition] = None,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        use_scan_if_missing_hash: bool = False,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> AsyncIterator[T]:
+        """
+        Consulta via índice secundário.
+        """
+        pass
+
+    @abstractmethod
+    def scan(
+        self,
+        model: Type[T],
+        filter_condition: Optional[Condition] = None,
+        limit: Optional[int] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[List[Any]] = None
+    ) -> AsyncIterator[T]:
+        """
+        Escaneia itens com filtro opcional.
+        """
+        pass
+
+    @abstractmethod
+    def batch_get(
+        self,
+        model: Type[T],
+        keys: List[Union[Any, tuple]],
+        consistent_read: bool = True,
+        attributes_to_get: Optional[List[Any]] = None,
+        max_retries: int = 8,
+        base_delay: float = 0.05,
+        max_delay: float = 5.0
+    ) -> AsyncIterator[T]:
+        """
+        Busca múltiplos itens por lote.
+        """
+        pass
@@ -0,0 +1,280 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from pynamodb.models import Model as PynamoModel
+from pynamodb.pagination import ResultIterator
+
+logger = logging.getLogger(__name__)
+
+REFUSE = "refuse"
+WARN = "warn"
+CAP = "cap"
+PARALLELIZE = "parallelize"
+POLICIES = (REFUSE, WARN, CAP, PARALLELIZE)
+
+# Um scan lê até 1 MB por página; cada 4 KB lidos custam 1 RCU (0,5 em leitura eventual).
+PAGE_BYTES = 1024 * 1024
+READ_UNIT_BYTES = 4096
+# Tamanho médio assumido quando o DescribeTable traz a contagem de itens mas não o tamanho.
+DEFAULT_ITEM_BYTES = 1024
+
+
+class ScanRefusedError(ValueError):
+    """
+    Scan de fallback recusado pela política do ScanGuard.
+    """
+
+    def __init__(self, estimate: "ScanEstimate", operation: str) -> None:
+        self.estimate = estimate
+        super().__init__(
+            f"{operation}: scan de fallback recusado em {estimate.target} "
+            f"(~{estimate.item_count} itens, ~{estimate.read_units:.0f} RCU estimadas). "
+            "Informe a chave hash ou use um índice."
+        )
+
+
+@dataclass
+class ScanEstimate:
+    """
+    Custo projetado de um scan completo, a partir dos contadores do DescribeTable.
+
+    O DynamoDB atualiza ItemCount e TableSizeBytes aproximadamente a cada seis horas, então
+    a estimativa serve para ordem de grandeza, não para cobrança exata.
+    """
+    table_name: str
+    index_name: Optional[str]
+    item_count: int
+    size_bytes: int
+    read_units: float
+    pages: int
+
+    @property
+    def target(self) -> str:
+        return f"{self.table_name}/{self.index_name}" if self.index_name else self.table_name
+
+
+@dataclass
+class ScanDecision:
+    """
+    O que fazer com um scan de fallback: ``action`` é WARN (seguir normalmente, com log),
+    CAP (parar após ``max_pages`` páginas) ou PARALLELIZE (scan paralelo com ``segments``).
+    ``action`` None indica scan dentro do orçamento.
+    """
+    estimate: ScanEstimate
+    action: Optional[str] = None
+    max_pages: Optional[int] = None
+    segments: int = 1
+
+
+@dataclass
+class ScanFallbackStats:
+    """
+    Contadores de scans de fallback de uma tabela (ou índice).
+    """
+    fallbacks: int = 0
+    refused: int = 0
+    warned: int = 0
+    capped: int = 0
+    parallelized: int = 0
+    estimated_read_units: float = 0.0
+    consumed_read_units: float = 0.0
+
+
+def estimate_scan(
+    description: Dict[str, Any],
+    index_name: Optional[str] = None,
+    consistent_read: bool = False,
+    average_item_bytes: int = DEFAULT_ITEM_BYTES
+) -> ScanEstimate:
+    """
+    Projeta o custo de um scan completo da tabela ou de um índice.
+
+    :param description: Resposta do DescribeTable (``Model.describe_table()``).
+    :param index_name: GSI/LSI a escanear, se aplicável.
+    :param consistent_read: Leitura consistente (custo dobrado).
+    :param average_item_bytes: Tamanho por item usado quando o tamanho total não é informado.
+    :return: ScanEstimate.
+    """
+    item_count = description.get("ItemCount", 0)
+    size_bytes = description.get("TableSizeBytes", 0)
+    if index_name is not None:
+        indexes = description.get("GlobalSecondaryIndexes", []) + description.get("LocalSecondaryIndexes", [])
+        for index in indexes:
+            if index["IndexName"] == index_name:
+                item_count = index.get("ItemCount", 0)
+                size_bytes = index.get("IndexSizeBytes", 0)
+                break
+    if not size_bytes and item_count:
+        size_bytes = item_count * average_item_bytes
+    factor = 1.0 if consistent_read else 0.5
+    return ScanEstimate(
+        table_name=description.get("TableName", ""),
+        index_name=index_name,
+        item_count=item_count,
+        size_bytes=size_bytes,
+        read_units=max(1, math.ceil(size_bytes / READ_UNIT_BYTES)) * factor,
+        pages=max(1, math.ceil(size_bytes / PAGE_BYTES))
+    )
+
+
+class ScanGuard:
+    """
+    Proteção contra scans completos disparados por ``use_scan_if_missing_hash``.
+
+    Antes de cada scan de fallback (em query, query_index e flexible_query), estima o custo
+    pelo DescribeTable e, se passar de ``max_read_units``, aplica a política:
+
+    - "refuse": lança ScanRefusedError;
+    - "warn": registra um aviso no logger ``repository.scan_guard`` e segue;
+    - "cap": lê no máximo ``max_pages`` páginas (por padrão, o que cabe no orçamento); o
+      ``continuation_token`` do resultado permite continuar depois;
+    - "parallelize": troca por um scan paralelo com ``segments`` segmentos. Como o scan
+      paralelo não retoma de um token nem projeta atributos, essas chamadas caem
+      explicitamente em "warn" (com log) e são contadas como ``warned``.
+
+    ``stats()`` conta, por tabela, os fallbacks, as decisões e as RCUs estimadas e consumidas
+    (as consumidas só nos scans sequenciais).
+    """
+
+    def __init__(
+        self,
+        policy: str = WARN,
+        max_read_units: Optional[float] = None,
+        max_pages: Optional[int] = None,
+        segments: int = 4,
+        average_item_bytes: int = DEFAULT_ITEM_BYTES,
+        cache_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        :param policy: "refuse", "warn", "cap" ou "parallelize".
+        :param max_read_units: Orçamento de RCU por scan; None aplica a política a todo fallback.
+        :param max_pages: Páginas lidas na política "cap" (padrão: derivado do orçamento).
+        :param segments: Segmentos na política "parallelize".
+        :param average_item_bytes: Tamanho por item quando o DescribeTable não informa o tamanho.
+        :param cache_ttl: Segundos de reaproveitamento do DescribeTable por tabela.
+        :param clock: Relógio monotônico (injetável para testes).
+        :raises ValueError: Se a política for inválida.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy inválida: {policy!r}. Use um de {POLICIES}.")
+        self.policy = policy
+        self.max_read_units = max_read_units
+        self.max_pages = max_pages
+        self.segments = segments
+        self._average_item_bytes = average_item_bytes
+        self._cache_ttl = cache_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._descriptions: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._stats: Dict[str, ScanFallbackStats] = {}
+
+    def estimate(self, model: Type[PynamoModel], index_name: Optional[str] = None, consistent_read: bool = False) -> ScanEstimate:
+        """
+        Custo projetado de um scan completo (DescribeTable em cache por ``cache_ttl``).
+        """
+        table_name = model.Meta.table_name
+        now = self._clock()
+        cached = self._descriptions.get(table_name)
+        if cached is None or now - cached[0] > self._cache_ttl:
+            cached = (now, model.describe_table())
+            with self._lock:
+                self._descriptions[table_name] = cached
+        return estimate_scan(cached[1], index_name, consistent_read, self._average_item_bytes)
+
+    def check(
+        self,
+        model: Type[PynamoModel],
+        operation: str,
+        index_name: Optional[str] = None,
+        consistent_read: bool = False,
+        can_parallelize: bool = True
+    ) -> ScanDecision:
+        """
+        Decide o destino de um scan de fallback e atualiza os contadores.
+
+        :param can_parallelize: False quando a chamada exige scan sequencial (token de
+            continuação ou projeção); a política "parallelize" vira "warn" nesse caso.
+        :raises ScanRefusedError: Com a política "refuse" e custo acima do orçamento.
+        :return: ScanDecision.
+        """
+        estimate = self.estimate(model, index_name, consistent_read)
+        decision = ScanDecision(estimate)
+        if self.max_read_units is None or estimate.read_units > self.max_read_units:
+            decision.action = self.policy
+        if decision.action == PARALLELIZE and not can_parallelize:
+            logger.warning(
+                "%s: scan paralelo indisponível com token de continuação ou projeção em %s; "
+                "seguindo com scan sequencial",
+                operation, estimate.target
+            )
+            decision.action = WARN
+
+        with self._lock:
+            stats = self._stats.setdefault(estimate.target, ScanFallbackStats())
+            stats.fallbacks += 1
+            stats.estimated_read_units += estimate.read_units
+            if decision.action == REFUSE:
+                stats.refused += 1
+            elif decision.action == WARN:
+                stats.warned += 1
+            elif decision.action == CAP:
+                stats.capped += 1
+            elif decision.action == PARALLELIZE:
+                stats.parallelized += 1
+
+        if decision.action == REFUSE:
+            raise ScanRefusedError(estimate, operation)
+        if decision.action == WARN:
+            logger.warning(
+                "%s: scan de fallback em %s (~%d itens, ~%.0f RCU estimadas)",
+                operation, estimate.target, estimate.item_count, estimate.read_units
+            )
+        elif decision.action == CAP:
+            decision.max_pages = self.max_pages or self._pages_in_budget(consistent_read)
+        elif decision.action == PARALLELIZE:
+            decision.segments = self.segments
+        return decision
+
+    def _pages_in_budget(self, consistent_read: bool) -> int:
+        if self.max_read_units is None:
+            return 1
+        units_per_page = PAGE_BYTES / READ_UNIT_BYTES * (1.0 if consistent_read else 0.5)
+        return max(1, int(self.max_read_units // units_per_page))
+
+    def meter(self, results: ResultIterator, decision: ScanDecision) -> ResultIterator:
+        """
+        Soma a capacidade consumida pelo scan e, na política "cap", encerra a leitura após
+        ``max_pages`` páginas (o ``last_evaluated_key`` continua apontando para a próxima).
+        """
+        page_iter = results.page_iter
+        operation = page_iter._operation
+        target = decision.estimate.target
+        pages = [0]
+
+        def fetch_page(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            if decision.max_pages is not None and pages[0] >= decision.max_pages:
+                # Propaga pelo PageIterator e encerra o ResultIterator sem perder a chave.
+                raise StopIteration
+            page = operation(*args, **kwargs)
+            pages[0] += 1
+            units = page.get("ConsumedCapacity", {}).get("CapacityUnits", 0.0)
+            with self._lock:
+                self._stats.setdefault(target, ScanFallbackStats()).consumed_read_units += units
+            return page
+
+        # O PageIterator usa _operation.__self__ para descobrir os nomes das chaves.
+        fetch_page.__self__ = operation.__self__  # type: ignore[attr-defined]
+        page_iter._operation = fetch_page
+        return results
+
+    def stats(self) -> Dict[str, ScanFallbackStats]:
+        """
+        Cópia dos contadores, com chaves como ``"customers"`` ou ``"customers/idx"``.
+        """
+        with self._lock:
+            return {target: ScanFallbackStats(**vars(s)) for target, s in self._stats.items()}
@@ -0,0 +1,65 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """
+    Chamada em andamento: o resultado (ou exceção) é compartilhado com quem aguarda.
+    """
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    Enquanto uma chamada para ``key`` está em andamento, as demais threads com a mesma chave
+    aguardam e recebem o mesmo resultado (ou a mesma exceção). Chamadas posteriores à
+    conclusão executam de novo: não há cache, apenas deduplicação do que está em voo.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Executa ``fn`` ou aguarda a execução em andamento para a mesma chave.
+
+        :param key: Identidade da chamada.
+        :param fn: Função a executar.
+        :return: Tupla (resultado, compartilhado). ``compartilhado`` é True para quem
+            recebeu o resultado de outra thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
@@ -0,0 +1,199 @@
+import asyncio
+import os
+
+import pytest
+from moto.server import ThreadedMotoServer
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.exceptions import DoesNotExist, GetError
+from pynamodb.expressions.condition import BeginsWith
+from pynamodb.expressions.operand import Path, Value
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
+from pynamodb.models import Model
+
+from repository.async_repository import AsyncDynamoRepository
+
+MOTO_PORT = 5123
+MOTO_HOST = f"http://127.0.0.1:{MOTO_PORT}"
+
+
+# --- Modelo de Teste ---
+class TenantIdIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "tenant_id_index"
+        projection = AllProjection()
+        read_capacity_units = 1
+        write_capacity_units = 1
+
+    tenant_id = UnicodeAttribute(hash_key=True)
+
+
+class AsyncCustomerModel(Model):
+    class Meta:
+        table_name = "async_customers"
+        region = "us-east-1"
+        host = MOTO_HOST
+
+    customer_id = UnicodeAttribute(hash_key=True)
+    tenant_id = UnicodeAttribute(range_key=True)
+    name = UnicodeAttribute()
+    email = UnicodeAttribute(null=True)
+    status = UnicodeAttribute(null=True)
+
+    tenant_id_index = TenantIdIndex()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def moto_server():
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    server = ThreadedMotoServer(port=MOTO_PORT, verbose=False)
+    server.start()
+    AsyncCustomerModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+    yield
+    server.stop()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def create_customer(i: int) -> AsyncCustomerModel:
+    return AsyncCustomerModel(
+        customer_id=f"C{i:04d}",
+        tenant_id=f"T{i % 3}",
+        name=f"User {i}",
+        email=f"user{i}@example.com",
+        status="active" if i % 2 == 0 else "inactive"
+    )
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_insert_get_exists_and_delete():
+    async def scenario():
+        async with AsyncDynamoRepository.from_model(AsyncCustomerModel) as repo:
+            customer = create_customer(1)
+            await repo.insert(customer)
+
+            fetched = await repo.get(AsyncCustomerModel, customer.customer_id, customer.tenant_id)
+            assert fetched.name == customer.name
+            assert await repo.exists(AsyncCustomerModel, customer.customer_id, customer.tenant_id)
+            assert await repo.get(AsyncCustomerModel, None) is None
+
+            await repo.delete(AsyncCustomerModel, customer.customer_id, customer.tenant_id)
+            assert not await repo.exists(AsyncCustomerModel, customer.customer_id, customer.tenant_id)
+
+    run(scenario())
+
+
+def test_update_and_upsert():
+    async def scenario():
+        async with AsyncDynamoRepository.from_model(AsyncCustomerModel) as repo:
+            customer = create_customer(2)
+            with pytest.raises(DoesNotExist):
+                await repo.update(customer)
+
+            upserted = await repo.upsert(customer)
+            assert upserted.email == customer.email
+
+            partial = AsyncCustomerModel(customer.customer_id, customer.tenant_id, name="Async Update")
+            updated = await repo.update(partial)
+            assert updated.name == "Async Update"
+            assert updated.email == customer.email
+
+            # None remove o atributo, como no DynamoRepository, em vez de gravar NULL.
+            partial.email = None
+            await repo.update(partial)
+            raw = AsyncCustomerModel._get_connection().get_item(customer.customer_id, customer.tenant_id)
+            assert "email" not in raw["Item"]
+            assert (await repo.get(AsyncCustomerModel, customer.customer_id, customer.tenant_id)).email is None
+
+    run(scenario())
+
+
+def test_query_query_index_and_scan():
+    async def scenario():
+        async with AsyncDynamoRepository.from_model(AsyncCustomerModel) as repo:
+            customers = [create_customer(i) for i in range(10, 16)]
+            for c in customers:
+                c.tenant_id = "TASYNC"
+                await repo.insert(c)
+
+            by_hash = await collect(repo.query(AsyncCustomerModel, customers[0].customer_id))
+            assert [r.tenant_id for r in by_hash] == ["TASYNC"]
+
+            by_index = await collect(repo.query_index(AsyncCustomerModel, "tenant_id_index", hash_key_value="TASYNC"))
+            assert len(by_index) == 6
+
+            limited = await collect(repo.query_index(
+                AsyncCustomerModel, "tenant_id_index", hash_key_value="TASYNC", limit=4
+            ))
+            assert len(limited) == 4
+
+            cond = BeginsWith(Path("tenant_id"), Value("TASY"))
+            fallback = await collect(repo.query(AsyncCustomerModel, range_key_condition=cond, use_scan_if_missing_hash=True))
+            assert len(fallback) == 6
+
+            inactive = await collect(repo.scan(AsyncCustomerModel, filter_condition=AsyncCustomerModel.status == "inactive"))
+            assert inactive and all(r.status == "inactive" for r in inactive)
+
+            with pytest.raises(ValueError):
+                repo.query(AsyncCustomerModel)
+
+    run(scenario())
+
+
+def test_batch_get():
+    async def scenario():
+        async with AsyncDynamoRepository.from_model(AsyncCustomerModel) as repo:
+            customers = [create_customer(i) for i in range(20, 23)]
+            for c in customers:
+                await repo.insert(c)
+
+            keys = [(c.customer_id, c.tenant_id) for c in customers] + [("NOTFOUND", "T0")]
+            results = await collect(repo.batch_get(AsyncCustomerModel, keys))
+            assert sorted(r.customer_id for r in results) == [c.customer_id for c in customers]
+
+    run(scenario())
+
+
+def test_batch_get_stops_retrying_unprocessed_keys():
+    async def scenario():
+        async with AsyncDynamoRepository.from_model(AsyncCustomerModel) as repo:
+            client = await repo._get_client()
+            calls = []
+
+            async def always_unprocessed(RequestItems):
+                calls.append(RequestItems)
+                return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+            client.batch_get_item = always_unprocessed
+            keys = [("C0040", "T1"), ("C0041", "T2")]
+            with pytest.raises(GetError, match="UnprocessedKeys"):
+                await collect(repo.batch_get(AsyncCustomerModel, keys, max_retries=2, base_delay=0.001, max_delay=0.001))
+            assert len(calls) == 3
+
+    run(scenario())
+
+
+def test_projection():
+    async def scenario():
+        async with AsyncDynamoRepository.from_model(AsyncCustomerModel) as repo:
+            customer = create_customer(30)
+            await repo.insert(customer)
+
+            partial = await repo.get(AsyncCustomerModel, customer.customer_id, customer.tenant_id, attributes_to_get=["name"])
+            assert partial.name == customer.name and partial.email is None
+            assert await repo.exists(AsyncCustomerModel, customer.customer_id, customer.tenant_id)
+
+            queried = await collect(repo.query(AsyncCustomerModel, customer.customer_id, attributes_to_get=["email"]))
+            assert queried[0].email == customer.email and queried[0].name is None
+
+            batch = await collect(repo.batch_get(
+                AsyncCustomerModel, [(customer.customer_id, customer.tenant_id)], attributes_to_get=["status"]
+            ))
+            assert batch[0].status == customer.status and batch[0].name is None
+
+    run(scenario())
@@ -0,0 +1,31 @@
+from benchmarks import cold_start, model_conversion
+from benchmarks.run_benchmarks import OPERATIONS, compare, run
+
+
+def test_benchmark_run_produces_comparable_json():
+    document = run(item_counts=[20], item_sizes=[64], iterations=2, scan_iterations=1, warmup=0)
+
+    results = document["results"]
+    assert [r["operation"] for r in results] == list(OPERATIONS)
+    assert all(r["ops_per_sec"] > 0 and r["p99_ms"] >= r["p50_ms"] for r in results)
+    assert document["meta"]["backend"] == "moto"
+    assert compare(document, document) == []
+
+    slower = {"results": [dict(r, ops_per_sec=r["ops_per_sec"] / 2) for r in results]}
+    assert len(compare(document, slower)) == len(results)
+
+
+def test_model_conversion_microbenchmarks():
+    document = model_conversion.run(number=20, repeat=1)
+
+    cases = {r["case"]: r for r in document["results"]}
+    assert set(cases) == {f"{m}/{c}" for m in ("narrow", "wide") for c in ("from_raw_data", "raw_dict", "serialize")}
+    assert all(r["us_per_item"] > 0 for r in cases.values())
+
+
+def test_cold_start_benchmark_measures_fresh_processes():
+    document = cold_start.run(runs=1, modes=["warm_up"])
+
+    result, = document["results"]
+    assert result["mode"] == "warm_up" and result["runs"] == 1
+    assert all(result[f"{metric}_ms"]["median"] > 0 for metric in cold_start.METRICS)
@@ -1,16 +1,33 @@
+import gzip
+import io
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
 import pytest
 from datetime import datetime, timezone
 from pynamodb import *
 from moto import mock_aws
 from pynamodb.models import Model
-from pynamodb.attributes import UnicodeAttribute, UTCDateTimeAttribute
-from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
-from pynamodb.exceptions import DoesNotExist
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute, UTCDateTimeAttribute, VersionAttribute
+from pynamodb.indexes import GlobalSecondaryIndex, LocalSecondaryIndex, AllProjection
+from pynamodb.exceptions import DoesNotExist, PutError, UpdateError
 from pynamodb.expressions.condition import Between, BeginsWith
 from pynamodb.expressions.operand import Path, Value
 from pynamodb.expressions.condition import Condition
 
 from repository.base_repository import DynamoRepository
+from repository.conditional import is_conflict
+from repository.connection import ConnectionManager, ConnectionSettings
+from repository.model_metadata import clear_metadata, model_metadata
+from repository.metrics import CompositeHook, MetricsRegistry, StatsDHook
+from repository.profiling import Profiler
+from repository.query_planner import GET, INDEX_QUERY, QUERY, SCAN
+from repository.rate_limit import CapacityLimiter, TokenBucket
+from repository.raw import decode_value
+from repository.scan_guard import CAP, ScanDecision, ScanGuard, ScanRefusedError, estimate_scan
 
 # --- Modelo de Teste ---
 class TenantIdIndex(GlobalSecondaryIndex):
@@ -391,3 +408,1395 @@ def test_flexible_query_scan_if_missing_hash():
     ))
 
     assert any(r.customer_id == customer.customer_id for r in results)
+
+
+def test_plan_query_picks_cheapest_access_path():
+    customers = [create_customer(i) for i in range(310, 316)]
+    for c in customers:
+        DynamoRepository.insert(c)
+    target = customers[0]
+
+    plan = DynamoRepository.plan_query(CustomerModel, [CustomerModel.customer_id == target.customer_id, CustomerModel.tenant_id == target.tenant_id])
+    assert plan.access == GET
+    found = list(DynamoRepository.flexible_query(CustomerModel, where=[
+        CustomerModel.customer_id == target.customer_id, CustomerModel.tenant_id == target.tenant_id
+    ]))
+    assert [c.customer_id for c in found] == [target.customer_id]
+
+    plan = DynamoRepository.plan_query(CustomerModel, [(CustomerModel.customer_id == target.customer_id) & (CustomerModel.status == "active")])
+    assert plan.access == QUERY and plan.hash_key_value == target.customer_id
+    assert "status" in str(plan.filter_condition)
+
+    plan = DynamoRepository.plan_query(CustomerModel, [CustomerModel.tenant_id == "T1", CustomerModel.status == "active"])
+    assert plan.access == INDEX_QUERY and plan.index_name in ("tenant_id_index", "created_at_index")
+    assert "tabela: sem igualdade em customer_id" in plan.explain()
+    since = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    plan = DynamoRepository.plan_query(CustomerModel, [CustomerModel.tenant_id == "T1", CustomerModel.created_at >= since])
+    assert (plan.index_name, plan.filter_condition) == ("created_at_index", None)
+    assert "Query no índice created_at_index" in plan.explain()
+    assert "created_at_index (GSI): usa hash + range" in plan.explain()
+    found = list(DynamoRepository.flexible_query(CustomerModel, where=[CustomerModel.tenant_id == "T1", CustomerModel.status == "active"]))
+    expected = [c for c in customers if c.tenant_id == "T1" and c.status == "active"]
+    assert {c.customer_id for c in found} >= {c.customer_id for c in expected}
+    assert all(c.tenant_id == "T1" and c.status == "active" for c in found)
+
+
+def test_plan_query_scan_is_last_resort():
+    where = [CustomerModel.email == "user320@example.com"]
+    DynamoRepository.insert(create_customer(320))
+
+    with pytest.raises(ValueError, match="caminhos avaliados"):
+        DynamoRepository.plan_query(CustomerModel, where)
+    # GSIs não atendem leitura consistente.
+    with pytest.raises(ValueError, match="leitura consistente"):
+        DynamoRepository.plan_query(CustomerModel, [CustomerModel.tenant_id == "T1"], consistent_read=True)
+
+    plan = DynamoRepository.plan_query(CustomerModel, where, use_scan_if_missing_hash=True, segments=2)
+    assert plan.access == SCAN and "Scan paralelo" in plan.explain()
+    found = list(DynamoRepository.flexible_query(CustomerModel, where=where, use_scan_if_missing_hash=True, segments=2))
+    assert [c.customer_id for c in found] == ["C0320"]
+
+
+def test_plan_query_prefers_lsi_with_range_predicate():
+    class ScoreIndex(LocalSecondaryIndex):
+        class Meta:
+            index_name = "score_index"
+            projection = AllProjection()
+
+        player = UnicodeAttribute(hash_key=True)
+        score = NumberAttribute(range_key=True)
+
+    class GameModel(Model):
+        class Meta:
+            table_name = "games"
+            region = "us-east-1"
+
+        player = UnicodeAttribute(hash_key=True)
+        game_id = UnicodeAttribute(range_key=True)
+        score = NumberAttribute()
+        score_index = ScoreIndex()
+
+    GameModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+    for i in range(5):
+        GameModel("P1", f"G{i}", score=i * 10).save()
+
+    where = [GameModel.player == "P1", GameModel.score >= 25]
+    plan = DynamoRepository.plan_query(GameModel, where, consistent_read=True)
+    assert (plan.access, plan.index_name, plan.filter_condition) == (INDEX_QUERY, "score_index", None)
+    found = list(DynamoRepository.flexible_query(GameModel, where=where, consistent_read=True))
+    assert [g.game_id for g in found] == ["G3", "G4"]
+
+
+def test_model_metadata_is_cached_and_extracts_keys():
+    clear_metadata(CustomerModel)
+    metadata = model_metadata(CustomerModel)
+    assert model_metadata(CustomerModel) is metadata
+    assert (metadata.hash_key_name, metadata.range_key_name) == ("customer_id", "tenant_id")
+    assert metadata.key_attr_names == ("customer_id", "tenant_id")
+    hash_attr, range_attr = metadata.key_attributes
+    assert hash_attr is CustomerModel.customer_id and range_attr is CustomerModel.tenant_id
+    assert metadata.python_names["customer_id"] == "customer_id"
+    assert set(metadata.non_key_attributes) == {"name", "email", "status", "created_at"}
+    assert {gsi.name for gsi in metadata.stored_keys.gsis} == {"tenant_id_index", "created_at_index"}
+
+    customer = create_customer(350)
+    assert metadata.instance_keys(customer) == (customer.customer_id, customer.tenant_id)
+    DynamoRepository.insert(customer)
+
+    customer.name = "Renomeado"
+    DynamoRepository.update(customer, "customer_id", "tenant_id")
+    customer.status = "inactive"
+    DynamoRepository.upsert(customer, "customer_id", "tenant_id", single_request=True)
+    stored = DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+    assert (stored.name, stored.status) == ("Renomeado", "inactive")
+
+
+def test_estimate_scan_projects_read_units():
+    description = {
+        "TableName": "customers", "ItemCount": 1000, "TableSizeBytes": 8 * 1024 * 1024,
+        "GlobalSecondaryIndexes": [{"IndexName": "idx", "ItemCount": 10, "IndexSizeBytes": 0}],
+    }
+    table = estimate_scan(description)
+    assert (table.read_units, table.pages) == (1024, 8)
+    assert estimate_scan(description, consistent_read=True).read_units == 2048
+    index = estimate_scan(description, index_name="idx", average_item_bytes=4096)
+    assert (index.target, index.item_count, index.read_units) == ("customers/idx", 10, 5)
+
+
+@pytest.fixture
+def scan_guard():
+    def configure(**kwargs):
+        guard = ScanGuard(**kwargs)
+        DynamoRepository.configure_scan_guard(guard)
+        return guard
+    yield configure
+    DynamoRepository.configure_scan_guard(None)
+
+
+def test_scan_guard_refuses_and_warns(scan_guard, caplog):
+    for i in range(330, 334):
+        DynamoRepository.insert(create_customer(i))
+    by_tenant = CustomerModel.tenant_id == "T1"
+
+    guard = scan_guard(policy="refuse", max_read_units=0.1)
+    with pytest.raises(ScanRefusedError, match="customers"):
+        DynamoRepository.query(CustomerModel, range_key_condition=by_tenant, use_scan_if_missing_hash=True)
+    with pytest.raises(ScanRefusedError):
+        list(DynamoRepository.flexible_query(CustomerModel, where=[CustomerModel.email == "x"], use_scan_if_missing_hash=True))
+    assert guard.stats()["customers"].refused == 2
+    # Dentro do orçamento o scan segue normalmente.
+    guard.max_read_units = 1000
+    assert len(list(DynamoRepository.query(CustomerModel, range_key_condition=by_tenant, use_scan_if_missing_hash=True))) >= 1
+
+    guard = scan_guard(policy="warn")
+    with caplog.at_level("WARNING", logger="repository.scan_guard"):
+        found = list(DynamoRepository.query_index(
+            CustomerModel, "tenant_id_index", range_key_condition=by_tenant, use_scan_if_missing_hash=True
+        ))
+    assert found and all(c.tenant_id == "T1" for c in found)
+    assert "query_index: scan de fallback em customers/tenant_id_index" in caplog.text
+    stats = guard.stats()["customers/tenant_id_index"]
+    assert (stats.fallbacks, stats.warned) == (1, 1)
+    assert stats.estimated_read_units > 0 and stats.consumed_read_units > 0
+
+
+def test_scan_guard_caps_pages_and_parallelizes(scan_guard):
+    for i in range(340, 346):
+        DynamoRepository.insert(create_customer(i))
+    guard = ScanGuard(policy="cap", max_pages=2)
+    estimate = guard.estimate(CustomerModel)
+    results = guard.meter(CustomerModel.scan(page_size=2), ScanDecision(estimate, CAP, max_pages=2))
+    assert len(list(results)) == 4
+    assert results.last_evaluated_key is not None
+
+    guard = scan_guard(policy="parallelize", segments=3)
+    by_tenant = CustomerModel.tenant_id == "T2"
+    found = list(DynamoRepository.query(CustomerModel, range_key_condition=by_tenant, use_scan_if_missing_hash=True, as_dict=True))
+    expected = list(CustomerModel.scan(filter_condition=by_tenant))
+    assert sorted(r["customer_id"] for r in found) == sorted(c.customer_id for c in expected)
+    assert guard.stats()["customers"].parallelized == 1
+
+
+def test_scan_guard_parallelize_falls_back_to_warn_for_sequential_scans(scan_guard, caplog):
+    for i in range(346, 349):
+        DynamoRepository.insert(create_customer(i))
+    guard = scan_guard(policy="parallelize", segments=3)
+    by_tenant = CustomerModel.tenant_id == "T1"
+
+    with caplog.at_level("WARNING", logger="repository.scan_guard"):
+        found = list(DynamoRepository.query(
+            CustomerModel,
+            range_key_condition=by_tenant,
+            use_scan_if_missing_hash=True,
+            attributes_to_get=[CustomerModel.customer_id, CustomerModel.tenant_id]
+        ))
+    assert found and all(c.tenant_id == "T1" for c in found)
+    assert "scan paralelo indisponível" in caplog.text
+    stats = guard.stats()["customers"]
+    assert (stats.fallbacks, stats.warned, stats.parallelized) == (1, 1, 0)
+    assert stats.consumed_read_units > 0
+
+
+def test_upsert_single_request_inserts_when_missing():
+    customer = create_customer(400)
+    result = DynamoRepository.upsert(
+        customer,
+        hash_key_name="customer_id",
+        range_key_name="tenant_id",
+        single_request=True
+    )
+
+    assert result.customer_id == customer.customer_id
+    stored = DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+    assert stored is not None
+    assert stored.email == customer.email
+
+
+def test_upsert_single_request_merges_existing_item():
+    customer = create_customer(401)
+    DynamoRepository.insert(customer)
+
+    partial = CustomerModel(customer.customer_id, customer.tenant_id, name="Single Request")
+    result = DynamoRepository.upsert(
+        partial,
+        hash_key_name="customer_id",
+        range_key_name="tenant_id",
+        single_request=True
+    )
+
+    # UpdateItem devolve o item completo (ALL_NEW), preservando os atributos não enviados
+    assert result.name == "Single Request"
+    assert result.email == customer.email
+
+
+def test_upsert_single_request_with_only_keys():
+    customer = create_customer(402)
+    DynamoRepository.insert(customer)
+
+    DynamoRepository.upsert(
+        CustomerModel(customer.customer_id, customer.tenant_id),
+        hash_key_name="customer_id",
+        range_key_name="tenant_id",
+        single_request=True
+    )
+
+    stored = DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+    assert stored.name == customer.name
+
+
+def test_build_actions_with_model_serializes_values():
+    actions = DynamoRepository.build_actions({"name": "Test", "email": None}, CustomerModel)
+    assert [type(a).__name__ for a in actions] == ["SetAction", "RemoveAction"]
+
+
+def test_update_fields_sends_only_given_attributes():
+    customer = create_customer(410)
+    DynamoRepository.insert(customer)
+
+    updated = DynamoRepository.update_fields(
+        CustomerModel, customer.customer_id, customer.tenant_id, {"status": "blocked"}
+    )
+
+    assert updated.status == "blocked"
+    assert updated.name == customer.name
+
+
+def test_update_fields_with_failed_condition():
+    from pynamodb.exceptions import UpdateError
+
+    with pytest.raises(UpdateError):
+        DynamoRepository.update_fields(
+            CustomerModel, "NOEXIST", "T0", {"name": "x"},
+            condition=CustomerModel.customer_id.exists()
+        )
+
+
+def test_update_fields_empty_raises():
+    with pytest.raises(ValueError):
+        DynamoRepository.update_fields(CustomerModel, "C0001", "T1", {})
+
+
+def test_update_changed_sends_only_dirty_attributes():
+    customer = create_customer(411)
+    DynamoRepository.insert(customer)
+
+    loaded = DynamoRepository.track_changes(
+        DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+    )
+    assert DynamoRepository.changed_attributes(loaded) == {}
+
+    loaded.name = "Dirty Name"
+    assert DynamoRepository.changed_attributes(loaded) == {"name": "Dirty Name"}
+
+    DynamoRepository.update_changed(loaded)
+    assert DynamoRepository.changed_attributes(loaded) == {}
+
+    stored = DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+    assert stored.name == "Dirty Name"
+    assert stored.email == customer.email
+
+
+def test_changed_attributes_requires_tracking():
+    with pytest.raises(ValueError):
+        DynamoRepository.changed_attributes(create_customer(412))
+
+
+def test_batch_write_puts_and_deletes_in_chunks():
+    customers = [create_customer(i) for i in range(500, 560)]
+    report = DynamoRepository.batch_write(puts=customers, max_workers=3)
+
+    assert report.all_succeeded
+    assert len(report.results) == 60
+    keys = [(c.customer_id, c.tenant_id) for c in customers]
+    assert len(list(DynamoRepository.batch_get(CustomerModel, keys))) == 60
+
+    report = DynamoRepository.batch_write(deletes=customers[:30])
+    assert report.all_succeeded
+    assert [r.operation for r in report.results] == ["delete"] * 30
+    assert len(list(DynamoRepository.batch_get(CustomerModel, keys))) == 30
+
+
+def test_update_and_upsert_infer_keys_from_model():
+    customer = create_customer(590)
+    DynamoRepository.insert(customer)
+    change = CustomerModel(customer_id=customer.customer_id, tenant_id=customer.tenant_id, name="Inferido")
+    updated = DynamoRepository.update(change)
+    assert (updated.name, updated.email) == ("Inferido", customer.email)
+
+    new = create_customer(591)
+    DynamoRepository.upsert(new)
+    assert DynamoRepository.get(CustomerModel, new.customer_id, new.tenant_id).name == new.name
+
+
+def test_update_many_and_upsert_many_group_by_table():
+    class TagModel(Model):
+        class Meta:
+            table_name = "tags"
+            region = "us-east-1"
+
+        tag = UnicodeAttribute(hash_key=True)
+        label = UnicodeAttribute(null=True)
+        color = UnicodeAttribute(null=True)
+
+    TagModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+    existing = [create_customer(i) for i in range(600, 630)]
+    DynamoRepository.batch_write(puts=existing + [TagModel("red", label="Red", color="#f00")])
+
+    # Instâncias parciais: só as chaves e os atributos alterados.
+    partial = [CustomerModel(c.customer_id, c.tenant_id, status="archived") for c in existing]
+    items = partial + [TagModel("red", label="Vermelho"), TagModel("blue", label="Blue"), create_customer(630)]
+    report = DynamoRepository.upsert_many(items, max_workers=3)
+
+    assert report.all_succeeded
+    assert [r.item for r in report.results] == items
+    stored = DynamoRepository.get(CustomerModel, existing[0].customer_id, existing[0].tenant_id)
+    assert (stored.status, stored.email) == ("archived", existing[0].email)
+    assert partial[0].email == existing[0].email
+    red = DynamoRepository.get(TagModel, "red")
+    assert (red.label, red.color) == ("Vermelho", "#f00")
+    assert DynamoRepository.get(TagModel, "blue").label == "Blue"
+
+    report = DynamoRepository.update_many([TagModel("blue", color="#00f"), TagModel("green", label="Green")])
+    assert [r.success for r in report.results] == [True, False]
+    assert report.results[1].error == "Item não existe."
+    assert DynamoRepository.get(TagModel, "green") is None
+    assert DynamoRepository.get(TagModel, "blue").color == "#00f"
+
+    with pytest.raises(ValueError, match="Chave duplicada"):
+        DynamoRepository.upsert_many([TagModel("red"), TagModel("red")])
+
+
+class AccountModel(Model):
+    class Meta:
+        table_name = "accounts"
+        region = "us-east-1"
+
+    account_id = UnicodeAttribute(hash_key=True)
+    balance = NumberAttribute(default=0)
+    owner = UnicodeAttribute(null=True)
+    version = VersionAttribute()
+
+
+def test_insert_if_not_exists_and_conditional_update():
+    customer = create_customer(640)
+    DynamoRepository.insert(customer, if_not_exists=True)
+    with pytest.raises(PutError) as error:
+        DynamoRepository.insert(create_customer(640), if_not_exists=True)
+    assert is_conflict(error.value)
+
+    change = CustomerModel(customer.customer_id, customer.tenant_id, name="Condicional")
+    DynamoRepository.update(change, condition=CustomerModel.status == customer.status)
+    assert DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id).name == "Condicional"
+    with pytest.raises(UpdateError) as error:
+        DynamoRepository.update(change, condition=CustomerModel.status == "nenhum")
+    assert is_conflict(error.value)
+    with pytest.raises(UpdateError):
+        DynamoRepository.update(CustomerModel("C9999", "T0", name="x"), condition=CustomerModel.status == "active")
+
+
+def test_version_attribute_update_without_read_and_retry_on_conflict(monkeypatch):
+    AccountModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+    DynamoRepository.insert(AccountModel("a-1", balance=100, owner="Ana"))
+    with pytest.raises(PutError):
+        DynamoRepository.insert(AccountModel("a-1"))
+
+    first = DynamoRepository.get(AccountModel, "a-1")
+    second = DynamoRepository.get(AccountModel, "a-1")
+    reads = []
+    original_get = AccountModel.get.__func__
+    monkeypatch.setattr(AccountModel, "get", classmethod(lambda cls, *a, **kw: reads.append(a) or original_get(cls, *a, **kw)))
+
+    first.balance = 150
+    assert DynamoRepository.update(first).version == 2
+    assert reads == []
+    second.balance = 90
+    with pytest.raises(UpdateError) as error:
+        DynamoRepository.update(second)
+    assert is_conflict(error.value)
+
+    calls = []
+
+    def withdraw(account):
+        calls.append(account.version)
+        account.balance -= 10
+
+    second = DynamoRepository.get(AccountModel, "a-1")
+    first.balance += 5  # versão 2 -> 3, deixando ``second`` desatualizada
+    DynamoRepository.update(first)
+    reads.clear()
+    result = DynamoRepository.update_with_retry(second, withdraw, base_delay=0)
+    assert calls == [2, 3] and len(reads) == 1
+    stored = DynamoRepository.get(AccountModel, "a-1")
+    assert (stored.balance, stored.version, stored.owner) == (145, 4, "Ana")
+    assert result.version == 4
+
+    with pytest.raises(ValueError, match="VersionAttribute"):
+        DynamoRepository.update_with_retry(create_customer(641), withdraw)
+
+
+def test_batch_write_retries_unprocessed_items(monkeypatch):
+    customers = [create_customer(i) for i in range(570, 573)]
+    connection = CustomerModel._get_connection()
+    original = connection.batch_write_item
+    calls = []
+
+    def flaky_batch_write_item(put_items=None, delete_items=None, **kwargs):
+        calls.append(len(put_items))
+        data = original(put_items=put_items, delete_items=delete_items, **kwargs)
+        if len(calls) == 1:
+            # Devolve o primeiro item como não processado na primeira chamada
+            data["UnprocessedItems"] = {"customers": [{"PutRequest": {"Item": put_items[0]}}]}
+        return data
+
+    monkeypatch.setattr(connection, "batch_write_item", flaky_batch_write_item)
+    report = DynamoRepository.batch_write(puts=customers)
+
+    assert calls == [3, 1]
+    assert report.all_succeeded
+    assert sorted(r.attempts for r in report.results) == [1, 1, 2]
+
+
+def test_batch_write_reports_items_left_unprocessed(monkeypatch):
+    customer = create_customer(580)
+    connection = CustomerModel._get_connection()
+
+    def always_unprocessed(put_items=None, delete_items=None, **kwargs):
+        return {"UnprocessedItems": {"customers": [{"PutRequest": {"Item": i}} for i in put_items]}}
+
+    monkeypatch.setattr(connection, "batch_write_item", always_unprocessed)
+    monkeypatch.setattr("repository.batch_write.time.sleep", lambda _: None)
+    report = DynamoRepository.batch_write(puts=[customer], max_retries=2)
+
+    assert not report.all_succeeded
+    assert report.failed[0].attempts == 3
+    assert report.failed[0].error
+
+
+def test_batch_write_duplicate_keys_raises():
+    customer = create_customer(590)
+    with pytest.raises(ValueError):
+        DynamoRepository.batch_write(puts=[customer, customer])
+
+
+def test_parallel_scan_returns_all_segments():
+    customers = [create_customer(i) for i in range(600, 640)]
+    DynamoRepository.batch_write(puts=customers)
+
+    results = list(DynamoRepository.parallel_scan(CustomerModel, segments=4, workers=2, page_size=5))
+    ids = {r.customer_id for r in results}
+
+    assert {c.customer_id for c in customers} <= ids
+    assert len(results) == len(ids)
+
+
+def test_parallel_scan_with_filter_and_small_queue():
+    customers = [create_customer(i) for i in range(640, 660)]
+    DynamoRepository.batch_write(puts=customers)
+
+    results = list(DynamoRepository.parallel_scan(
+        CustomerModel,
+        filter_condition=CustomerModel.status == "inactive",
+        segments=3,
+        queue_size=1
+    ))
+
+    assert results
+    assert all(r.status == "inactive" for r in results)
+
+
+def test_parallel_scan_stops_early_without_hanging():
+    DynamoRepository.batch_write(puts=[create_customer(i) for i in range(660, 680)])
+
+    stream = DynamoRepository.parallel_scan(CustomerModel, segments=4, queue_size=1)
+    first = next(stream)
+    stream.close()
+
+    assert first is not None
+
+
+def test_parallel_scan_invalid_segments():
+    with pytest.raises(ValueError):
+        list(DynamoRepository.parallel_scan(CustomerModel, segments=0))
+
+
+def test_continuation_token_round_trip():
+    from repository.pagination import decode_continuation_token, encode_continuation_token
+
+    key = {"customer_id": {"S": "C0001"}, "tenant_id": {"S": "T1"}, "blob": {"B": b"\x00\x01"}}
+    token = encode_continuation_token(key)
+
+    assert isinstance(token, str)
+    assert decode_continuation_token(token) == key
+    assert encode_continuation_token(None) is None
+    with pytest.raises(ValueError):
+        decode_continuation_token("not-a-token")
+
+
+def test_scan_resumes_from_continuation_token():
+    customers = [create_customer(i) for i in range(700, 710)]
+    DynamoRepository.batch_write(puts=customers)
+
+    first = DynamoRepository.scan_paginated(CustomerModel, page_size=3, limit=4)
+    first_ids = [r.customer_id for r in first]
+    token = DynamoRepository.continuation_token(first)
+
+    rest_ids = [r.customer_id for r in DynamoRepository.scan(CustomerModel, start_token=token)]
+    all_ids = [r.customer_id for r in DynamoRepository.scan(CustomerModel)]
+
+    assert first_ids + rest_ids == all_ids
+
+
+def test_query_pages_emit_tokens():
+    customers = [create_customer(i) for i in range(710, 716)]
+    for c in customers:
+        c.tenant_id = "TPAGES"
+    DynamoRepository.batch_write(puts=customers)
+
+    pages = list(DynamoRepository.query_pages(
+        CustomerModel, "TPAGES", index_name="tenant_id_index", page_size=4
+    ))
+
+    assert sum(len(p.items) for p in pages) == 6
+    assert pages[0].next_token is not None
+    assert pages[-1].next_token is None
+
+    resumed = list(DynamoRepository.query_index(
+        CustomerModel, "tenant_id_index", hash_key_value="TPAGES", start_token=pages[0].next_token
+    ))
+    assert len(resumed) == 2
+
+
+@pytest.mark.parametrize("store_name", ["file", "sqlite"])
+def test_scan_pages_resumes_from_checkpoint(tmp_path, store_name):
+    from repository.pagination import FileCheckpointStore, SQLiteCheckpointStore
+
+    DynamoRepository.batch_write(puts=[create_customer(i) for i in range(720, 730)])
+    store = (
+        FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+        if store_name == "file" else SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+    )
+    all_ids = [r.customer_id for r in DynamoRepository.scan(CustomerModel)]
+
+    # Primeira execução processa duas páginas e "morre"
+    seen = []
+    pages = DynamoRepository.scan_pages(CustomerModel, page_size=3, checkpoint=store, checkpoint_id="job")
+    for _ in range(2):
+        seen.extend(r.customer_id for r in next(pages).items)
+    pages.close()
+
+    # Só a primeira página foi concluída (a segunda não teve a próxima pedida)
+    assert store.load("job") is not None
+
+    resumed = DynamoRepository.scan_pages(CustomerModel, page_size=3, checkpoint=store, checkpoint_id="job")
+    resumed_ids = [r.customer_id for page in resumed for r in page.items]
+
+    assert seen[:3] + resumed_ids == all_ids
+    assert store.load("job") is None
+
+
+def test_sqlite_checkpoint_store_closes_connections(tmp_path, monkeypatch):
+    import sqlite3
+    from repository.pagination import SQLiteCheckpointStore
+
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.save("job", "token")
+    assert store.load("job") == "token"
+    store.clear("job")
+
+    assert len(opened) == 4
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_scan_pages_checkpoint_requires_id(tmp_path):
+    from repository.pagination import FileCheckpointStore
+
+    with pytest.raises(ValueError):
+        DynamoRepository.scan_pages(CustomerModel, checkpoint=FileCheckpointStore(str(tmp_path / "c.json")))
+
+
+@pytest.fixture
+def item_cache():
+    from repository.cache import ItemCache
+
+    cache = ItemCache(max_size=100, default_ttl=60)
+    DynamoRepository.configure_cache(cache)
+    yield cache
+    DynamoRepository.configure_cache(None)
+
+
+def test_cache_serves_repeated_gets(item_cache):
+    customer = create_customer(800)
+    DynamoRepository.insert(customer)
+
+    first = DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+    second = DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+
+    assert first.name == second.name == customer.name
+    assert first is not second
+    assert item_cache.stats.misses == 1
+    assert item_cache.stats.hits == 1
+
+
+def test_cache_negative_entries_and_invalidation_on_insert(item_cache):
+    customer = create_customer(801)
+
+    assert not DynamoRepository.exists(CustomerModel, customer.customer_id, customer.tenant_id)
+    assert not DynamoRepository.exists(CustomerModel, customer.customer_id, customer.tenant_id)
+    assert item_cache.stats.negative_hits == 1
+
+    DynamoRepository.insert(customer)
+    assert DynamoRepository.exists(CustomerModel, customer.customer_id, customer.tenant_id)
+
+
+def test_cache_invalidated_by_repository_writes(item_cache):
+    customer = create_customer(802)
+    DynamoRepository.insert(customer)
+    DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+
+    DynamoRepository.update_fields(CustomerModel, customer.customer_id, customer.tenant_id, {"name": "Fresh"})
+    assert DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id).name == "Fresh"
+
+    customer.name = "Upserted"
+    DynamoRepository.upsert(customer, "customer_id", "tenant_id")
+    assert DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id).name == "Upserted"
+
+    DynamoRepository.delete(CustomerModel, customer.customer_id, customer.tenant_id)
+    assert DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id) is None
+    assert item_cache.stats.invalidations >= 3
+
+
+def test_cache_ttl_and_lru_eviction():
+    from repository.cache import ItemCache
+
+    now = [0.0]
+    cache = ItemCache(max_size=2, default_ttl=10, model_ttls={CustomerModel: 5}, clock=lambda: now[0])
+    items = [create_customer(i) for i in range(810, 813)]
+    for c in items:
+        cache.put(CustomerModel, c.customer_id, c.tenant_id, c)
+
+    assert cache.stats.evictions == 1
+    assert cache.lookup(CustomerModel, items[0].customer_id, items[0].tenant_id) == (False, None)
+    found, cached = cache.lookup(CustomerModel, items[2].customer_id, items[2].tenant_id)
+    assert found and cached.name == items[2].name
+
+    now[0] = 6.0
+    assert cache.lookup(CustomerModel, items[2].customer_id, items[2].tenant_id) == (False, None)
+
+
+def test_cache_skips_put_after_concurrent_invalidation():
+    from repository.cache import ItemCache
+
+    cache = ItemCache()
+    customer = create_customer(820)
+    generation = cache.generation
+    cache.invalidate_instance(customer)
+    cache.put(CustomerModel, customer.customer_id, customer.tenant_id, customer, generation=generation)
+
+    assert cache.stats.size == 0
+
+
+def test_single_flight_coalesces_concurrent_gets(monkeypatch):
+    import threading
+    import time as time_module
+
+    customer = create_customer(830)
+    DynamoRepository.insert(customer)
+
+    calls = []
+    original_get = CustomerModel.get.__func__
+
+    def slow_get(cls, *args, **kwargs):
+        calls.append(args)
+        time_module.sleep(0.2)
+        return original_get(cls, *args, **kwargs)
+
+    monkeypatch.setattr(CustomerModel, "get", classmethod(slow_get))
+    single_flight = DynamoRepository.configure_single_flight(True)
+    try:
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+            ))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        DynamoRepository.configure_single_flight(False)
+
+    assert len(calls) == 1
+    assert single_flight.executions == 1 and single_flight.shared == 4
+    assert len({id(r) for r in results}) == 5
+    assert all(r.name == customer.name for r in results)
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    import threading
+    from repository.single_flight import SingleFlight
+
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait()
+        raise RuntimeError("boom")
+
+    def call():
+        try:
+            single_flight.do("key", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    while single_flight.shared == 0:
+        pass
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+    assert single_flight.executions == 1
+
+
+def test_batch_loader_groups_concurrent_gets(monkeypatch):
+    import threading
+    from repository.batch_loader import BatchGetLoader
+
+    customers = [create_customer(i) for i in range(840, 860)]
+    DynamoRepository.batch_write(puts=customers)
+
+    loader = BatchGetLoader(window=0.2)
+    DynamoRepository.configure_batch_loader(loader)
+    try:
+        results = {}
+        start = threading.Barrier(len(customers) + 1)
+
+        def fetch(c):
+            start.wait()
+            results[c.customer_id] = DynamoRepository.get(CustomerModel, c.customer_id, c.tenant_id)
+
+        def fetch_missing():
+            start.wait()
+            results["missing"] = DynamoRepository.get(CustomerModel, "NOEXIST", "T0")
+
+        threads = [threading.Thread(target=fetch, args=(c,)) for c in customers]
+        threads.append(threading.Thread(target=fetch_missing))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        DynamoRepository.configure_batch_loader(None)
+
+    # A primeira leitura não tem com quem agrupar e sai sozinha; as demais esperam a janela.
+    assert loader.batches <= 2
+    assert loader.keys_loaded == 21
+    assert results["missing"] is None
+    assert all(results[c.customer_id].name == c.name for c in customers)
+
+
+def test_batch_loader_dispatches_when_batch_is_full():
+    import threading
+    from repository.batch_loader import BatchGetLoader
+
+    customers = [create_customer(i) for i in range(860, 866)]
+    DynamoRepository.batch_write(puts=customers)
+
+    # Janela longa: só o limite de chaves faz os lotes serem enviados rapidamente
+    loader = BatchGetLoader(window=30, max_batch=3)
+    # Simula outra leitura em andamento, para que nenhum lote saia antes de encher.
+    loader._in_flight[CustomerModel] = 1
+    results = []
+    threads = [
+        threading.Thread(target=lambda c=c: results.append(loader.load(CustomerModel, c.customer_id, c.tenant_id)))
+        for c in customers
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+
+    assert len(results) == 6
+    assert loader.batches == 2
+
+
+def test_batch_loader_does_not_delay_sequential_gets():
+    import time
+    from repository.batch_loader import BatchGetLoader
+
+    customers = [create_customer(i) for i in range(866, 870)]
+    DynamoRepository.batch_write(puts=customers)
+
+    loader = BatchGetLoader(window=5)
+    started = time.perf_counter()
+    results = [loader.load(CustomerModel, c.customer_id, c.tenant_id) for c in customers]
+
+    assert time.perf_counter() - started < 2
+    assert [r.customer_id for r in results] == [c.customer_id for c in customers]
+    assert loader.batches == 4
+
+
+def test_batch_loader_load_many_keeps_order():
+    from repository.batch_loader import BatchGetLoader
+
+    customers = [create_customer(i) for i in range(870, 874)]
+    DynamoRepository.batch_write(puts=customers)
+    keys = [(c.customer_id, c.tenant_id) for c in reversed(customers)] + [("NOEXIST", "T0")]
+
+    results = BatchGetLoader(max_batch=2).load_many(CustomerModel, keys)
+
+    assert [r.customer_id for r in results[:-1]] == [c.customer_id for c in reversed(customers)]
+    assert results[-1] is None
+
+
+def test_get_with_projection_returns_only_requested_attributes():
+    customer = create_customer(880)
+    DynamoRepository.insert(customer)
+
+    partial = DynamoRepository.get(
+        CustomerModel, customer.customer_id, customer.tenant_id, attributes_to_get=["name"]
+    )
+
+    assert partial.name == customer.name
+    assert partial.email is None
+
+
+def test_exists_projects_only_keys(monkeypatch):
+    customer = create_customer(881)
+    DynamoRepository.insert(customer)
+    projections = []
+    original_get = CustomerModel.get.__func__
+
+    def spy_get(cls, *args, **kwargs):
+        projections.append(kwargs.get("attributes_to_get"))
+        return original_get(cls, *args, **kwargs)
+
+    monkeypatch.setattr(CustomerModel, "get", classmethod(spy_get))
+
+    assert DynamoRepository.exists(CustomerModel, customer.customer_id, customer.tenant_id)
+    assert [a.attr_name for a in projections[0]] == ["customer_id", "tenant_id"]
+
+
+def test_query_scan_and_batch_get_with_projection():
+    customer = create_customer(882)
+    DynamoRepository.insert(customer)
+
+    by_query = list(DynamoRepository.query(CustomerModel, customer.customer_id, attributes_to_get=["email"]))
+    by_index = list(DynamoRepository.query_index(
+        CustomerModel, "tenant_id_index", hash_key_value=customer.tenant_id, attributes_to_get=["customer_id", "email"]
+    ))
+    by_scan = list(DynamoRepository.scan(CustomerModel, attributes_to_get=["customer_id", "status"]))
+    by_batch = list(DynamoRepository.batch_get(
+        CustomerModel, [(customer.customer_id, customer.tenant_id)], attributes_to_get=["name"]
+    ))
+
+    assert by_query[0].email == customer.email and by_query[0].name is None
+    assert any(r.customer_id == customer.customer_id and r.name is None for r in by_index)
+    assert all(r.name is None for r in by_scan)
+    assert by_batch[0].name == customer.name and by_batch[0].email is None
+
+
+def test_projected_get_does_not_populate_cache(item_cache):
+    customer = create_customer(883)
+    DynamoRepository.insert(customer)
+
+    DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id, attributes_to_get=["name"])
+    full = DynamoRepository.get(CustomerModel, customer.customer_id, customer.tenant_id)
+
+    assert full.email == customer.email
+    assert item_cache.stats.hits == 0
+
+
+def test_as_dict_returns_plain_dicts_without_models(monkeypatch):
+    customers = [create_customer(i) for i in range(890, 895)]
+    for c in customers:
+        c.tenant_id = "TRAW"
+        DynamoRepository.insert(c)
+
+    def fail_from_raw_data(cls, data):
+        raise AssertionError("o modelo não deveria ser instanciado")
+
+    monkeypatch.setattr(CustomerModel, "from_raw_data", classmethod(fail_from_raw_data))
+
+    by_query = list(DynamoRepository.query(CustomerModel, customers[0].customer_id, as_dict=True))
+    by_index = list(DynamoRepository.query_index(CustomerModel, "tenant_id_index", hash_key_value="TRAW", as_dict=True))
+    by_scan = list(DynamoRepository.scan(
+        CustomerModel, filter_condition=CustomerModel.tenant_id == "TRAW", attributes_to_get=["customer_id"], as_dict=True
+    ))
+    paginated = DynamoRepository.scan_paginated(
+        CustomerModel, filter_condition=CustomerModel.tenant_id == "TRAW", page_size=2, as_dict=True
+    )
+    keys = [(c.customer_id, c.tenant_id) for c in customers] + [("NOTFOUND", "TRAW")]
+    by_batch = list(DynamoRepository.batch_get(CustomerModel, keys, as_dict=True))
+
+    assert by_query[0]["name"] == customers[0].name
+    assert isinstance(by_query[0]["created_at"], str)
+    assert len(by_index) == 5
+    assert by_scan and all(set(row) == {"customer_id"} for row in by_scan)
+    assert len(list(paginated)) == 5
+    assert sorted(row["customer_id"] for row in by_batch) == sorted(c.customer_id for c in customers)
+
+
+def test_batch_get_dicts_backs_off_on_unprocessed_keys(monkeypatch):
+    import repository.raw as raw
+    from pynamodb.exceptions import GetError
+
+    customers = [create_customer(i) for i in range(880, 883)]
+    DynamoRepository.batch_write(puts=customers)
+    connection = CustomerModel._get_connection()
+    original = connection.batch_get_item
+    requests, delays = [], []
+
+    def throttled(keys, **kwargs):
+        requests.append(list(keys))
+        data = original(keys, **kwargs)
+        if len(requests) == 1:
+            # Na primeira chamada, só o primeiro item é processado.
+            data["Responses"]["customers"] = data["Responses"]["customers"][:1]
+            data["UnprocessedKeys"] = {"customers": {"Keys": keys[1:]}}
+        return data
+
+    monkeypatch.setattr(connection, "batch_get_item", throttled)
+    monkeypatch.setattr(raw.time, "sleep", delays.append)
+    # Chaves como listas (não hasheáveis) e repetidas.
+    keys = [[c.customer_id, c.tenant_id] for c in customers] + [[customers[0].customer_id, customers[0].tenant_id]]
+    rows = list(raw.batch_get_dicts(CustomerModel, keys))
+
+    assert [k["customer_id"] for k in requests[0]] == [c.customer_id for c in customers]
+    assert len(requests) == 2 and len(delays) == 1
+    assert sorted(r["customer_id"] for r in rows) == sorted(c.customer_id for c in customers)
+
+    monkeypatch.setattr(connection, "batch_get_item", lambda keys, **kwargs: {
+        "Responses": {}, "UnprocessedKeys": {"customers": {"Keys": keys}}
+    })
+    delays.clear()
+    with pytest.raises(GetError, match="UnprocessedKeys"):
+        list(raw.batch_get_dicts(CustomerModel, keys, max_retries=3))
+    assert len(delays) == 3
+
+
+def test_raw_decoder_handles_all_dynamodb_types():
+    assert decode_value({"N": "10"}) == 10
+    assert decode_value({"N": "1.5"}) == 1.5
+    assert decode_value({"NULL": True}) is None
+    assert decode_value({"NS": ["1", "2"]}) == {1, 2}
+    assert decode_value({"M": {"a": {"L": [{"S": "x"}, {"BOOL": False}]}}}) == {"a": ["x", False]}
+
+
+def test_scan_to_columns():
+    class ScoreModel(Model):
+        class Meta:
+            table_name = "scores"
+            region = "us-east-1"
+
+        score_id = UnicodeAttribute(hash_key=True)
+        points = NumberAttribute(null=True)
+        label = UnicodeAttribute(null=True)
+
+    ScoreModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+    for i in range(7):
+        ScoreModel(f"S{i}", points=i * 1.5 if i != 3 else None, label=f"L{i}").save()
+
+    table = DynamoRepository.scan_to_columns(ScoreModel, attributes=["score_id", "points"], page_size=2)
+
+    assert len(table) == 7
+    assert table.column_names == ["score_id", "points"]
+    assert table["points"].typecode == "d"
+    by_id = dict(zip(table["score_id"], table["points"]))
+    assert by_id["S4"] == 6.0
+    assert math.isnan(by_id["S3"])
+
+    with pytest.raises(ValueError):
+        DynamoRepository.scan_to_columns(ScoreModel, attributes=["unknown"])
+
+
+def test_scan_to_columns_keeps_large_integers_exact():
+    class CounterModel(Model):
+        class Meta:
+            table_name = "counters"
+            region = "us-east-1"
+
+        counter_id = UnicodeAttribute(hash_key=True)
+        value = NumberAttribute()
+
+    CounterModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+    big = 2 ** 60 + 1
+    for i in range(5):
+        CounterModel(f"K{i}", value=big + i).save()
+
+    table = DynamoRepository.scan_to_columns(CounterModel, page_size=2)
+    assert table["value"].typecode == "q"
+    assert sorted(table["value"]) == [big + i for i in range(5)]
+
+    # Um valor fracionário em página posterior converte a coluna inteira para float.
+    CounterModel("K9", value=0.5).save()
+    table = DynamoRepository.scan_to_columns(CounterModel, page_size=2)
+    assert table["value"].typecode == "d" and len(table["value"]) == 6
+    assert 0.5 in table["value"]
+
+
+def test_export_ndjson_scan_parallel_and_query(tmp_path):
+    customers = [create_customer(i) for i in range(900, 906)]
+    for c in customers:
+        c.tenant_id = "TEXP"
+        DynamoRepository.insert(c)
+    exp_filter = CustomerModel.tenant_id == "TEXP"
+
+    path = tmp_path / "customers.ndjson"
+    report = DynamoRepository.export(CustomerModel, str(path), filter_condition=exp_filter, batch_size=4)
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert report.items == 6 and report.bytes_written == path.stat().st_size
+    assert sorted(r["customer_id"] for r in rows) == sorted(c.customer_id for c in customers)
+
+    gz_path = tmp_path / "customers.ndjson.gz"
+    parallel = DynamoRepository.export(
+        CustomerModel, gz_path, filter_condition=exp_filter, segments=3, compression="gzip"
+    )
+    with gzip.open(gz_path, "rt") as f:
+        assert len(f.read().splitlines()) == parallel.items == 6
+
+    buffer = io.BytesIO()
+    by_index = DynamoRepository.export(CustomerModel, buffer, index_name="tenant_id_index", hash_key_value="TEXP")
+    assert by_index.items == 6 and buffer.getvalue().count(b"\n") == 6
+
+    with pytest.raises(ValueError):
+        DynamoRepository.export(CustomerModel, io.BytesIO(), format="csv")
+
+
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    for i in range(906, 909):
+        DynamoRepository.insert(create_customer(i))
+
+    path = tmp_path / "customers.parquet"
+    report = DynamoRepository.export(CustomerModel, path, format="parquet", batch_size=2)
+
+    assert pq.read_table(path).num_rows == report.items
+
+
+def test_export_parquet_keeps_sparse_attributes(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    class SparseModel(Model):
+        class Meta:
+            table_name = "sparse"
+            region = "us-east-1"
+
+        item_id = UnicodeAttribute(hash_key=True)
+        label = UnicodeAttribute(null=True)
+        score = NumberAttribute(null=True)
+
+    SparseModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+    # O primeiro bloco (batch_size=2) não tem label nem score.
+    SparseModel("a").save()
+    SparseModel("b").save()
+    SparseModel("c", label="C", score=1.5).save()
+    SparseModel("d", score=7).save()
+
+    path = tmp_path / "sparse.parquet"
+    report = DynamoRepository.export(SparseModel, path, format="parquet", batch_size=2)
+
+    table = pq.read_table(path)
+    assert report.items == table.num_rows == 4
+    assert str(table.schema.field("label").type) == "string"
+    rows = {row["item_id"]: row for row in table.to_pylist()}
+    assert rows["a"]["label"] is None and rows["c"]["label"] == "C"
+    assert (rows["c"]["score"], rows["d"]["score"]) == (1.5, 7.0)
+
+    client = SparseModel._get_connection().connection.client
+    client.put_item(TableName="sparse", Item={"item_id": {"S": "e"}, "extra": {"S": "x"}})
+    with pytest.raises(ValueError, match="extra"):
+        DynamoRepository.export(SparseModel, tmp_path / "extra.parquet", format="parquet")
+
+
+def test_bulk_import_csv_and_ndjson(tmp_path):
+    csv_path = tmp_path / "customers.csv"
+    lines = ["customer_id,tenant_id,name,email,status,created_at"]
+    lines += [f"C{i:04d},TIMP,User {i},u{i}@x.com,active,2024-01-0{i % 9 + 1}T00:00:00+00:00" for i in range(920, 960)]
+    lines.append("C0999,TIMP,Sem Data,x@x.com,active,")  # created_at obrigatório
+    lines.append("C0998,TIMP,Extra,x@x.com,active,2024-01-01T00:00:00+00:00,")
+    csv_path.write_text("\n".join(lines) + "\n")
+
+    report = DynamoRepository.bulk_import(CustomerModel, str(csv_path), write_capacity=10_000)
+
+    assert report.imported == 40 and not report.failed
+    assert [r.line for r in report.rejected] == [41, 42]
+    assert report.items_per_second > 0
+    got = DynamoRepository.get(CustomerModel, "C0930", "TIMP")
+    assert got.created_at == datetime(2024, 1, 4, tzinfo=timezone.utc)
+
+    ndjson_path = tmp_path / "customers.ndjson.gz"
+    with gzip.open(ndjson_path, "wt") as f:
+        f.write(json.dumps({"customer_id": "C0961", "tenant_id": "TIMP", "name": "N", "email": "e", "status": "s",
+                            "created_at": "2024-02-01T00:00:00+00:00"}) + "\n\n")
+        f.write(json.dumps({"customer_id": "C0961", "tenant_id": "TIMP", "unknown": 1}) + "\n")
+
+    report = DynamoRepository.bulk_import(CustomerModel, ndjson_path, write_capacity=10_000)
+    assert report.imported == 1
+    assert "unknown" in report.rejected[0].error
+
+
+def test_token_bucket_waits_for_tokens():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=10, clock=lambda: now[0], sleep=sleep)
+    assert bucket.acquire(10) == 0
+    assert bucket.acquire(5) == pytest.approx(0.5)
+    assert bucket.acquire(25) == pytest.approx(1.0)  # maior que a capacidade: espera o balde encher
+    assert bucket.acquire(1) == pytest.approx(1.6)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_capacity_limiter_meters_consumed_capacity():
+    clock = FakeClock()
+    limiter = CapacityLimiter(capacity_fraction=0.5, clock=clock, sleep=clock.sleep)
+    DynamoRepository.configure_rate_limiter(limiter, models=[CustomerModel])
+    try:
+        DynamoRepository.insert(create_customer(970))
+        DynamoRepository.insert(create_customer(971))
+        list(DynamoRepository.query_index(CustomerModel, "tenant_id_index", hash_key_value="T1"))
+
+        stats = limiter.stats()
+        assert stats["customers:write"].target_rate == 0.5
+        assert stats["customers:write"].consumed == 2
+        # 0.5 WCU/s: a segunda escrita espera o balde repor o token.
+        assert stats["customers:write"].waited == pytest.approx(2.0)
+        assert stats["customers/tenant_id_index:read"].consumed >= 1
+    finally:
+        DynamoRepository.configure_rate_limiter(None)
+
+
+def test_capacity_limiter_follows_replaced_client():
+    clock = FakeClock()
+    limiter = CapacityLimiter(write_capacity=100, clock=clock, sleep=clock.sleep)
+    DynamoRepository.configure_rate_limiter(limiter, models=[CustomerModel])
+    connection = CustomerModel._get_connection().connection
+    old_client = connection.client
+    try:
+        DynamoRepository.insert(create_customer(973))
+        # O PynamoDB recria o cliente quando ele some ou perde as credenciais.
+        connection._client = None
+        DynamoRepository.insert(create_customer(974))
+        assert connection.client is not old_client
+        assert limiter.stats()["customers:write"].consumed == 2
+    finally:
+        DynamoRepository.configure_rate_limiter(None)
+
+    assert "_make_api_call" not in connection.__dict__
+    DynamoRepository.insert(create_customer(975))
+    assert limiter.stats() == {}
+
+
+def test_capacity_limiter_backs_off_on_throttle():
+    class ThrottledResponse:
+        status_code = 400
+        headers = {}
+
+    def throttle(**kwargs):
+        return ThrottledResponse(), {
+            "Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"},
+            "ResponseMetadata": {}
+        }
+
+    clock = FakeClock()
+    limiter = CapacityLimiter(read_capacity=10, clock=clock, sleep=clock.sleep)
+    DynamoRepository.configure_rate_limiter(limiter, models=[CustomerModel])
+    events = CustomerModel._get_connection().connection.client.meta.events
+    events.register("before-call.dynamodb.GetItem", throttle)
+    try:
+        with pytest.raises(Exception):
+            CustomerModel.get("C0001", "T1")
+        bucket = limiter.bucket("customers", "read")
+        assert bucket.throttles >= 1 and bucket.rate < 10
+    finally:
+        events.unregister("before-call.dynamodb.GetItem", throttle)
+        DynamoRepository.configure_rate_limiter(None)
+
+    DynamoRepository.insert(create_customer(972))
+    assert "customers:write" not in limiter.stats()
+
+
+@pytest.fixture
+def metrics_registry():
+    registry = MetricsRegistry()
+    DynamoRepository.configure_instrumentation(registry)
+    yield registry
+    DynamoRepository.configure_instrumentation(None)
+
+
+def test_instrumentation_records_every_call(metrics_registry):
+    customers = [create_customer(i) for i in range(980, 986)]
+    for c in customers:
+        c.tenant_id = "TMET"
+        DynamoRepository.insert(c)
+    DynamoRepository.get(CustomerModel, customers[0].customer_id, "TMET")
+    DynamoRepository.get(CustomerModel, "NOTFOUND", "TMET")
+    DynamoRepository.upsert(customers[1], hash_key_name="customer_id", range_key_name="tenant_id")
+    DynamoRepository.delete(CustomerModel, customers[2].customer_id, "TMET")
+
+    by_index = list(DynamoRepository.query_index(CustomerModel, "tenant_id_index", hash_key_value="TMET"))
+    filtered = list(DynamoRepository.scan(CustomerModel, filter_condition=CustomerModel.customer_id == customers[3].customer_id))
+    batch = list(DynamoRepository.batch_get(CustomerModel, [(c.customer_id, "TMET") for c in customers[3:]]))
+
+    insert = metrics_registry.stats("insert", "customers")
+    assert insert.calls == 6 and insert.write_units == 6 and insert.items == 6
+    assert metrics_registry.stats("get", "customers").items == 1
+    assert metrics_registry.stats("upsert", "customers").calls == 1
+    # O get interno do upsert não gera registro próprio.
+    assert metrics_registry.stats("get", "customers").calls == 2
+
+    query = metrics_registry.stats("query_index", "customers")
+    assert query.items == len(by_index) == 5 and query.pages >= 1 and query.read_units > 0
+    scan = metrics_registry.stats("scan", "customers")
+    assert len(filtered) == scan.items == 1 and scan.scanned == 5
+    assert scan.filter_efficiency == pytest.approx(0.2)
+    assert metrics_registry.stats("batch_get", "customers").items == len(batch) == 3
+    assert metrics_registry.summary()["query_index:customers"]["p99"] > 0
+
+
+def test_instrumentation_records_errors_and_exports(metrics_registry):
+    with pytest.raises(DoesNotExist):
+        DynamoRepository.update(create_customer(990), hash_key_name="customer_id", range_key_name="tenant_id")
+    assert metrics_registry.stats("update", "customers").errors == 1
+
+    text = metrics_registry.to_prometheus()
+    assert 'dynamo_repository_errors_total{operation="update",table="customers"} 1' in text
+    assert 'dynamo_repository_latency_seconds_count{operation="update",table="customers"} 1' in text
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(2)
+    statsd = StatsDHook(port=server.getsockname()[1], prefix="app")
+    DynamoRepository.configure_instrumentation(CompositeHook([metrics_registry, statsd]))
+    DynamoRepository.insert(create_customer(991))
+    payload = server.recv(4096).decode()
+    statsd.close()
+    server.close()
+
+    assert "app.customers.insert.calls:1|c" in payload
+    assert "app.customers.insert.write_units:1|c" in payload
+
+
+def test_profiler_breaks_down_time_and_captures_cprofile():
+    profiler = Profiler(capture="cprofile", operations=["query"])
+    DynamoRepository.configure_instrumentation(profiler)
+    try:
+        customers = [create_customer(i) for i in range(992, 996)]
+        for c in customers:
+            DynamoRepository.insert(c)
+        DynamoRepository.get(CustomerModel, customers[0].customer_id, customers[0].tenant_id)
+        found = list(DynamoRepository.query(CustomerModel, customers[1].customer_id))
+    finally:
+        DynamoRepository.configure_instrumentation(None)
+
+    assert len(found) == 1
+    breakdown = profiler.breakdown()
+    for operation in ("get", "query"):
+        timing = breakdown[operation]
+        assert timing.calls == 1
+        assert timing.network > 0 and timing.parse > 0
+        assert timing.network + timing.parse + timing.model <= timing.total
+        assert sum(timing.fractions().values()) == pytest.approx(1.0)
+    # Só a conversão dos itens de query/scan é medida; a classe do modelo não é alterada.
+    assert breakdown["query"].model > 0
+    assert breakdown["get"].model == breakdown["insert"].model == 0
+    assert "from_raw_data" not in CustomerModel.__dict__
+
+    assert "from_raw_data" in profiler.report("query", limit=None)
+    with pytest.raises(KeyError):
+        profiler.report("get")
+    with pytest.raises(ValueError):
+        Profiler(capture="perf")
+
+
+def test_connection_manager_shares_tuned_client():
+    class OrderModel(Model):
+        class Meta:
+            table_name = "orders"
+            region = "us-east-1"
+
+        order_id = UnicodeAttribute(hash_key=True)
+
+    OrderModel.create_table(read_capacity_units=5, write_capacity_units=5, wait=True)
+    manager = ConnectionManager(ConnectionSettings(max_pool_connections=64, connect_timeout=2, read_timeout=4))
+    DynamoRepository.configure_connections(manager, models=[CustomerModel, OrderModel])
+    limiter = CapacityLimiter(write_capacity=100)
+    try:
+        client = CustomerModel._get_connection().connection.client
+        assert OrderModel._get_connection().connection.client is client
+        config = client.meta.config
+        assert config.max_pool_connections == 64 and config.tcp_keepalive
+        assert (config.connect_timeout, config.read_timeout) == (2, 4)
+
+        # Os handlers do limitador são registrados uma única vez no cliente compartilhado.
+        DynamoRepository.configure_rate_limiter(limiter, models=[CustomerModel, OrderModel])
+        DynamoRepository.insert(create_customer(996))
+        DynamoRepository.insert(OrderModel("O1"))
+        assert limiter.stats()["customers:write"].consumed == 1
+        assert limiter.stats()["orders:write"].consumed == 1
+        assert DynamoRepository.get(OrderModel, "O1").order_id == "O1"
+    finally:
+        DynamoRepository.configure_rate_limiter(None)
+        DynamoRepository.configure_connections(None)
+
+    assert CustomerModel._get_connection().connection.client is not client
+    assert DynamoRepository.get(CustomerModel, "C0996", "T0") is not None
+
+
+def test_optional_features_are_imported_lazily():
+    code = (
+        "import sys, repository.base_repository; "
+        "print(sorted(m for m in ('repository.export', 'repository.metrics', 'repository.bulk_import') if m in sys.modules))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_warm_up_prepares_connection_and_client():
+    CustomerModel._connection = None
+    DynamoRepository.warm_up([CustomerModel], connect=True)
+
+    client = CustomerModel._connection.connection._client
+    assert client is not None
+    DynamoRepository.insert(create_customer(997))
+    assert DynamoRepository.get(CustomerModel, "C0997", "T1") is not None
+    assert CustomerModel._connection.connection._client is client